@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP plumbing for the local data API servers.
+
+LocalApiServer handles each connection on its own thread. It caps the
+number of open connections, so a slow client can no longer block
+everyone else, and a burst of clients can't spawn unbounded threads.
+Handlers speak HTTP/1.1 keep-alive. Idle connections are dropped after
+KEEPALIVE_TIMEOUT. On Ctrl+C or SIGTERM, run_servers() stops accepting
+connections and waits for in-flight requests to finish.
+
+Data responses are sent as CachedBody objects. Each one carries a strong
+ETag and caches its gzip and brotli encodings, so a data version is
+compressed at most once per encoding. send_cached() answers If-None-Match
+with 304 and picks the encoding from Accept-Encoding.
+"""
+
+import gzip
+import hashlib
+import http.server
+import json
+import math
+import signal
+import threading
+from typing import List, Optional
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+DEFAULT_MAX_CONNECTIONS = 256
+KEEPALIVE_TIMEOUT = 5  # seconds an idle keep-alive connection is held open
+LISTEN_BACKLOG = 128
+
+# Clients may store responses but must revalidate; unchanged data costs a 304
+API_CACHE_CONTROL = 'no-cache'
+MIN_COMPRESS_SIZE = 1024  # bytes; smaller bodies are sent as-is
+
+
+def encode_json(data) -> bytes:
+    """Serialize a response body as compact JSON."""
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def parse_accept_encoding(header: Optional[str]) -> dict:
+    """Map each content-coding in an Accept-Encoding header to its q-value."""
+    accepted = {}
+    for item in (header or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+                if not math.isfinite(q):
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+class CachedBody:
+    """A JSON response body with its ETag and lazily cached compressed encodings."""
+
+    ENCODINGS = ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+
+    def __init__(self, body: bytes):
+        """
+        Initialize the body.
+
+        Args:
+            body: Serialized response bytes
+        """
+        self.body = body
+        self.etag_value = hashlib.sha1(body).hexdigest()
+        self._encoded = {}
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        """Strong ETag of one encoding; each encoding is a distinct representation."""
+        return f'"{self.etag_value}-{encoding}"' if encoding else f'"{self.etag_value}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header names any encoding of this body."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag == '*':
+                return True
+            # If-None-Match uses weak comparison
+            tag = tag[2:] if tag.startswith('W/') else tag
+            if tag.strip('"').split('-')[0] == self.etag_value:
+                return True
+        return False
+
+    def choose_encoding(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """Best encoding the client accepts, or None for identity."""
+        if len(self.body) < MIN_COMPRESS_SIZE:
+            return None
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in self.ENCODINGS:
+            if accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding
+        return None
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """The body in the given encoding, compressed on first use."""
+        if encoding is None:
+            return self.body
+        data = self._encoded.get(encoding)
+        if data is None:
+            if encoding == 'br':
+                data = brotli.compress(self.body)
+            else:
+                data = gzip.compress(self.body, mtime=0)
+            self._encoded[encoding] = data
+        return data
+
+
+class LocalApiServer(http.server.ThreadingHTTPServer):
+    """Thread-per-connection HTTP server with a connection cap and draining shutdown."""
+
+    allow_reuse_address = True
+    daemon_threads = False
+    request_queue_size = LISTEN_BACKLOG
+
+    def __init__(self, server_address, handler_class, max_connections: int = DEFAULT_MAX_CONNECTIONS):
+        """
+        Initialize the server.
+
+        Args:
+            server_address: (host, port) to listen on
+            handler_class: Request handler class
+            max_connections: Maximum connections served at once; extra
+                connections wait in the listen backlog
+        """
+        super().__init__(server_address, handler_class)
+        self.draining = False
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def process_request(self, request, client_address):
+        """Wait for a free connection slot, then serve on a new thread."""
+        self._slots.acquire()
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        """Serve one connection and free its slot."""
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+
+class JsonApiHandler(http.server.SimpleHTTPRequestHandler):
+    """Base handler for the JSON APIs, falling back to static files."""
+
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    # Headers and body go out in separate writes; without TCP_NODELAY each
+    # keep-alive response stalls ~40 ms on Nagle + delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_OPTIONS(self):
+        """Handle OPTIONS requests for CORS preflight."""
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def send_json(self, status: int, body: bytes):
+        """Send a JSON response body."""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_cached(self, cached: CachedBody):
+        """
+        Send a data response with validators and content negotiation.
+
+        Replies 304 Not Modified when If-None-Match names the current
+        version; otherwise sends the best encoding the client accepts.
+        """
+        encoding = cached.choose_encoding(self.headers.get('Accept-Encoding'))
+
+        if cached.matches(self.headers.get('If-None-Match')):
+            self.send_response(304)
+            self.send_header('ETag', cached.etag(encoding))
+            self.send_header('Cache-Control', API_CACHE_CONTROL)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        body = cached.encoded(encoding)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('ETag', cached.etag(encoding))
+        self.send_header('Cache-Control', API_CACHE_CONTROL)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_server_error(self, e: Exception):
+        """Send 500 on error."""
+        self.send_json(500, encode_json({
+            'success': False,
+            'error': str(e),
+            'message': 'Internal server error'
+        }))
+
+    def end_headers(self):
+        """Add CORS headers, and close the connection once the server is draining."""
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if getattr(self.server, 'draining', False):
+            self.send_header('Connection', 'close')
+        super().end_headers()
+
+
+def run_servers(servers: List[LocalApiServer]):
+    """
+    Serve until Ctrl+C or SIGTERM, then shut down gracefully.
+
+    Args:
+        servers: Bound servers; each runs its accept loop on its own thread
+    """
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    threads = [threading.Thread(target=server.serve_forever, daemon=True) for server in servers]
+    for thread in threads:
+        thread.start()
+
+    # Event.wait() with a timeout stays responsive to signals
+    while not stop.wait(0.5):
+        pass
+
+    print("\n🛑 Stopping servers, finishing in-flight requests...")
+    for server in servers:
+        server.draining = True
+        server.shutdown()
+    for server in servers:
+        # Joins connection threads; idle keep-alive connections time out
+        # after KEEPALIVE_TIMEOUT
+        server.server_close()
+    print("🛑 Servers stopped")
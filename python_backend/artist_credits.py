@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Split Billboard artist credits into individual, canonical artists.
+
+Billboard credits a chart entry to strings such as "SZA Featuring Justin
+Bieber", "Justin Bieber & SZA" or "Morgan Wallen Featuring Lil Wayne & Rick
+Ross". ArtistCreditParser turns each one into primary and featured artists:
+
+- "Featuring", "Feat.", "Ft." and "With" introduce featured artists
+- ",", "&", "And", "x" and "+" separate artists with equal billing
+- "Group: Member, Member" credits the group
+- a part starting with "The" after "&", "And" or "+" stays with the name
+  before it ("Hootie & The Blowfish", "Florence + The Machine")
+- known names that contain separators ("Earth, Wind & Fire") are never split
+
+Names are canonicalized through an alias table keyed by a case- and
+whitespace-insensitive form. The first spelling seen becomes the canonical
+one unless the table says otherwise. The table and the known group names
+are persisted in the artist_aliases table of the SQLite database.
+
+Every distinct credit string is parsed once: parse() and shares() are
+LRU-cached, and the separators are matched by precompiled regexes.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Share of a featured artist's points relative to a primary artist
+DEFAULT_FEATURED_WEIGHT = 0.5
+PARSE_CACHE_SIZE = 65536
+
+# Acts whose names contain a separator; extended by artist_aliases rows
+DEFAULT_GROUP_NAMES = [
+    'Earth, Wind & Fire',
+    'Crosby, Stills, Nash & Young',
+    'Crosby, Stills & Nash',
+    'Peter, Paul & Mary',
+    'Tyler, The Creator',
+    'Simon & Garfunkel',
+    'Daryl Hall & John Oates',
+    'Hall & Oates',
+    'Brooks & Dunn',
+    'Big & Rich',
+    'Sam & Dave',
+    'Peaches & Herb',
+    'Ashford & Simpson',
+    'Captain & Tennille',
+    'Sonny & Cher',
+    'Dan + Shay',
+    'Maddie & Tae',
+    'Kool & The Gang',
+    'Mumford & Sons',
+]
+
+FEATURED_SPLIT = re.compile(r'\s+(?:featuring|feat\.?|ft\.?|with)\s+', re.IGNORECASE)
+# Capturing, so re.split() keeps the separators for group-name matching
+ARTIST_SPLIT = re.compile(r'(\s*,\s*|\s+(?:&|and|x|\+)\s+)', re.IGNORECASE)
+# Separators after which a "The ..." part belongs to the name before it
+BAND_SEPARATOR = re.compile(r'\s+(?:&|and|\+)\s+', re.IGNORECASE)
+GROUP_PREFIX = re.compile(r'^([^:,&]+?):\s+\S')
+
+
+class ArtistCredit(NamedTuple):
+    """Canonical artists credited on one chart entry."""
+    primary: Tuple[str, ...]
+    featured: Tuple[str, ...]
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def name_key(name: str) -> str:
+    """Case-, accent-width- and whitespace-insensitive key of an artist name."""
+    name = unicodedata.normalize('NFKC', name).replace('’', "'")
+    return ' '.join(name.split()).casefold()
+
+
+class ArtistCreditParser:
+    """Parses credit strings into canonical artists, caching every result."""
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None,
+                 group_names: Iterable[str] = DEFAULT_GROUP_NAMES,
+                 featured_weight: float = DEFAULT_FEATURED_WEIGHT):
+        """
+        Initialize the parser.
+
+        Args:
+            aliases: name_key() of a spelling -> canonical name
+            group_names: Names that must not be split at separators
+            featured_weight: Points share of a featured artist relative to a
+                primary artist, used by shares()
+        """
+        self.aliases = dict(aliases or {})
+        self.group_keys = {name_key(name) for name in group_names}
+        # First part of each group name, so splitting only tries to rebuild
+        # a group name where one could start
+        self.group_starts = {name_key(ARTIST_SPLIT.split(name)[0]) for name in group_names}
+        self.featured_weight = featured_weight
+        # Aliases learned since loading, for save_artist_aliases()
+        self.new_aliases = {}
+
+        # parse(credit) -> ArtistCredit
+        self.parse = lru_cache(maxsize=PARSE_CACHE_SIZE)(self._parse)
+        # shares(credit) -> ((artist, share of the entry's points), ...), summing to 1
+        self.shares = lru_cache(maxsize=PARSE_CACHE_SIZE)(self._shares)
+
+    @classmethod
+    def from_database(cls, db, **kwargs) -> 'ArtistCreditParser':
+        """Parser using the aliases and group names stored in a SQLite BillboardDatabase."""
+        aliases, group_names = db.load_artist_aliases()
+        return cls(aliases, list(DEFAULT_GROUP_NAMES) + group_names, **kwargs)
+
+    def save(self, db):
+        """Persist aliases learned since loading to a SQLite BillboardDatabase."""
+        db.save_artist_aliases(self.new_aliases)
+        self.new_aliases = {}
+
+    def canonical(self, name: str) -> str:
+        """Canonical spelling of a name; the first spelling seen wins."""
+        key = name_key(name)
+        canonical = self.aliases.get(key)
+        if canonical is None:
+            canonical = self.aliases[key] = self.new_aliases[key] = ' '.join(name.split())
+        return canonical
+
+    def _split_artists(self, text: str) -> List[str]:
+        """Split a run of equally billed artists, keeping known group names whole."""
+        if name_key(text) in self.group_keys:
+            return [text]
+        pieces = ARTIST_SPLIT.split(text)
+        names = []
+        i = 0
+        while i < len(pieces):
+            # Longest run of pieces that forms a known group name
+            starts_group = name_key(pieces[i]) in self.group_starts
+            for j in range(len(pieces), i, -2) if starts_group else ():
+                if j - i > 1 and name_key(''.join(pieces[i:j])) in self.group_keys:
+                    names.append(''.join(pieces[i:j]))
+                    i = j + 1
+                    break
+            else:
+                piece = pieces[i]
+                if names and i >= 2 and BAND_SEPARATOR.fullmatch(pieces[i - 1]) and \
+                        piece[:4].lower() == 'the ':
+                    names[-1] += pieces[i - 1] + piece
+                else:
+                    names.append(piece)
+                i += 2
+        return [name for name in names if name.strip()]
+
+    def _parse(self, credit: str) -> ArtistCredit:
+        """Uncached parse()."""
+        credit = ' '.join(str(credit or '').split())
+        if not credit:
+            return ArtistCredit(('Unknown',), ())
+
+        if name_key(credit) in self.group_keys:
+            return ArtistCredit((self.canonical(credit),), ())
+
+        group = GROUP_PREFIX.match(credit)
+        if group:
+            # "Saja Boys: Andrew Choi, Neckwav, ..." is the group's credit
+            return ArtistCredit((self.canonical(group.group(1)),), ())
+
+        lead, *featured = FEATURED_SPLIT.split(credit, maxsplit=1)
+        primary = tuple(dict.fromkeys(self.canonical(name) for name in self._split_artists(lead)))
+        featured = tuple(dict.fromkeys(
+            self.canonical(name) for part in featured for name in self._split_artists(part)
+        ))
+        return ArtistCredit(primary, tuple(name for name in featured if name not in primary))
+
+    def _shares(self, credit: str) -> Tuple[Tuple[str, float], ...]:
+        """Uncached shares()."""
+        parsed = self.parse(credit)
+        weights = [(name, 1.0) for name in parsed.primary] + \
+                  [(name, self.featured_weight) for name in parsed.featured]
+        total = sum(weight for _, weight in weights)
+        return tuple((name, weight / total) for name, weight in weights)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Vectorized artist scoring across many chart weeks.
+
+ChartScores encodes a chart history once: artists and songs get integer IDs,
+and every entry becomes a row of NumPy arrays (week, rank, artist, song),
+sorted by week. Scoring a date window is then a slice of those arrays plus
+grouped reductions (bincount for totals and counts, one sort for chart
+positions). It does not loop over weeks or entries in Python.
+
+Points default to the scraper's scheme (#1 = 100 points, #100 = 1 point).
+Alternative schemes and an exponential decay by chart age can be given per
+call, e.g. for "hottest artists of the last year" leaderboards. With an
+ArtistCreditParser, collaborations are split and each credited artist gets
+a row with its share of the entry's points.
+
+Usage:
+    python artist_scoring.py --db billboard.db [--start 2015-01-01] [--end 2024-12-31]
+                             [--scheme linear|inverse] [--half-life 26] [--top 10]
+                             [--split-credits]
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Scheme name -> points for an array of ranks
+POINT_SCHEMES = {
+    'linear': lambda ranks: 101.0 - ranks,    # #1 = 100 points, #100 = 1 point
+    'inverse': lambda ranks: 100.0 / ranks,   # rewards the top of the chart more
+}
+
+
+class ChartScores:
+    """Chart history as integer-encoded NumPy arrays, scored by date window."""
+
+    def __init__(self, entries: Iterable[Dict], credit_parser=None):
+        """
+        Encode chart entries.
+
+        Args:
+            entries: Dicts with 'chart_date', 'rank', 'title' and 'artist',
+                in any order (e.g. rows from BillboardDatabase.iter_chart_history)
+            credit_parser: artist_credits.ArtistCreditParser to split
+                collaborations; each credited artist then gets a row with
+                its share of the entry's points
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy not available. Install with: pip install numpy")
+
+        artist_ids, song_ids, date_ids = {}, {}, {}
+        song_artists = []
+        artist_column, song_column, date_column, rank_column, share_column = [], [], [], [], []
+        for entry in entries:
+            date_id = date_ids.setdefault(str(entry['chart_date'])[:10], len(date_ids))
+            credits = credit_parser.shares(entry['artist']) if credit_parser else ((entry['artist'], 1.0),)
+            for artist, share in credits:
+                artist_id = artist_ids.setdefault(artist, len(artist_ids))
+                song = (entry['title'], artist)
+                song_id = song_ids.get(song)
+                if song_id is None:
+                    song_id = song_ids[song] = len(song_ids)
+                    song_artists.append(artist_id)
+                artist_column.append(artist_id)
+                song_column.append(song_id)
+                date_column.append(date_id)
+                rank_column.append(entry['rank'])
+                share_column.append(share)
+
+        # Renumber weeks in date order, then sort entries by (week, rank)
+        dates = np.array(list(date_ids), dtype='datetime64[D]')
+        date_order = np.argsort(dates)
+        week_of_date = np.empty(len(dates), dtype=np.intp)
+        week_of_date[date_order] = np.arange(len(dates))
+        self.dates = dates[date_order]
+
+        weeks = week_of_date[np.array(date_column, dtype=np.intp)]
+        ranks = np.array(rank_column, dtype=np.int64)
+        order = np.lexsort((ranks, weeks))
+        self.ranks = ranks[order]
+        # Entry offset of each week; week w is entries week_starts[w]:week_starts[w + 1]
+        self.week_starts = np.searchsorted(weeks[order], np.arange(len(self.dates) + 1))
+        self.weeks = weeks[order]
+
+        # Renumber artists by first chart appearance, so ranking ties can be
+        # broken by ID (the artist who charted first wins)
+        artist_column = np.array(artist_column, dtype=np.intp)[order]
+        first_seen = np.full(len(artist_ids), len(artist_column), dtype=np.intp)
+        np.minimum.at(first_seen, artist_column, np.arange(len(artist_column)))
+        by_first_seen = np.argsort(first_seen)
+        new_id = np.empty(len(artist_ids), dtype=np.intp)
+        new_id[by_first_seen] = np.arange(len(artist_ids))
+        names = list(artist_ids)
+        self.artists = [names[old_id] for old_id in by_first_seen.tolist()]
+        self.artist_ids = new_id[artist_column]
+
+        self.songs = list(song_ids)
+        self.song_artists = new_id[np.array(song_artists, dtype=np.intp)]
+        self.song_ids = np.array(song_column, dtype=np.intp)[order]
+        # Share of the entry's points per row; None when credits aren't split
+        self.shares = np.array(share_column, dtype=np.float64)[order] if credit_parser else None
+        self._scheme_points = {}  # scheme -> points of every row
+
+    @classmethod
+    def from_weeks(cls, weeks: Iterable[Dict], credit_parser=None) -> 'ChartScores':
+        """Encode week dicts with 'chart_date' and 'chart_entries' (as saved by run_scraper.py)."""
+        return cls(
+            ({'chart_date': week['chart_date'], **entry} for week in weeks for entry in week['chart_entries']),
+            credit_parser
+        )
+
+    @classmethod
+    def from_database(cls, db, credit_parser=None) -> 'ChartScores':
+        """Encode the full history of a SQLite BillboardDatabase."""
+        return cls((row for chunk in db.iter_chart_history() for row in chunk), credit_parser)
+
+    def _window(self, start_date: Optional[str], end_date: Optional[str]) -> slice:
+        """Entry slice covering the chart weeks between two dates (inclusive)."""
+        first_week = 0 if start_date is None else np.searchsorted(self.dates, np.datetime64(start_date, 'D'))
+        last_week = len(self.dates) if end_date is None else \
+            np.searchsorted(self.dates, np.datetime64(end_date, 'D'), side='right')
+        return slice(int(self.week_starts[first_week]), int(self.week_starts[max(first_week, last_week)]))
+
+    def _points(self, scheme: str) -> 'np.ndarray':
+        """Points of every row under a scheme, computed once per scheme."""
+        points = self._scheme_points.get(scheme)
+        if points is None:
+            points = POINT_SCHEMES[scheme](self.ranks.astype(np.float64))
+            if self.shares is not None:
+                points = points * self.shares
+            self._scheme_points[scheme] = points
+        return points
+
+    def score(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+              top_n: Optional[int] = 10, scheme: str = 'linear',
+              points: Optional[Callable] = None,
+              half_life_weeks: Optional[float] = None) -> List[Dict]:
+        """
+        Rank artists by points over a date window.
+
+        Args:
+            start_date: First chart date to include (default: earliest)
+            end_date: Last chart date to include (default: latest)
+            top_n: Number of artists to return (None for all)
+            scheme: Point scheme name from POINT_SCHEMES
+            points: Custom function from a rank array to a points array;
+                overrides scheme
+            half_life_weeks: Halve an entry's points for every this many weeks
+                it lies before the window's last week (default: no decay)
+
+        Returns:
+            Artists in get_top_artists() format: rank, artist, total_score,
+            chart_positions (sorted), songs_count, plus entries (chart
+            entries in the window) and best_rank. Ties go to the artist
+            who charted first.
+        """
+        window = self._window(start_date, end_date)
+        artist_ids = self.artist_ids[window]
+        if not len(artist_ids):
+            return []
+        ranks = self.ranks[window]
+        weeks = self.weeks[window]
+
+        if points:
+            entry_points = points(ranks.astype(np.float64))
+            if self.shares is not None:
+                entry_points = entry_points * self.shares[window]
+        else:
+            entry_points = self._points(scheme)[window]
+        if half_life_weeks:
+            # One decay factor per week, looked up by each entry's week
+            week_dates = self.dates[weeks[0]:weeks[-1] + 1]
+            age = (week_dates[-1] - week_dates).astype(np.float64) / 7
+            entry_points = entry_points * np.exp2(-age / half_life_weeks)[weeks - weeks[0]]
+
+        n_artists = len(self.artists)
+        totals = np.bincount(artist_ids, weights=entry_points, minlength=n_artists)
+        entries = np.bincount(artist_ids, minlength=n_artists)
+
+        # Highest total first; a stable sort over IDs puts the artist who
+        # charted first ahead on ties
+        charted = np.flatnonzero(entries)
+        ranking = charted[np.argsort(-totals[charted], kind='stable')]
+        if top_n is not None:
+            ranking = ranking[:top_n]
+
+        # Positions and song counts, for the ranked artists' entries only
+        selected = np.zeros(n_artists, dtype=bool)
+        selected[ranking] = True
+        in_ranking = np.flatnonzero(selected[artist_ids])
+        charted_songs = np.zeros(len(self.songs), dtype=bool)
+        charted_songs[self.song_ids.take(in_ranking + window.start)] = True
+        songs_count = np.bincount(self.song_artists[charted_songs], minlength=n_artists)
+
+        # One sort of a combined (artist, rank) key groups ranks by artist,
+        # ascending within each group
+        sorted_ranks = np.sort(artist_ids.take(in_ranking) << 16 | ranks.take(in_ranking)) & 0xFFFF
+        group_end = np.cumsum(np.where(selected, entries, 0))
+
+        results = []
+        for position, artist_id in enumerate(ranking.tolist(), 1):
+            positions = sorted_ranks[group_end[artist_id] - entries[artist_id]:group_end[artist_id]]
+            total = float(totals[artist_id])
+            results.append({
+                'rank': position,
+                'artist': self.artists[artist_id],
+                'total_score': int(total) if total.is_integer() else round(total, 2),
+                'chart_positions': positions.tolist(),
+                'songs_count': int(songs_count[artist_id]),
+                'entries': int(entries[artist_id]),
+                'best_rank': int(positions[0])
+            })
+        return results
+
+
+def main():
+    """Print an artist leaderboard for a date window of a SQLite database."""
+    from artist_credits import ArtistCreditParser
+    from billboard_database import BillboardDatabase
+
+    parser = argparse.ArgumentParser(description="Artist leaderboards over chart history")
+    parser.add_argument('--db', default='billboard.db', help="SQLite database path")
+    parser.add_argument('--start', help="First chart date (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Last chart date (YYYY-MM-DD)")
+    parser.add_argument('--scheme', choices=sorted(POINT_SCHEMES), default='linear')
+    parser.add_argument('--half-life', type=float, help="Decay half-life in weeks")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--split-credits', action='store_true',
+                        help="Share points between the artists credited on collaborations")
+    args = parser.parse_args()
+
+    db = BillboardDatabase("sqlite", args.db)
+    try:
+        start = time.perf_counter()
+        credit_parser = None
+        if args.split_credits:
+            credit_parser = ArtistCreditParser.from_database(db)
+        scores = ChartScores.from_database(db, credit_parser)
+        if credit_parser:
+            credit_parser.save(db)
+    finally:
+        db.close()
+    print(f"🎼 {len(scores.ranks):,} entries, {len(scores.artists):,} artists, {len(scores.dates):,} weeks "
+          f"encoded in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    leaderboard = scores.score(args.start, args.end, args.top, args.scheme, half_life_weeks=args.half_life)
+    print(f"🏆 Scored in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for artist in leaderboard:
+        print(f"   {artist['rank']:3d}. {artist['artist']:30s} {artist['total_score']:>10}  "
+              f"{artist['entries']} entries, {artist['songs_count']} songs, best #{artist['best_rank']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1192 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the Python backend.
+
+Each subcommand times one hot path against synthetic data shaped like the
+real inputs, so results are comparable between runs and machines.
+
+Usage:
+    python benchmarks.py parsers [--page saved_chart.html] [--repeat 20]
+    python benchmarks.py converter [--reviews 10000]
+    python benchmarks.py search [--reviews 100000]
+    python benchmarks.py load [--url http://localhost:8001/api/reviews] [--clients 1 16 128]
+    python benchmarks.py history [--years 66]
+    python benchmarks.py scoring [--years 66]
+    python benchmarks.py credits [--years 66] [--history ../data/historical]
+    python benchmarks.py snapshots [--years 66]
+    python benchmarks.py archive [--years 66] [--weeks 50]
+    python benchmarks.py publish [--reviews 20000] [--readers 8] [--duration 5]
+    python benchmarks.py backfill [--weeks 20] [--workers 4]
+    python benchmarks.py bigquery [--weeks 10]
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+
+def time_call(func, repeat: int) -> list:
+    """Call func repeat times and return the individual timings in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def synthetic_chart_page(entries: int = 100, noise: int = 400, offset: int = 0) -> bytes:
+    """
+    Build an HTML page shaped like Billboard's Hot 100 markup.
+
+    Args:
+        entries: Number of chart rows
+        noise: Number of navigation/filler elements around the chart
+        offset: Shift of song numbers against ranks, so consecutive weeks
+            can differ
+
+    Returns:
+        Page HTML as bytes
+    """
+    parts = ['<html><head><title>Billboard Hot 100</title></head><body><nav>']
+    parts.extend(f'<a class="c-nav-link" href="/section/{i}">Section {i}</a>' for i in range(noise))
+    parts.append('</nav><div class="chart-results-list">')
+
+    for rank in range(1, entries + 1):
+        song = rank + offset
+        title = f"Song Number {song}"
+        artist = f"Artist {song % 37} Featuring Guest {song % 11}"
+        share_text = quote(f"{title} by {artist}")
+        parts.append(
+            '<div class="o-chart-results-list-row-container"><ul class="o-chart-results-list-row">'
+            f'<li class="o-chart-results-list__item"><span class="c-label a-font-primary-bold-l">{rank}</span></li>'
+            f'<li class="o-chart-results-list__item"><h3 id="title-of-a-story" class="c-title">{title}</h3>'
+            f'<span class="c-label a-no-trucate">{artist}</span></li>'
+            f'<li><a href="https://www.facebook.com/sharer.php?u=x&quote={share_text}">Share</a>'
+            f'<a href="https://twitter.com/intent/tweet?text={share_text}">Tweet</a></li>'
+            '</ul></div>'
+        )
+
+    parts.append('</div></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def synthetic_songs_md(reviews: int) -> str:
+    """
+    Build a songs.md-style document with the given number of reviews.
+
+    Every 50th review uses the old Rating/Description/Listen field names, and
+    durations, dates and scores vary to exercise every converter branch.
+    """
+    months = ['January', 'March', 'June', 'August', 'October', 'December']
+    scores = ['0/4', '0.5/4', '1/4', '1.5/4', '2/4', '2.5/4', '3/4', '3.5/4', '4/4', '3.25']
+    parts = ['# Songs\n\n<!-- synthetic benchmark corpus -->\n']
+
+    for i in range(reviews):
+        artist = f"Artist {i % 997}"
+        title = f"Song, Number {i}"
+        date = f"{months[i % len(months)]} {i % 28 + 1}, {2000 + i % 25}"
+        duration = f"{i % 7}:{i % 60:02d}" if i % 13 else f"1:{i % 60:02d}:05"
+        lines = [f'## {artist} - "{title}"', f"**song_artist:** {artist}", f"**song_title:** {title}"]
+        if i % 50 == 0:
+            lines += [f"**Rating:** {scores[i % len(scores)]}",
+                      f"**Description:** Old-format review {i}.",
+                      f"**Listen:** https://example.com/{i}"]
+        else:
+            lines += [f"**song_release_date:** {date}",
+                      f"**song_upload_date:** {2000 + i % 25}-01-{i % 28 + 1:02d}",
+                      f"**song_duration_sec:** {duration}",
+                      "**song_album:** Single",
+                      "**song_label:** Independent",
+                      "**song_genre:** Pop, Rock",
+                      "**song_mood:** Upbeat, Anthemic",
+                      "**song_instrumentation:** Vocals, Guitar, Drums",
+                      "**song_language:** English",
+                      f"**song_audio_url:** https://example.com/watch?v={i}",
+                      f"**review_date:** {date}",
+                      f"**review_score:** {scores[i % len(scores)]}",
+                      f"**review_text:** Review number {i} with some words about the song."]
+        parts.append('\n'.join(lines) + '\n\n---\n')
+
+    return '\n'.join(parts)
+
+
+def synthetic_reviews(reviews: int) -> dict:
+    """
+    Build reviews.json-shaped data with the given number of reviews.
+
+    Review text draws from a fixed vocabulary with a few rare words, so
+    queries hit both long and short posting lists.
+    """
+    import random
+    rng = random.Random(42)
+    vocabulary = [f"word{i:04d}" for i in range(5000)] + ['guitar', 'anthem', 'synth', 'ballad', 'chorus']
+    common = vocabulary[:200]
+
+    data = {'metadata': {'total_reviews': reviews}, 'reviews': []}
+    for i in range(reviews):
+        words = rng.choices(common, k=25) + rng.choices(vocabulary, k=15)
+        data['reviews'].append({
+            'song_artist': f"Artist {i % 4999}",
+            'song_title': f"Song {rng.choice(vocabulary)} {i}",
+            'review_text': ' '.join(words),
+            'review_score': i % 9 / 2,
+        })
+    return data
+
+
+def synthetic_chart_history(years: int, start: str = '1958-08-04'):
+    """
+    Yield weekly Hot 100 charts shaped like the real history.
+
+    Songs debut, climb towards a peak, fall off after 1-40 weeks, and about
+    one in twenty later re-enters. Artists have several songs each.
+    """
+    import random
+    from datetime import datetime, timedelta
+
+    rng = random.Random(7)
+    first_week = datetime.strptime(start, '%Y-%m-%d')
+    active = []   # [song, weeks left, strength]
+    retired = []
+    next_song = 0
+
+    for week in range(years * 52):
+        active = [song for song in active if song[1] > 0]
+        if retired and rng.random() < 0.3:
+            active.append([retired.pop(rng.randrange(len(retired))), rng.randint(1, 4), rng.random() * 0.5])
+        while len(active) < 100:
+            song = (f"Song {next_song}", f"Artist {rng.randrange(next_song // 6 + 1)}")
+            active.append([song, rng.randint(1, 40), rng.random()])
+            next_song += 1
+
+        active.sort(key=lambda item: item[2] + rng.random() * 0.3, reverse=True)
+        entries = []
+        for rank, item in enumerate(active[:100], 1):
+            item[1] -= 1
+            if item[1] == 0 and rng.random() < 0.05:
+                retired.append(item[0])
+            entries.append({'rank': rank, 'title': item[0][0], 'artist': item[0][1]})
+        active = active[:100]
+
+        yield {
+            'chart_date': (first_week + timedelta(weeks=week)).strftime('%Y-%m-%d'),
+            'chart_entries': entries,
+            'artist_scores': []
+        }
+
+
+def bench_parsers(args):
+    """Compare per-page parse time and output across the scraper's parser backends."""
+    from billboard_scraper import BillboardScraper
+    from chart_parsers import PARSER_BACKENDS, available_parser_backends
+
+    backends = available_parser_backends()
+    if len(backends) < 2:
+        missing = [name for name in PARSER_BACKENDS if name not in backends]
+        print(f"❌ Only {', '.join(backends)} is available, nothing to compare against; "
+              f"install the library for {', '.join(missing)} (see requirements.txt)")
+        return 1
+
+    if args.page:
+        with open(args.page, 'rb') as f:
+            page = f.read()
+    else:
+        page = synthetic_chart_page()
+
+    print(f"📄 Page size: {len(page) / 1024:.0f} KB, {args.repeat} runs per backend")
+
+    results = {}
+    for backend in backends:
+        scraper = BillboardScraper(parser=backend, profile_path=None, page_cache=None)
+        entries = scraper.parse_chart_page(page, '2025-01-01')
+        results[backend] = [{k: v for k, v in e.items() if k != 'scraped_at'} for e in entries]
+
+        timings = time_call(lambda: scraper.parse_chart_page(page, '2025-01-01'), args.repeat)
+        print(f"   {backend:12s} median {statistics.median(timings) * 1000:7.1f} ms/page "
+              f"({len(entries)} entries)")
+
+    outputs = list(results.values())
+    identical = all(output == outputs[0] for output in outputs)
+    print(f"{'✅' if identical else '❌'} Output identical across backends: {identical}")
+    return 0 if identical else 1
+
+
+def bench_converter(args):
+    """Time the single-pass field tokenizer against per-field regex scans."""
+    import re
+    from markdown_converter import parse_song_review, tokenize_fields
+
+    content = synthetic_songs_md(args.reviews)
+    sections = [f"## {section.strip()}" for section in content.split('## ')[1:] if section.strip()]
+    print(f"📄 {len(sections)} synthetic reviews ({len(content) / 1024 / 1024:.1f} MB)")
+
+    # The ~20 separate scans per section that the tokenizer replaced
+    field_names = [
+        'song_artist', 'song_title', 'song_release_date', 'song_upload_date', 'song_duration_sec',
+        'song_album', 'song_label', 'song_genre', 'song_mood', 'song_instrumentation',
+        'song_language', 'song_audio_url', 'review_date', 'review_score', 'review_text',
+        'Date', 'Rating', 'Description', 'Listen'
+    ]
+
+    def per_field_scans():
+        for section in sections:
+            for name in field_names:
+                re.search(rf'\*\*{name}:\*\* (.+)', section)
+
+    def single_pass():
+        for section in sections:
+            tokenize_fields(section)
+
+    def full_parse():
+        for section in sections:
+            parse_song_review(section)
+
+    for label, func in [('per-field scans', per_field_scans),
+                        ('single pass', single_pass),
+                        ('parse_song_review', full_parse)]:
+        seconds = statistics.median(time_call(func, args.repeat))
+        print(f"   {label:18s} {seconds * 1000:8.1f} ms  ({len(sections) / seconds:,.0f} reviews/sec)")
+    return 0
+
+
+def bench_search(args):
+    """Time inverted index queries against the old per-request linear scan."""
+    from review_search import ReviewSearchIndex
+
+    data = synthetic_reviews(args.reviews)
+    reviews = data['reviews']
+    print(f"📄 {len(reviews)} synthetic reviews")
+
+    start = time.perf_counter()
+    index = ReviewSearchIndex(data)
+    print(f"   index build        {(time.perf_counter() - start) * 1000:8.1f} ms "
+          f"({len(index.vocabulary):,} tokens)")
+
+    def linear_scan(query):
+        terms = query.lower().split()
+        results = []
+        for review in reviews:
+            text = f"{review.get('song_artist', '')} {review.get('song_title', '')} {review.get('review_text', '')}".lower()
+            if all(term in text for term in terms):
+                results.append(review)
+        return results
+
+    for query in ['guitar', 'word0001 word0002', 'artist 42 anthem', 'syn', 'word019 chor']:
+        total, _ = index.search(query, limit=20)
+        indexed = statistics.median(time_call(lambda: index.search(query, limit=20), args.repeat))
+        scanned = statistics.median(time_call(lambda: linear_scan(query), 1))
+        print(f"   {query!r:20s} {total:7d} hits  index {indexed * 1000:7.2f} ms  "
+              f"scan {scanned * 1000:8.1f} ms  ({scanned / indexed:,.0f}x)")
+    return 0
+
+
+def load_client(url, deadline: float, latencies: list, errors: list):
+    """Send requests over one keep-alive connection until the deadline."""
+    import http.client
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else '')
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+            if response.getheader('Connection', '').lower() == 'close':
+                conn.close()
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def bench_load(args):
+    """Report latency percentiles and throughput of a running API server."""
+    import threading
+
+    print(f"🎯 {args.url}, {args.duration:g}s per level")
+    for clients in args.clients:
+        deadline = time.perf_counter() + args.duration
+        latencies, errors = [], []
+        threads = [threading.Thread(target=load_client, args=(args.url, deadline, latencies, errors))
+                   for _ in range(clients)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if not latencies:
+            print(f"   {clients:4d} clients  no successful requests ({len(errors)} errors)")
+            continue
+        latencies.sort()
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"   {clients:4d} clients  {len(latencies) / elapsed:8.0f} req/s  "
+              f"p50 {p50 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  errors {len(errors)}")
+    return 0
+
+
+def synthetic_credit_history(years: int):
+    """
+    synthetic_chart_history() with about a quarter of songs credited to
+    collaborations, in the forms Billboard uses.
+    """
+    import random
+
+    forms = ['{a} Featuring {b}', '{a} & {b}', '{a}, {b} & {c}', '{a} x {b}',
+             '{a} With {b}', '{a} Featuring {b} & {c}', '{a} & {b} Featuring {c}']
+    credits = {}
+    for week in synthetic_chart_history(years):
+        for entry in week['chart_entries']:
+            song = (entry['title'], entry['artist'])
+            if song not in credits:
+                rng = random.Random(entry['title'])
+                if rng.random() < 0.25:
+                    others = [f"Artist {rng.randrange(3000)}" for _ in range(2)]
+                    credits[song] = rng.choice(forms).format(a=entry['artist'], b=others[0], c=others[1])
+                else:
+                    credits[song] = entry['artist']
+            entry['artist'] = credits[song]
+        yield week
+
+
+def bench_history(args):
+    """Time chart history queries over a synthetic full-history database."""
+    import os
+    import tempfile
+    from billboard_database import BillboardDatabase
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = BillboardDatabase("sqlite", os.path.join(tmp, 'history.db'))
+        stats = db.save_many_weeks(synthetic_chart_history(args.years))
+        print(f"📄 {stats['weeks']:,} weeks, {stats['rows']:,} rows loaded in {stats['seconds']}s")
+
+        cursor = db.conn.cursor()
+        songs = cursor.execute('SELECT title, artist FROM songs ORDER BY RANDOM() LIMIT 200').fetchall()
+        artists = [row[0] for row in cursor.execute(
+            'SELECT artist FROM chart_entries GROUP BY artist ORDER BY COUNT(*) DESC LIMIT 200')]
+        dates = [row[0] for row in cursor.execute('SELECT DISTINCT chart_date FROM chart_entries ORDER BY chart_date')]
+        mid = len(dates) // 2
+
+        queries = [
+            ('song history', lambda i: db.get_song_history(songs[i % len(songs)]['title'],
+                                                           songs[i % len(songs)]['artist'])),
+            ('artist, all time', lambda i: db.get_artist_history(artists[i % len(artists)])),
+            ('artist, 10 years', lambda i: db.get_artist_history(artists[i % len(artists)],
+                                                                 dates[mid], dates[mid + 520])),
+        ]
+        for label, query in queries:
+            timings = []
+            for i in range(args.repeat):
+                start = time.perf_counter()
+                query(i)
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            print(f"   {label:18s} median {statistics.median(timings) * 1000:6.2f} ms  "
+                  f"max {timings[-1] * 1000:6.2f} ms")
+
+        heaviest = db.get_artist_history(artists[0])
+        print(f"   busiest artist: {heaviest['total_entries']} entries, {heaviest['songs_count']} songs")
+        db.close()
+    return 0
+
+
+def bench_scoring(args):
+    """Time a full-history artist leaderboard: per-week Python loop vs ChartScores."""
+    from artist_scoring import ChartScores
+    from billboard_scraper import BillboardScraper
+
+    weeks = list(synthetic_chart_history(args.years))
+    scraper = BillboardScraper(profile_path=None, page_cache=None)
+
+    def per_week_loop():
+        totals, positions = {}, {}
+        for week in weeks:
+            for artist, points in scraper.calculate_artist_scores(week['chart_entries']).items():
+                totals[artist] = totals.get(artist, 0) + points
+            for entry in week['chart_entries']:
+                positions.setdefault(entry['artist'], []).append(entry['rank'])
+        ranking = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        return [(artist, total, sorted(positions[artist])) for artist, total in ranking]
+
+    start = time.perf_counter()
+    scores = ChartScores.from_weeks(weeks)
+    print(f"📄 {len(weeks):,} weeks, {len(scores.ranks):,} entries encoded in "
+          f"{time.perf_counter() - start:.2f}s (once)")
+
+    expected = per_week_loop()
+    actual = [(a['artist'], a['total_score'], a['chart_positions']) for a in scores.score(top_n=args.top)]
+    assert actual == expected, "ChartScores disagrees with the per-week loop"
+
+    mid = scores.dates[len(scores.dates) // 2]
+    runs = [
+        ('per-week loop', per_week_loop),
+        ('ChartScores', lambda: scores.score(top_n=args.top)),
+        ('ChartScores, 10y', lambda: scores.score(str(mid), str(mid + 3650), top_n=args.top)),
+        ('ChartScores, decay', lambda: scores.score(top_n=args.top, half_life_weeks=26)),
+    ]
+    baseline = None
+    for label, func in runs:
+        median = statistics.median(time_call(func, args.repeat))
+        baseline = baseline or median
+        print(f"   {label:20s} median {median * 1000:8.2f} ms  ({baseline / median:6.1f}x)")
+    return 0
+
+
+def bench_credits(args):
+    """Time artist credit parsing over every chart entry of a full history."""
+    import glob
+    import json
+    import os
+    from artist_credits import ArtistCreditParser
+    from artist_scoring import ChartScores
+
+    if args.history:
+        weeks = []
+        for path in sorted(glob.glob(os.path.join(args.history, '**', 'billboard_*.json'), recursive=True)):
+            with open(path, 'r', encoding='utf-8') as f:
+                weeks.append(json.load(f))
+    else:
+        weeks = list(synthetic_credit_history(args.years))
+    credits = [entry['artist'] for week in weeks for entry in week['chart_entries']]
+    print(f"📄 {len(credits):,} chart entries, {len(set(credits)):,} distinct credit strings")
+
+    def uncached():
+        parser = ArtistCreditParser()
+        for credit in credits:
+            parser._parse(credit)
+
+    def cached():
+        parser = ArtistCreditParser()
+        for credit in credits:
+            parser.shares(credit)
+
+    for label, func in [('uncached parse', uncached), ('LRU-cached shares', cached)]:
+        median = statistics.median(time_call(func, args.repeat))
+        print(f"   {label:20s} median {median * 1000:8.1f} ms  ({len(credits) / median:12,.0f} entries/s)")
+
+    parser = ArtistCreditParser()
+    start = time.perf_counter()
+    scores = ChartScores.from_weeks(weeks, parser)
+    print(f"   ChartScores with split credits: {len(scores.ranks):,} credit rows, "
+          f"{len(scores.artists):,} artists, encoded in {time.perf_counter() - start:.2f}s")
+    info = parser.shares.cache_info()
+    print(f"   credit cache: {info.hits:,} hits, {info.misses:,} misses")
+    return 0
+
+
+def bench_snapshots(args):
+    """Compare full-history storage as per-week JSON files and as binary snapshots."""
+    import json
+    import os
+    import tempfile
+    from datetime import datetime, timedelta
+    from billboard_scraper import BillboardScraper
+    from chart_snapshot import ChartSnapshot, write_snapshot
+
+    scraper = BillboardScraper(profile_path=None, page_cache=None)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_paths, snapshot_paths = [], []
+        json_bytes = snapshot_bytes = 0
+        for week in synthetic_chart_history(args.years):
+            # Shape each week like run_scraper.py's output
+            scraped_at = datetime.strptime(week['chart_date'], '%Y-%m-%d') + timedelta(days=3, hours=14)
+            for entry in week['chart_entries']:
+                entry['chart_date'] = week['chart_date']
+                entry['scraped_at'] = (scraped_at + timedelta(milliseconds=3 * entry['rank'])).isoformat()
+            output = {
+                'chart_date': week['chart_date'],
+                'total_entries': len(week['chart_entries']),
+                'scraped_at': scraped_at.isoformat(),
+                'chart_entries': week['chart_entries'],
+                'top_artists': scraper.get_top_artists(week['chart_entries'], top_n=10)
+            }
+            week_dir = os.path.join(tmp, week['chart_date'])
+            os.makedirs(week_dir)
+            path = os.path.join(week_dir, f"billboard_{week['chart_date']}")
+            with open(path + '.json', 'w', encoding='utf-8') as f:
+                f.write(json.dumps(output, indent=2, ensure_ascii=False))
+            json_bytes += os.path.getsize(path + '.json')
+            snapshot_bytes += write_snapshot(output, path + '.snap')
+            json_paths.append(path + '.json')
+            snapshot_paths.append(path + '.snap')
+
+        print(f"📄 {len(json_paths):,} weeks: JSON {json_bytes / 1e6:.1f} MB, snapshots "
+              f"{snapshot_bytes / 1e6:.1f} MB ({json_bytes / snapshot_bytes:.1f}x smaller)")
+
+        def load_json():
+            for path in json_paths:
+                with open(path, 'r', encoding='utf-8') as f:
+                    json.load(f)
+
+        def load_snapshots():
+            for path in snapshot_paths:
+                with ChartSnapshot.open(path) as snapshot:
+                    snapshot.to_dict()
+
+        def json_artist_scan():
+            for path in json_paths:
+                with open(path, 'r', encoding='utf-8') as f:
+                    [(entry['rank'], entry['artist']) for entry in json.load(f)['chart_entries']]
+
+        def snapshot_artist_scan():
+            for path in snapshot_paths:
+                with ChartSnapshot.open(path) as snapshot:
+                    artists = list(snapshot.artists)
+                    [(rank, artists[artist_id]) for rank, artist_id in zip(snapshot.ranks, snapshot.artist_ids)]
+
+        def json_number_ones():
+            for path in json_paths:
+                with open(path, 'r', encoding='utf-8') as f:
+                    json.load(f)['chart_entries'][0]['artist']
+
+        def snapshot_number_ones():
+            for path in snapshot_paths:
+                with ChartSnapshot.open(path) as snapshot:
+                    snapshot.artists[snapshot.artist_ids[0]]
+
+        runs = [
+            ('full week', load_json, load_snapshots),
+            ('rank/artist scan', json_artist_scan, snapshot_artist_scan),
+            ('#1 artist only', json_number_ones, snapshot_number_ones),
+        ]
+        for label, json_func, snapshot_func in runs:
+            json_time = statistics.median(time_call(json_func, args.repeat))
+            snapshot_time = statistics.median(time_call(snapshot_func, args.repeat))
+            print(f"   {label:18s} JSON {json_time * 1000:8.1f} ms  snapshots {snapshot_time * 1000:8.1f} ms  "
+                  f"({json_time / snapshot_time:5.1f}x)")
+    return 0
+
+
+def bench_archive(args):
+    """Read random weeks from a data/historical-style folder tree and from a HistoryArchive."""
+    import csv
+    import json
+    import os
+    import random
+    import tempfile
+    from history_archive import HistoryArchive, import_historical
+
+    with tempfile.TemporaryDirectory() as tmp:
+        historical_dir = os.path.join(tmp, 'historical')
+        for week in synthetic_chart_history(args.years):
+            chart_date = week['chart_date']
+            for entry in week['chart_entries']:
+                entry['chart_date'] = chart_date
+                entry['scraped_at'] = f"{chart_date}T14:37:48.{entry['rank']:06d}"
+            week_dir = os.path.join(historical_dir, chart_date)
+            os.makedirs(week_dir)
+            # The JSON plus a CSV copy, as update-billboard.sh leaves them
+            with open(os.path.join(week_dir, f"billboard_{chart_date}.json"), 'w', encoding='utf-8') as f:
+                json.dump({'chart_date': chart_date, 'total_entries': len(week['chart_entries']),
+                           'chart_entries': week['chart_entries']}, f, indent=2)
+            with open(os.path.join(week_dir, f"billboard_{chart_date}.csv"), 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Rank', 'Title', 'Artist', 'Chart Date', 'Scraped At'])
+                writer.writerows([entry['rank'], entry['title'], entry['artist'], chart_date, entry['scraped_at']]
+                                 for entry in week['chart_entries'])
+
+        archive_path = os.path.join(tmp, 'chart_history.bba')
+        start = time.perf_counter()
+        with HistoryArchive(archive_path) as archive:
+            stats = import_historical(archive, historical_dir)
+        print(f"📄 {len(stats['imported']):,} weeks imported in {time.perf_counter() - start:.2f}s; "
+              f"archive {os.path.getsize(archive_path) / 1e6:.1f} MB")
+
+        rng = random.Random(3)
+        dates = rng.sample(stats['imported'], args.weeks)
+        year_start = stats['imported'][len(stats['imported']) // 2]
+        year_end = stats['imported'][len(stats['imported']) // 2 + 51]
+
+        def walk_tree():
+            # Find every week's JSON, then parse the wanted ones
+            files = {}
+            for root, _, names in os.walk(historical_dir):
+                for name in names:
+                    if name.startswith('billboard_') and name.endswith('.json'):
+                        files[name[10:20]] = os.path.join(root, name)
+            return files
+
+        def tree_lookups():
+            files = walk_tree()
+            for chart_date in dates:
+                with open(files[chart_date], 'r', encoding='utf-8') as f:
+                    json.load(f)
+
+        def archive_lookups():
+            with HistoryArchive(archive_path) as archive:
+                for chart_date in dates:
+                    with archive.week(chart_date) as week:
+                        week.to_dict()
+
+        def tree_year():
+            files = walk_tree()
+            for chart_date in sorted(files):
+                if year_start <= chart_date <= year_end:
+                    with open(files[chart_date], 'r', encoding='utf-8') as f:
+                        [entry['artist'] for entry in json.load(f)['chart_entries']]
+
+        def archive_year():
+            with HistoryArchive(archive_path) as archive:
+                for week in archive.range(year_start, year_end):
+                    artists = list(week.artists)
+                    [artists[artist_id] for artist_id in week.artist_ids]
+
+        runs = [
+            (f'{args.weeks} random weeks', tree_lookups, archive_lookups),
+            ('one-year artist scan', tree_year, archive_year),
+        ]
+        for label, tree_func, archive_func in runs:
+            tree_time = statistics.median(time_call(tree_func, args.repeat))
+            archive_time = statistics.median(time_call(archive_func, args.repeat))
+            print(f"   {label:22s} folder tree {tree_time * 1000:8.1f} ms  archive {archive_time * 1000:7.2f} ms  "
+                  f"({tree_time / archive_time:6.1f}x)")
+
+        # Appending after the index is lost must keep every archived week
+        last_date = stats['imported'][-1]
+        with open(os.path.join(historical_dir, last_date, f"billboard_{last_date}.json"), 'r', encoding='utf-8') as f:
+            week = json.load(f)
+        week['chart_date'] = '2099-01-03'
+        os.remove(archive_path + '.idx')
+        with HistoryArchive(archive_path) as archive:
+            archive.append(week)
+            kept = len(archive) == len(stats['imported']) + 1 and last_date in archive and '2099-01-03' in archive
+        print(f"{'✅' if kept else '❌'} Append after a lost index kept {len(archive) - 1:,} "
+              f"of {len(stats['imported']):,} archived weeks")
+    return 0 if kept else 1
+
+
+def publish_loop(path: str, data: dict, atomic: bool, deadline: float, published):
+    """Republish a JSON file with increasing generations until the deadline (runs in a child process)."""
+    import json
+    from data_publish import publish_json, with_generation
+
+    generation = 0
+    while time.time() < deadline:
+        generation += 1
+        if atomic:
+            publish_json(path, data, generation, indent=2, ensure_ascii=False)
+        else:
+            # The old in-place write, for comparison
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(with_generation(data, generation), f, indent=2, ensure_ascii=False)
+        published.value = generation
+
+
+def bench_publish(args):
+    """
+    Stress test: reader threads load a JSON file while another process keeps republishing it.
+
+    Readers parse the file directly and through a shared JsonFileStore, and
+    check that every read is complete and that generations never go back.
+    The old in-place write runs first for comparison. Exits non-zero if an
+    atomically published file is ever read partially or out of order.
+    """
+    import json
+    import multiprocessing
+    import os
+    import tempfile
+    import threading
+    from data_publish import data_generation, publish_json
+    from data_store import JsonFileStore
+
+    data = synthetic_reviews(args.reviews)
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'reviews.json')
+        for label, atomic in [('in-place write', False), ('atomic publish', True)]:
+            publish_json(path, data, 0, indent=2)
+            print(f"📄 {label}: {os.path.getsize(path) / 1e6:.1f} MB file, {args.readers} readers, "
+                  f"{args.duration:.0f}s")
+            store = JsonFileStore(path)
+            counts = {'reads': 0, 'partial': 0, 'regressions': 0}
+            lock = threading.Lock()
+            deadline = time.time() + args.duration
+
+            def reader(use_store):
+                reads = partial = regressions = 0
+                last = -1
+                while time.time() < deadline:
+                    try:
+                        if use_store:
+                            generation = store.current().generation
+                        else:
+                            with open(path, 'r', encoding='utf-8') as f:
+                                generation = data_generation(json.load(f))
+                    except ValueError:
+                        partial += 1
+                        continue
+                    reads += 1
+                    regressions += generation < last
+                    last = generation
+                with lock:
+                    counts['reads'] += reads
+                    counts['partial'] += partial
+                    counts['regressions'] += regressions
+
+            published = multiprocessing.Value('q', 0)
+            writer = multiprocessing.Process(target=publish_loop, args=(path, data, atomic, deadline, published))
+            writer.start()
+            threads = [threading.Thread(target=reader, args=(i % 2 == 1,)) for i in range(args.readers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            writer.join()
+
+            stats = store.stats()
+            print(f"   {published.value} generations published; {counts['reads']:,} reads, "
+                  f"{counts['partial']} partial, {counts['regressions']} out of order; "
+                  f"store reloads {stats['reloads']}, reload errors {stats['reload_errors']}")
+            if atomic and (counts['partial'] or counts['regressions'] or stats['reload_errors']):
+                failed = True
+
+    print("❌ Readers saw partial or out-of-order files" if failed else "✅ Readers only ever saw complete files")
+    return 1 if failed else 0
+
+
+class ChartFixtureServer:
+    """
+    Local HTTP server of canned chart pages, for backfill runs without the network.
+
+    Serves one page per chart date at /charts/hot-100/<date>/ and counts the
+    requests for each date. A week can be scripted to answer its first
+    requests with error statuses; 429s carry Retry-After: 0.
+    """
+
+    def __init__(self, pages: dict, failures: dict = None):
+        """
+        Start the server on a free localhost port.
+
+        Args:
+            pages: Chart date -> page bytes
+            failures: Chart date -> statuses returned, in order, before the page
+        """
+        import threading
+        from collections import Counter
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.pages = pages
+        self.failures = {chart_date: list(statuses) for chart_date, statuses in (failures or {}).items()}
+        self.requests = Counter()
+        lock = threading.Lock()
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                chart_date = self.path.rstrip('/').rsplit('/', 1)[-1]
+                with lock:
+                    fixture.requests[chart_date] += 1
+                    scripted = fixture.failures.get(chart_date)
+                    status = scripted.pop(0) if scripted else None
+                page = fixture.pages.get(chart_date)
+                if status is None and page is None:
+                    status = 404
+                if status is not None:
+                    self.send_response(status)
+                    if status == 429:
+                        self.send_header('Retry-After', '0')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(page)))
+                self.end_headers()
+                self.wfile.write(page)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/charts/hot-100/"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'ChartFixtureServer':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def bench_backfill(args):
+    """
+    Self-test of billboard_backfill.py against a local fixture server.
+
+    A first run fetches every week, with scripted 429/5xx responses, a 404
+    and an interrupt after half the saves; a second run resumes from the
+    checkpoint. Checks that weeks parse, transient errors are retried and
+    permanent ones aren't, the interrupt leaves only saved weeks committed,
+    and the resumed run fetches only what is left and ends with the same
+    chart movement as a full rebuild. Exits non-zero if any check fails.
+    """
+    import logging
+    import os
+    import tempfile
+    from datetime import date, timedelta
+    from billboard_backfill import HistoricalBackfill
+    from billboard_database import BillboardDatabase
+
+    logging.getLogger('billboard_backfill').setLevel(logging.ERROR)
+    logging.getLogger('billboard_scraper').setLevel(logging.CRITICAL)
+
+    class InterruptingDatabase:
+        """Database proxy that raises KeyboardInterrupt instead of its Nth save."""
+
+        def __init__(self, db, saves):
+            self.db = db
+            self.saves = saves
+
+        def save_chart_data(self, *save_args, **save_kwargs):
+            if not self.saves:
+                raise KeyboardInterrupt
+            self.saves -= 1
+            return self.db.save_chart_data(*save_args, **save_kwargs)
+
+        def __getattr__(self, name):
+            return getattr(self.db, name)
+
+    if args.weeks < 6:
+        print("❌ Need at least 6 weeks for the scripted failures")
+        return 1
+
+    checks = []
+
+    def check(name, ok, detail=''):
+        checks.append(ok)
+        print(f"   {'✅' if ok else '❌'} {name}{': ' + detail if detail else ''}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first_week = date(2020, 1, 4)
+        end = (first_week + timedelta(weeks=args.weeks - 1)).isoformat()
+
+        def new_backfill(db, base_url):
+            return HistoricalBackfill(
+                db, first_week.isoformat(), end, workers=args.workers, requests_per_second=0,
+                max_retries=4, backoff=0.01, checkpoint_path=os.path.join(tmp, 'checkpoint.json'),
+                base_url=base_url, cache_dir=os.path.join(tmp, 'cache'), profile_path=None)
+
+        dates = new_backfill(None, None).chart_dates()
+        pages = {chart_date: synthetic_chart_page(noise=50, offset=i % 7) for i, chart_date in enumerate(dates)}
+        retried = {dates[1]: [429], dates[2]: [503, 502], dates[3]: [500, 504, 429]}
+        failures = dict(retried, **{dates[4]: [404]})
+        db = BillboardDatabase("sqlite", os.path.join(tmp, 'billboard.db'))
+        interrupt_after = len(dates) // 2
+
+        with ChartFixtureServer(pages, failures) as server:
+            print(f"🌐 Fixture server at {server.base_url}, {len(dates)} weeks, {args.workers} workers")
+            backfill = new_backfill(InterruptingDatabase(db, interrupt_after), server.base_url)
+            print("📥 First run, interrupted after", interrupt_after, "saves")
+            try:
+                backfill.run()
+                check("interrupt", False, "run finished without being interrupted")
+            except KeyboardInterrupt:
+                pass
+            first_requests = dict(server.requests)
+
+            saved = [row[0] for row in db.conn.execute('SELECT DISTINCT chart_date FROM chart_entries')]
+            completed = backfill.checkpoint.completed
+            urls = {d: f"{server.base_url}{d}/" for d in dates}
+            cache = backfill.page_cache
+            committed = [d for d in dates if cache.get_parsed(urls[d], cache.get_sha256(urls[d]) or '')]
+            check("interrupt", len(saved) == interrupt_after and set(saved) == completed
+                  and set(committed) <= completed,
+                  f"{len(saved)} weeks saved, {len(completed)} checkpointed, {len(committed)} pages committed")
+
+            expected = {d: first_requests.get(d) for d in retried}
+            check("retry", all(first_requests.get(d) == len(retried[d]) + 1 for d in retried)
+                  and first_requests.get(dates[4]) == 1,
+                  f"requests per scripted week {expected}, 404 week {first_requests.get(dates[4])}")
+
+            print("🔁 Resumed run")
+            backfill = new_backfill(db, server.base_url)
+            stats = backfill.run()
+            refetched = [d for d in completed if server.requests[d] != first_requests.get(d)]
+            check("resume", stats['skipped'] == interrupt_after and stats['saved'] == len(dates) - interrupt_after
+                  and stats['failed'] == 0 and not refetched,
+                  f"{stats['skipped']} skipped, {stats['saved']} saved, {stats['failed']} failed, "
+                  f"{len(refetched)} completed weeks fetched again")
+
+        rows = db.conn.execute(
+            'SELECT chart_date, COUNT(*), MIN(title) FROM chart_entries GROUP BY chart_date').fetchall()
+        weeks = {chart_date: (count, title) for chart_date, count, title in rows}
+        check("fetch", sorted(weeks) == dates and all(count == 100 for count, _ in weeks.values()),
+              f"{len(weeks)} of {len(dates)} weeks with 100 entries each")
+
+        movement_query = 'SELECT chart_date, rank, song_id, previous_rank, weeks_on_chart, status FROM chart_movement ORDER BY 1, 2'
+        movement = db.conn.execute(movement_query).fetchall()
+        db.rebuild_chart_movement()
+        rebuilt = db.conn.execute(movement_query).fetchall()
+        check("movement", [tuple(r) for r in movement] == [tuple(r) for r in rebuilt] and len(rebuilt) == 100 * len(dates),
+              f"{len(movement)} rows after resume match a full rebuild")
+        db.close()
+
+    failed = not all(checks)
+    print("❌ Backfill self-test failed" if failed else "✅ Backfill fetch, retry, interrupt and resume behave")
+    return 1 if failed else 0
+
+
+class FakeJob:
+    """Finished job returned by FakeBigQueryClient."""
+
+    total_bytes_processed = 0
+    cache_hit = False
+
+    def result(self) -> 'FakeJob':
+        return self
+
+
+class FakeBigQueryClient:
+    """
+    In-memory stand-in for bigquery.Client, for checks without a project.
+
+    Tables are lists of row dicts keyed by their full ID. query() only runs
+    the MERGE statements bigquery_writer generates.
+    """
+
+    MERGE_RE = re.compile(r'MERGE `([^`]+)` T\s+USING `([^`]+)` S')
+    KEY_RE = re.compile(r'T\.(\w+) = S\.\1')
+
+    def __init__(self):
+        self.tables = {}
+        self.queries = []
+
+    def create_table(self, table, exists_ok: bool = False):
+        table_id = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        if table_id in self.tables and not exists_ok:
+            raise ValueError(f"Already exists: {table_id}")
+        self.tables.setdefault(table_id, [])
+        return table
+
+    def load_table_from_file(self, file_obj, destination: str, job_config=None) -> FakeJob:
+        """Append newline-delimited JSON rows to a table, checking INTEGER columns."""
+        rows = [json.loads(line) for line in file_obj.read().decode('utf-8').splitlines() if line]
+        # Like BigQuery, reject the whole load if an INTEGER column gets a fractional value
+        integer_fields = [field.name for field in getattr(job_config, 'schema', None) or []
+                          if field.field_type in ('INTEGER', 'INT64')]
+        for row in rows:
+            for name in integer_fields:
+                if row[name] != int(row[name]):
+                    raise ValueError(f"Invalid INTEGER value for {name}: {row[name]!r}")
+        self.tables[destination].extend(rows)
+        return FakeJob()
+
+    def query(self, query: str, job_config=None) -> FakeJob:
+        """Run a bigquery_writer merge_sql() or metadata_merge_sql() statement."""
+        self.queries.append(query)
+        params = {p.name: p.value for p in getattr(job_config, 'query_parameters', [])}
+        match = self.MERGE_RE.search(query)
+        if match:
+            target_id, staging_id = match.groups()
+            key = self.KEY_RE.findall(query)
+            target = self.tables[target_id]
+            positions = {tuple(row[name] for name in key): i for i, row in enumerate(target)}
+            for row in self.tables[staging_id]:
+                position = positions.get(tuple(row[name] for name in key))
+                if position is None:
+                    positions[tuple(row[name] for name in key)] = len(target)
+                    target.append(dict(row))
+                else:
+                    target[position] = dict(row)
+        elif query.lstrip().startswith('MERGE') and '@table_name' in query:
+            metadata_id = re.search(r'MERGE `([^`]+)`', query).group(1)
+            metadata = self.tables[metadata_id]
+            latest = str(params['max_date'])
+            row = next((row for row in metadata if row['table_name'] == params['table_name']), None)
+            if row is None:
+                metadata.append({'table_name': params['table_name'], 'latest_chart_date': latest,
+                                 'updated_at': datetime.now(timezone.utc).isoformat()})
+            elif latest > row['latest_chart_date']:
+                row.update(latest_chart_date=latest, updated_at=datetime.now(timezone.utc).isoformat())
+        else:
+            raise NotImplementedError("FakeBigQueryClient only runs the writer's MERGE statements")
+        return FakeJob()
+
+    def delete_table(self, table_id: str, not_found_ok: bool = False):
+        if table_id not in self.tables and not not_found_ok:
+            raise KeyError(f"Not found: {table_id}")
+        self.tables.pop(table_id, None)
+
+    def close(self):
+        pass
+
+
+def bench_bigquery(args):
+    """
+    Check that BigQuery writes are idempotent, against FakeBigQueryClient.
+
+    Saves synthetic weeks, then saves them again (one re-scraped with a
+    changed entry) through save_chart_data and save_many_weeks. Row counts
+    must not change, the changed entry must replace the old one, staging
+    tables must be dropped and chart_metadata must hold the latest week.
+    A week scored with split credits must keep its fractional scores in
+    both BigQuery and SQLite. Exits non-zero if any check fails.
+    """
+    import os
+    import tempfile
+    from artist_credits import ArtistCreditParser
+    from bigquery_writer import METADATA_TABLE
+    from billboard_database import BillboardDatabase
+    from billboard_scraper import BillboardScraper
+
+    scorer = BillboardScraper(profile_path=None, page_cache=None)
+    weeks = list(synthetic_chart_history(1))[:args.weeks]
+    for week in weeks:
+        week['artist_scores'] = scorer.get_top_artists(week['chart_entries'], top_n=100)
+    client = FakeBigQueryClient()
+    db = BillboardDatabase("bigquery", "fake-project", client=client)
+    dataset = "fake-project.billboard"
+
+    def counts():
+        return {table: len(rows) for table, rows in client.tables.items() if not table.endswith(METADATA_TABLE)}
+
+    db.save_many_weeks(weeks)
+    first = counts()
+    print(f"📄 {len(weeks)} weeks saved: {first}")
+
+    week = weeks[-1]
+    changed = [dict(entry) for entry in week['chart_entries']]
+    changed[0]['title'] = 'Re-scraped Title'
+    db.save_chart_data(changed, week['artist_scores'], week['chart_date'])
+    db.save_many_weeks(weeks[:-1])
+    second = counts()
+
+    top = [row for row in client.tables[f"{dataset}.chart_entries"]
+           if row['chart_date'] == week['chart_date'] and row['rank'] == changed[0]['rank']]
+    metadata = {row['table_name']: row['latest_chart_date'] for row in client.tables[f"{dataset}.{METADATA_TABLE}"]}
+    checks = {
+        "row counts unchanged by re-saving": first == second,
+        "re-saved entry replaced": [row['title'] for row in top] == ['Re-scraped Title'],
+        "staging tables dropped": not any('._staging_' in table for table in client.tables),
+        "chart_metadata at the latest week": set(metadata.values()) == {week['chart_date']},
+    }
+
+    # Split credits give fractional scores (100 / 3 = 33.33 per artist)
+    split_entries = [{'rank': 1, 'title': 'Trio', 'artist': 'Alpha, Beta & Gamma'},
+                     {'rank': 2, 'title': 'Solo', 'artist': 'Alpha'}]
+    split_scores = scorer.get_top_artists(split_entries, credit_parser=ArtistCreditParser())
+    expected = {score['artist']: score['total_score'] for score in split_scores}
+    split_date = '2030-01-05'
+    try:
+        db.save_chart_data(split_entries, split_scores, split_date)
+        stored = {row['artist']: row['total_score'] for row in client.tables[f"{dataset}.artist_scores"]
+                  if row['chart_date'] == split_date}
+    except ValueError as e:
+        stored = str(e)
+    checks["split scores round-trip through BigQuery"] = stored == expected
+    db.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_db = BillboardDatabase("sqlite", os.path.join(tmp, 'billboard.db'))
+        sqlite_db.save_chart_data(split_entries, split_scores, split_date)
+        stored = dict(sqlite_db.conn.execute(
+            'SELECT artist, total_score FROM artist_scores WHERE chart_date = ?', (split_date,)).fetchall())
+        top_score = sqlite_db.conn.execute(
+            'SELECT top_score FROM weekly_summary WHERE chart_date = ?', (split_date,)).fetchone()[0]
+        sqlite_db.close()
+    checks["split scores round-trip through SQLite"] = stored == expected and top_score == split_scores[0]['total_score']
+    print(f"   split scores {expected}")
+
+    for name, ok in checks.items():
+        print(f"   {'✅' if ok else '❌'} {name}")
+
+    failed = not all(checks.values())
+    print("❌ BigQuery writes failed a check" if failed else "✅ Re-saving weeks is idempotent and split scores round-trip")
+    return 1 if failed else 0
+
+
+def main():
+    """Run the selected benchmark."""
+    parser = argparse.ArgumentParser(description="Backend performance benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    parsers_cmd = subparsers.add_parser('parsers', help="HTML parser backends for the scraper")
+    parsers_cmd.add_argument('--page', help="Saved chart page (default: synthetic page)")
+    parsers_cmd.add_argument('--repeat', type=int, default=20)
+    parsers_cmd.set_defaults(func=bench_parsers)
+
+    converter_cmd = subparsers.add_parser('converter', help="Markdown review field extraction")
+    converter_cmd.add_argument('--reviews', type=int, default=10000)
+    converter_cmd.add_argument('--repeat', type=int, default=3)
+    converter_cmd.set_defaults(func=bench_converter)
+
+    search_cmd = subparsers.add_parser('search', help="Review search index vs linear scan")
+    search_cmd.add_argument('--reviews', type=int, default=100000)
+    search_cmd.add_argument('--repeat', type=int, default=5)
+    search_cmd.set_defaults(func=bench_search)
+
+    load_cmd = subparsers.add_parser('load', help="Concurrent load test against a running API server")
+    load_cmd.add_argument('--url', default='http://localhost:8001/api/reviews')
+    load_cmd.add_argument('--clients', type=int, nargs='+', default=[1, 16, 128])
+    load_cmd.add_argument('--duration', type=float, default=10.0, help="Seconds per concurrency level")
+    load_cmd.set_defaults(func=bench_load)
+
+    history_cmd = subparsers.add_parser('history', help="Chart history queries over synthetic full history")
+    history_cmd.add_argument('--years', type=int, default=66)
+    history_cmd.add_argument('--repeat', type=int, default=200)
+    history_cmd.set_defaults(func=bench_history)
+
+    scoring_cmd = subparsers.add_parser('scoring', help="Full-history artist leaderboard scoring")
+    scoring_cmd.add_argument('--years', type=int, default=66)
+    scoring_cmd.add_argument('--top', type=int, default=100)
+    scoring_cmd.add_argument('--repeat', type=int, default=5)
+    scoring_cmd.set_defaults(func=bench_scoring)
+
+    credits_cmd = subparsers.add_parser('credits', help="Artist credit parsing over a full history")
+    credits_cmd.add_argument('--years', type=int, default=66)
+    credits_cmd.add_argument('--history', help="Directory of billboard_*.json weeks (default: synthetic)")
+    credits_cmd.add_argument('--repeat', type=int, default=3)
+    credits_cmd.set_defaults(func=bench_credits)
+
+    snapshots_cmd = subparsers.add_parser('snapshots', help="Per-week JSON files vs binary snapshots")
+    snapshots_cmd.add_argument('--years', type=int, default=66)
+    snapshots_cmd.add_argument('--repeat', type=int, default=3)
+    snapshots_cmd.set_defaults(func=bench_snapshots)
+
+    archive_cmd = subparsers.add_parser('archive', help="Folder tree vs history archive week lookups")
+    archive_cmd.add_argument('--years', type=int, default=66)
+    archive_cmd.add_argument('--weeks', type=int, default=50, help="Random weeks read per run")
+    archive_cmd.add_argument('--repeat', type=int, default=5)
+    archive_cmd.set_defaults(func=bench_archive)
+
+    publish_cmd = subparsers.add_parser('publish', help="Concurrent reader/writer stress test of atomic publishing")
+    publish_cmd.add_argument('--reviews', type=int, default=20000)
+    publish_cmd.add_argument('--readers', type=int, default=8)
+    publish_cmd.add_argument('--duration', type=float, default=5.0, help="Seconds per write mode")
+    publish_cmd.set_defaults(func=bench_publish)
+
+    backfill_cmd = subparsers.add_parser('backfill', help="Historical backfill self-test against a fixture server")
+    backfill_cmd.add_argument('--weeks', type=int, default=20)
+    backfill_cmd.add_argument('--workers', type=int, default=4)
+    backfill_cmd.set_defaults(func=bench_backfill)
+
+    bigquery_cmd = subparsers.add_parser('bigquery', help="Idempotent BigQuery writes against a fake client")
+    bigquery_cmd.add_argument('--weeks', type=int, default=10)
+    bigquery_cmd.set_defaults(func=bench_bigquery)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
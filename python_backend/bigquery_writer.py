@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Batched, idempotent writes to the BigQuery chart tables.
+
+Rows are buffered per table and written in one step per batch:
+
+1. The batch is serialized as newline-delimited JSON and submitted as a
+   single load job into a short-lived staging table. Load jobs are free,
+   unlike streaming inserts, and they either fail as a whole or succeed.
+2. A MERGE upserts the staging rows into the target table on its key,
+   e.g. (chart_date, rank) for chart_entries. Re-running a week replaces
+   its rows instead of duplicating them, like SQLite's INSERT OR REPLACE.
+3. The latest chart_date of the target is recorded in chart_metadata, so
+   readers can find the current week without scanning the table.
+4. The staging table is dropped. It also expires on its own after an
+   hour, in case the process dies mid-batch.
+
+Target tables are partitioned by chart_date and clustered by artist. The
+MERGE bounds the target to the batch's date range, so it only scans the
+partitions it touches.
+
+The writer only calls create_table, load_table_from_file, query and
+delete_table on its client, so checks can pass an in-memory fake instead of
+a bigquery.Client (see benchmarks.FakeBigQueryClient).
+"""
+
+import io
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Sequence
+
+# BigQuery imports (optional)
+try:
+    from google.cloud import bigquery
+    BIGQUERY_AVAILABLE = True
+except ImportError:
+    BIGQUERY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Table -> columns (in the order of BillboardDatabase._build_week_rows tuples),
+# upsert key and clustering. Every table is partitioned on chart_date.
+BIGQUERY_TABLES = {
+    'chart_entries': {
+        'columns': [
+            ('rank', 'INTEGER'),
+            ('title', 'STRING'),
+            ('artist', 'STRING'),
+            ('chart_date', 'DATE'),
+            ('scraped_at', 'TIMESTAMP'),
+        ],
+        'key': ['chart_date', 'rank'],
+        'clustering': ['artist'],
+    },
+    'artist_scores': {
+        'columns': [
+            ('artist', 'STRING'),
+            ('total_score', 'FLOAT'),
+            ('chart_date', 'DATE'),
+            ('songs_count', 'INTEGER'),
+            ('chart_positions', 'STRING'),
+            ('scraped_at', 'TIMESTAMP'),
+        ],
+        'key': ['chart_date', 'artist'],
+        'clustering': ['artist'],
+    },
+    'weekly_summary': {
+        'columns': [
+            ('chart_date', 'DATE'),
+            ('total_entries', 'INTEGER'),
+            ('top_artist', 'STRING'),
+            ('top_score', 'FLOAT'),
+            ('scraped_at', 'TIMESTAMP'),
+        ],
+        'key': ['chart_date'],
+        'clustering': ['top_artist'],
+    },
+}
+
+# Small unpartitioned table: table name -> latest chart_date written to it
+METADATA_TABLE = 'chart_metadata'
+METADATA_COLUMNS = [
+    ('table_name', 'STRING'),
+    ('latest_chart_date', 'DATE'),
+    ('updated_at', 'TIMESTAMP'),
+]
+
+PARTITION_FIELD = 'chart_date'
+# Weekly charts put one week in each daily partition; monthly partitions stay
+# well inside BigQuery's per-table partition limit for 65+ years of history
+PARTITION_TYPE = 'MONTH'
+STAGING_TTL = timedelta(hours=1)
+
+
+def schema_fields(spec: Dict) -> List['bigquery.SchemaField']:
+    """BigQuery schema for a table spec."""
+    return [bigquery.SchemaField(name, field_type, mode="REQUIRED") for name, field_type in spec['columns']]
+
+
+def table_definition(table_id: str, spec: Dict) -> 'bigquery.Table':
+    """Partitioned, clustered target table for a table spec."""
+    table = bigquery.Table(table_id, schema=schema_fields(spec))
+    table.time_partitioning = bigquery.TimePartitioning(type_=PARTITION_TYPE, field=PARTITION_FIELD)
+    table.clustering_fields = spec['clustering']
+    return table
+
+
+def metadata_definition(table_id: str) -> 'bigquery.Table':
+    """The chart_metadata table."""
+    return bigquery.Table(table_id, schema=[
+        bigquery.SchemaField(name, field_type, mode="REQUIRED") for name, field_type in METADATA_COLUMNS
+    ])
+
+
+def merge_sql(target_id: str, staging_id: str, spec: Dict) -> str:
+    """MERGE statement upserting a staging table into its target on the spec's key."""
+    columns = [name for name, _ in spec['columns']]
+    key_match = ' AND '.join(f'T.{name} = S.{name}' for name in spec['key'])
+    updates = ', '.join(f'{name} = S.{name}' for name in columns if name not in spec['key'])
+    return f'''
+        MERGE `{target_id}` T
+        USING `{staging_id}` S
+        ON T.{PARTITION_FIELD} BETWEEN @min_date AND @max_date AND {key_match}
+        WHEN MATCHED THEN
+            UPDATE SET {updates}
+        WHEN NOT MATCHED THEN
+            INSERT ({', '.join(columns)}) VALUES ({', '.join(f'S.{name}' for name in columns)})
+    '''
+
+
+def metadata_merge_sql(metadata_id: str) -> str:
+    """MERGE advancing a table's latest_chart_date in chart_metadata (never moving it back)."""
+    return f'''
+        MERGE `{metadata_id}` T
+        USING (SELECT @table_name AS table_name, @max_date AS latest_chart_date) S
+        ON T.table_name = S.table_name
+        WHEN MATCHED AND S.latest_chart_date > T.latest_chart_date THEN
+            UPDATE SET latest_chart_date = S.latest_chart_date, updated_at = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN
+            INSERT (table_name, latest_chart_date, updated_at)
+            VALUES (S.table_name, S.latest_chart_date, CURRENT_TIMESTAMP())
+    '''
+
+
+class BigQueryBatchWriter:
+    """Buffers chart rows and upserts them with one load job and MERGE per table."""
+
+    def __init__(self, client, dataset: str, tables: Dict[str, Dict] = BIGQUERY_TABLES):
+        """
+        Initialize the writer.
+
+        Args:
+            client: bigquery.Client, or a fake with the same methods
+            dataset: Fully qualified dataset, e.g. "my-project.billboard"
+            tables: Table specs to write to
+        """
+        if not BIGQUERY_AVAILABLE:
+            raise ImportError("BigQuery not available. Install google-cloud-bigquery")
+        self.client = client
+        self.dataset = dataset
+        self.tables = tables
+        # table -> key -> row; a later row with the same key replaces the earlier one
+        self._pending = {table: {} for table in tables}
+
+    @property
+    def pending_rows(self) -> int:
+        """Number of buffered rows across all tables."""
+        return sum(len(rows) for rows in self._pending.values())
+
+    def add(self, table: str, rows: Iterable[Sequence]):
+        """
+        Buffer rows for a table.
+
+        Args:
+            table: Table name, a key of tables
+            rows: Tuples in the spec's column order
+        """
+        spec = self.tables[table]
+        columns = [name for name, _ in spec['columns']]
+        pending = self._pending[table]
+        for values in rows:
+            row = dict(zip(columns, values))
+            pending[tuple(row[name] for name in spec['key'])] = row
+
+    def flush(self) -> Dict[str, int]:
+        """
+        Upsert every buffered row.
+
+        Returns:
+            Rows written per table
+
+        Raises:
+            Exception: If a load job or MERGE fails; rows of tables not yet
+                written stay buffered
+        """
+        written = {}
+        for table, pending in self._pending.items():
+            if not pending:
+                continue
+            self._upsert(table, list(pending.values()))
+            written[table] = len(pending)
+            pending.clear()
+        return written
+
+    def _upsert(self, table: str, rows: List[Dict]):
+        """Load rows into a staging table and MERGE them into the target."""
+        spec = self.tables[table]
+        target_id = f"{self.dataset}.{table}"
+        staging_id = f"{self.dataset}._staging_{table}_{uuid.uuid4().hex[:12]}"
+
+        staging = bigquery.Table(staging_id, schema=schema_fields(spec))
+        staging.expires = datetime.now(timezone.utc) + STAGING_TTL
+        self.client.create_table(staging)
+        try:
+            payload = '\n'.join(json.dumps(row) for row in rows).encode('utf-8')
+            load_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                schema=schema_fields(spec),
+                write_disposition=bigquery.WriteDisposition.WRITE_EMPTY
+            )
+            self.client.load_table_from_file(io.BytesIO(payload), staging_id, job_config=load_config).result()
+
+            dates = [row[PARTITION_FIELD] for row in rows]
+            query_config = bigquery.QueryJobConfig(query_parameters=[
+                bigquery.ScalarQueryParameter('min_date', 'DATE', min(dates)),
+                bigquery.ScalarQueryParameter('max_date', 'DATE', max(dates))
+            ])
+            job = self.client.query(merge_sql(target_id, staging_id, spec), job_config=query_config)
+            job.result()
+            logger.info(f"Merged {len(rows)} rows into {target_id}, "
+                        f"{job.total_bytes_processed or 0:,} bytes processed")
+
+            metadata_config = bigquery.QueryJobConfig(query_parameters=[
+                bigquery.ScalarQueryParameter('table_name', 'STRING', table),
+                bigquery.ScalarQueryParameter('max_date', 'DATE', max(dates))
+            ])
+            self.client.query(metadata_merge_sql(f"{self.dataset}.{METADATA_TABLE}"),
+                              job_config=metadata_config).result()
+        finally:
+            self.client.delete_table(staging_id, not_found_ok=True)
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Billboard Hot 100 Historical Backfill
+
+Fetches past weekly Hot 100 charts over a date range through a bounded worker
+pool, with per-host rate limiting and exponential backoff. Each week is saved to
+BillboardDatabase as soon as it completes and recorded in a checkpoint file, so
+a crashed or interrupted run picks up where it left off.
+
+Usage:
+    python billboard_backfill.py --start 2020-01-01 --end 2020-12-31
+    python billboard_backfill.py --start 2020-01-01 --end 2020-12-31 --workers 8 --rps 2
+    python billboard_backfill.py --start 2020-01-01 --end 2020-01-31 --base-url http://localhost:9000/charts/hot-100/
+
+`python benchmarks.py backfill` runs a self-test against a local fixture
+server: fetching, 429/5xx retries, an interrupted run and its resume.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from billboard_scraper import BillboardScraper, DEFAULT_CACHE_DIR, DEFAULT_PROFILE_PATH
+from page_cache import PageCache
+from billboard_database import BillboardDatabase
+
+logger = logging.getLogger(__name__)
+
+# Hot 100 charts are dated on Saturdays
+CHART_WEEKDAY = 5
+
+# Status codes worth retrying; anything else in the 4xx range is permanent
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Thread-safe per-host rate limiter that spaces requests evenly."""
+
+    def __init__(self, requests_per_second: float):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_second: Maximum request rate per host
+        """
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str):
+        """Block until the next request slot for the URL's host is available."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class BackfillCheckpoint:
+    """On-disk record of completed and failed backfill weeks."""
+
+    def __init__(self, path: str):
+        """
+        Load the checkpoint file if it exists.
+
+        Args:
+            path: Path of the JSON checkpoint file
+        """
+        self.path = path
+        self.completed = set()
+        self.failed = {}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.completed = set(data.get('completed', []))
+            self.failed = data.get('failed', {})
+
+    def mark_completed(self, chart_date: str):
+        """Record a week as saved."""
+        self.completed.add(chart_date)
+        self.failed.pop(chart_date, None)
+        self._write()
+
+    def mark_failed(self, chart_date: str, error: str):
+        """Record a week that could not be fetched."""
+        self.failed[chart_date] = error
+        self._write()
+
+    def _write(self):
+        """Write the checkpoint via a temp file so a crash never truncates it."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'completed': sorted(self.completed),
+                'failed': self.failed,
+                'updated_at': datetime.now().isoformat()
+            }, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class HistoricalBackfill:
+    """Concurrent fetcher for past Hot 100 weeks."""
+
+    def __init__(self, db: BillboardDatabase, start_date: str, end_date: str,
+                 workers: int = 4, requests_per_second: float = 1.0,
+                 max_retries: int = 4, backoff: float = 2.0,
+                 checkpoint_path: str = "backfill_checkpoint.json",
+                 base_url: Optional[str] = None,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 profile_path: Optional[str] = DEFAULT_PROFILE_PATH):
+        """
+        Initialize the backfill.
+
+        Args:
+            db: Database the weeks are saved to
+            start_date: First date of the range (YYYY-MM-DD)
+            end_date: Last date of the range (YYYY-MM-DD)
+            workers: Number of concurrent fetch threads
+            requests_per_second: Maximum request rate per host
+            max_retries: Maximum attempts per week
+            backoff: Base backoff in seconds (doubles on each retry)
+            checkpoint_path: Path of the resumable checkpoint file
+            base_url: Chart URL override, e.g. a local fixture server
+            cache_dir: Raw page cache directory shared by all workers, or None
+            profile_path: Layout profile file for the scrapers, or None to keep profiles in memory
+        """
+        self.db = db
+        self.start_date = datetime.strptime(start_date, '%Y-%m-%d')
+        self.end_date = datetime.strptime(end_date, '%Y-%m-%d')
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.base_url = base_url
+        self.profile_path = profile_path
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.checkpoint = BackfillCheckpoint(checkpoint_path)
+        self.page_cache = PageCache(cache_dir) if cache_dir else None
+        self._local = threading.local()
+        self._pending_pages = {}
+
+    def chart_dates(self) -> List[str]:
+        """List every chart date (Saturday) in the configured range."""
+        first = self.start_date + timedelta(days=(CHART_WEEKDAY - self.start_date.weekday()) % 7)
+        dates = []
+        current = first
+        while current <= self.end_date:
+            dates.append(current.strftime('%Y-%m-%d'))
+            current += timedelta(weeks=1)
+        return dates
+
+    def _scraper(self) -> BillboardScraper:
+        """Per-thread scraper, since requests.Session isn't shared across threads."""
+        if not hasattr(self._local, 'scraper'):
+            self._local.scraper = BillboardScraper(base_url=self.base_url, profile_path=self.profile_path,
+                                                  page_cache=self.page_cache)
+        return self._local.scraper
+
+    def fetch_week(self, chart_date: str) -> List[Dict]:
+        """
+        Fetch and parse one week, retrying transient failures with backoff.
+
+        Each attempt is a single BillboardScraper.scrape_chart() call, so the
+        page cache works as in a weekly scrape; the page is kept pending
+        until run() has saved the week.
+
+        Args:
+            chart_date: Chart date in YYYY-MM-DD format
+
+        Returns:
+            List of chart entries for the week
+        """
+        scraper = self._scraper()
+        url = scraper.get_chart_url(chart_date)
+
+        for attempt in range(self.max_retries):
+            retry_after = None
+            try:
+                self.rate_limiter.wait(url)
+                chart_entries = scraper.scrape_chart(url, chart_date, max_retries=1)
+                if chart_entries:
+                    self._pending_pages[chart_date] = scraper.pending_page
+                    return chart_entries
+                logger.warning(f"No chart entries found for {chart_date}")
+
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise
+                if e.response is not None:
+                    retry_after = e.response.headers.get('Retry-After')
+                logger.warning(f"{chart_date}: {e} (attempt {attempt + 1}/{self.max_retries})")
+            except requests.RequestException as e:
+                logger.warning(f"{chart_date}: {e} (attempt {attempt + 1}/{self.max_retries})")
+
+            if attempt < self.max_retries - 1:
+                if retry_after and retry_after.isdigit():
+                    pause = float(retry_after)
+                else:
+                    pause = self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+                time.sleep(pause)
+
+        raise RuntimeError(f"Giving up on {chart_date} after {self.max_retries} attempts")
+
+    def run(self) -> Dict:
+        """
+        Fetch every pending week and save each one as it completes.
+
+        Returns:
+            Run statistics: total, skipped, saved, failed and seconds
+        """
+        all_dates = self.chart_dates()
+        pending = [d for d in all_dates if d not in self.checkpoint.completed]
+        stats = {
+            'total': len(all_dates),
+            'skipped': len(all_dates) - len(pending),
+            'saved': 0,
+            'failed': 0
+        }
+        start = time.perf_counter()
+        scorer = BillboardScraper(base_url=self.base_url, profile_path=self.profile_path,
+                                  page_cache=self.page_cache)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.fetch_week, d): d for d in pending}
+
+            # Saves happen on this thread, so the database connection is never shared
+            for future in as_completed(futures):
+                chart_date = futures[future]
+                try:
+                    chart_entries = future.result()
+                    artist_scores = scorer.get_top_artists(chart_entries, top_n=len(chart_entries))
+                    # Weeks complete out of order; movement is rebuilt once below
+                    self.db.save_chart_data(chart_entries, artist_scores, chart_date, update_movement=False)
+                    self.checkpoint.mark_completed(chart_date)
+                    scorer.commit_page(self._pending_pages.pop(chart_date))
+                    stats['saved'] += 1
+                    print(f"✅ {chart_date}: {len(chart_entries)} entries "
+                          f"({stats['saved']}/{len(pending)})")
+                except Exception as e:
+                    self.checkpoint.mark_failed(chart_date, str(e))
+                    stats['failed'] += 1
+                    print(f"❌ {chart_date}: {e}")
+
+        # Rebuild from the first week saved without movement, which also
+        # covers weeks saved by an earlier run that was interrupted before here
+        self.db.rebuild_chart_movement(missing_only=True)
+
+        stats['seconds'] = round(time.perf_counter() - start, 2)
+        return stats
+
+
+def main():
+    """Run a historical backfill from the command line."""
+    parser = argparse.ArgumentParser(description="Backfill historical Billboard Hot 100 charts")
+    parser.add_argument('--start', required=True, help="First date of the range (YYYY-MM-DD)")
+    parser.add_argument('--end', default=datetime.now().strftime('%Y-%m-%d'),
+                        help="Last date of the range (YYYY-MM-DD, default: today)")
+    parser.add_argument('--db', default='billboard.db', help="SQLite database path")
+    parser.add_argument('--workers', type=int, default=4, help="Concurrent fetch threads")
+    parser.add_argument('--rps', type=float, default=1.0, help="Maximum requests per second per host")
+    parser.add_argument('--retries', type=int, default=4, help="Maximum attempts per week")
+    parser.add_argument('--checkpoint', default='backfill_checkpoint.json', help="Checkpoint file path")
+    parser.add_argument('--base-url', default=None, help="Chart URL override (e.g. a local fixture server)")
+    parser.add_argument('--no-cache', action='store_true', help="Don't cache raw pages on disk")
+    args = parser.parse_args()
+
+    print("📚 Billboard Hot 100 Historical Backfill")
+    print("=" * 40)
+
+    db = BillboardDatabase("sqlite", args.db)
+    try:
+        backfill = HistoricalBackfill(
+            db, args.start, args.end,
+            workers=args.workers,
+            requests_per_second=args.rps,
+            max_retries=args.retries,
+            checkpoint_path=args.checkpoint,
+            base_url=args.base_url,
+            cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR
+        )
+        stats = backfill.run()
+    finally:
+        db.close()
+
+    print(f"\n📊 {stats['saved']} saved, {stats['skipped']} already done, "
+          f"{stats['failed']} failed of {stats['total']} weeks in {stats['seconds']}s")
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,12 +7,18 @@ Author: Your Music Analytics Blog
 Date: 2025
 """
 
+import argparse
 import sqlite3
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Union
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Dict, Optional, Union, Iterable, Tuple
 import os
+import re
+import sys
+import time
 
 # BigQuery imports (optional)
 try:
@@ -23,21 +29,177 @@ except ImportError:
     BIGQUERY_AVAILABLE = False
     logging.warning("BigQuery not available. Install with: pip install google-cloud-bigquery")
 
+from artist_credits import name_key
+from bigquery_writer import (BIGQUERY_TABLES, METADATA_TABLE, BigQueryBatchWriter, metadata_definition,
+                             table_definition)
+
 logger = logging.getLogger(__name__)
 
+# Shared by the single-week and bulk SQLite write paths
+INSERT_CHART_ENTRY_SQL = '''
+    INSERT OR REPLACE INTO chart_entries 
+    (rank, title, artist, chart_date, scraped_at, song_id)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_SONG_SQL = '''
+    INSERT OR IGNORE INTO songs (song_key, title, artist)
+    VALUES (?, ?, ?)
+'''
+
+# Covering indexes for the history queries: a song's trajectory, one week's
+# chart and an artist's entries over a date range are all index-only scans
+CHART_HISTORY_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_chart_entries_song ON chart_entries (song_id, chart_date, rank)',
+    'CREATE INDEX IF NOT EXISTS idx_chart_entries_date ON chart_entries (chart_date, rank)',
+    'CREATE INDEX IF NOT EXISTS idx_chart_entries_artist ON chart_entries (artist, chart_date, song_id, rank)',
+]
+
+# A song that leaves the chart for longer than this and comes back is a re-entry
+CHART_WEEK_DAYS = 7
+
+INSERT_CHART_MOVEMENT_SQL = '''
+    INSERT OR REPLACE INTO chart_movement
+    (chart_date, rank, song_id, previous_rank, rank_change, peak_to_date, weeks_on_chart, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Movement queries read one week (at most 100 rows of the primary key), so
+# indexing status or rank_change would only slow down every write
+CHART_MOVEMENT_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_chart_movement_song ON chart_movement (song_id, chart_date)',
+    'DROP INDEX IF EXISTS idx_chart_movement_status',
+    'DROP INDEX IF EXISTS idx_chart_movement_change',
+]
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# SQLite's default limit on bound parameters is 999 on older builds
+SQLITE_MAX_PARAMS = 900
+
+def song_key(title: str, artist: str) -> str:
+    """Normalized identity of a song: case- and whitespace-insensitive artist and title."""
+    sub = WHITESPACE_RE.sub
+    return f"{sub(' ', str(artist)).strip().lower()}|{sub(' ', str(title)).strip().lower()}"
+
+def summarize_trajectory(trajectory: List[Dict]) -> Dict:
+    """
+    Derive chart statistics from a song's weekly ranks.
+    
+    Args:
+        trajectory: Dicts with 'chart_date' and 'rank', oldest first
+        
+    Returns:
+        Dictionary with weeks_on_chart, peak_position, peak_date, debut_date,
+        debut_rank, runs (consecutive stretches on the chart) and re_entries
+    """
+    if not trajectory:
+        return {'weeks_on_chart': 0, 'peak_position': None, 'peak_date': None,
+                'debut_date': None, 'debut_rank': None, 'runs': [], 're_entries': []}
+    
+    peak = min(trajectory, key=lambda week: week['rank'])
+    runs = []
+    previous_date = None
+    for week in trajectory:
+        week_date = datetime.strptime(str(week['chart_date'])[:10], '%Y-%m-%d')
+        if previous_date is None or (week_date - previous_date).days > CHART_WEEK_DAYS:
+            runs.append({'start_date': week['chart_date'], 'entry_rank': week['rank'], 'weeks': 0})
+        runs[-1]['end_date'] = week['chart_date']
+        runs[-1]['weeks'] += 1
+        previous_date = week_date
+    
+    return {
+        'weeks_on_chart': len(trajectory),
+        'peak_position': peak['rank'],
+        'peak_date': peak['chart_date'],
+        'debut_date': trajectory[0]['chart_date'],
+        'debut_rank': trajectory[0]['rank'],
+        'runs': runs,
+        're_entries': [run['start_date'] for run in runs[1:]]
+    }
+
+INSERT_ARTIST_SCORE_SQL = '''
+    INSERT OR REPLACE INTO artist_scores 
+    (artist, total_score, chart_date, songs_count, chart_positions, scraped_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_WEEKLY_SUMMARY_SQL = '''
+    INSERT OR REPLACE INTO weekly_summary 
+    (chart_date, total_entries, top_artist, top_score, scraped_at)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+# Repeated BigQuery reads (same SQL and parameters) are served from memory
+# for this long; every write through this instance clears the cache
+BIGQUERY_CACHE_TTL = 300  # seconds
+BIGQUERY_CACHE_SIZE = 256
+
+class ChartMovementTracker:
+    """
+    Running per-song chart state, used to derive week-over-week movement.
+    
+    Weeks must be fed in chart date order. The state for a song holds its
+    last chart date and rank, its peak to date and its weeks on chart.
+    """
+    
+    def __init__(self, previous_date: Optional[str] = None, state: Optional[Dict] = None):
+        """
+        Initialize the tracker.
+        
+        Args:
+            previous_date: Chart date before the first week to be fed
+            state: song_id -> (last chart date, last rank, peak, weeks on chart)
+        """
+        self.previous_date = previous_date
+        self.state = state or {}
+    
+    def advance(self, chart_date: str, entries: Iterable[Tuple[int, int]]) -> List[tuple]:
+        """
+        Compute one week's movement rows and update the running state.
+        
+        Args:
+            chart_date: Date of the chart
+            entries: (rank, song_id) pairs for the week
+            
+        Returns:
+            Rows for INSERT_CHART_MOVEMENT_SQL
+        """
+        rows = []
+        for rank, song_id in entries:
+            last = self.state.get(song_id)
+            if last is None:
+                previous_rank, change, peak, weeks, status = None, None, rank, 1, 'new'
+            else:
+                last_date, last_rank, last_peak, last_weeks = last
+                peak, weeks = min(last_peak, rank), last_weeks + 1
+                if last_date != self.previous_date:
+                    previous_rank, change, status = None, None, 're-entry'
+                else:
+                    previous_rank, change = last_rank, last_rank - rank
+                    status = 'up' if change > 0 else 'down' if change < 0 else 'steady'
+            self.state[song_id] = (chart_date, rank, peak, weeks)
+            rows.append((chart_date, rank, song_id, previous_rank, change, peak, weeks, status))
+        
+        self.previous_date = chart_date
+        return rows
+
 class BillboardDatabase:
     """Database operations for Billboard chart data."""
     
-    def __init__(self, db_type: str = "sqlite", db_path: str = "billboard_charts.db"):
+    def __init__(self, db_type: str = "sqlite", db_path: str = "billboard_charts.db", client=None):
         """
         Initialize database connection.
         
         Args:
             db_type: "sqlite" or "bigquery"
             db_path: For SQLite: file path, for BigQuery: project_id
+            client: BigQuery client to use instead of creating one (e.g. a
+                local fake in tests)
         """
         self.db_type = db_type.lower()
         self.db_path = db_path
+        self.client = client
         
         if self.db_type == "sqlite":
             self._init_sqlite()
@@ -52,6 +214,7 @@ class BillboardDatabase:
         """Initialize SQLite database and create tables."""
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row  # Enable dict-like access
+        self._song_id_cache = {}  # song_key -> songs.id
         
         # Create tables
         self._create_sqlite_tables()
@@ -60,18 +223,22 @@ class BillboardDatabase:
     def _init_bigquery(self):
         """Initialize BigQuery client."""
         try:
-            # Try to use service account credentials
-            if os.path.exists('service-account-key.json'):
-                credentials = service_account.Credentials.from_service_account_file(
-                    'service-account-key.json'
-                )
-                self.client = bigquery.Client(credentials=credentials, project=self.db_path)
-            else:
-                # Use default credentials
-                self.client = bigquery.Client(project=self.db_path)
+            if self.client is None:
+                # Try to use service account credentials
+                if os.path.exists('service-account-key.json'):
+                    credentials = service_account.Credentials.from_service_account_file(
+                        'service-account-key.json'
+                    )
+                    self.client = bigquery.Client(credentials=credentials, project=self.db_path)
+                else:
+                    # Use default credentials
+                    self.client = bigquery.Client(project=self.db_path)
             
             # Create tables if they don't exist
             self._create_bigquery_tables()
+            self.writer = BigQueryBatchWriter(self.client, f"{self.db_path}.billboard")
+            self._query_cache = {}  # (sql, params) -> (expires_at, rows)
+            self.query_stats = {'queries': 0, 'cache_hits': 0, 'bytes_processed': 0}
             logger.info(f"BigQuery client initialized: project {self.db_path}")
             
         except Exception as e:
@@ -91,16 +258,53 @@ class BillboardDatabase:
                 artist TEXT NOT NULL,
                 chart_date DATE NOT NULL,
                 scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                song_id INTEGER REFERENCES songs(id),
                 UNIQUE(rank, chart_date)
             )
         ''')
         
+        # Normalized song identities, so spelling/case variants share a history
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS songs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                song_key TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                artist TEXT NOT NULL
+            )
+        ''')
+        
+        # Week-over-week movement, materialized when each week is saved
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS chart_movement (
+                chart_date DATE NOT NULL,
+                rank INTEGER NOT NULL,
+                song_id INTEGER NOT NULL REFERENCES songs(id),
+                previous_rank INTEGER,
+                rank_change INTEGER,
+                peak_to_date INTEGER NOT NULL,
+                weeks_on_chart INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                PRIMARY KEY (chart_date, rank)
+            )
+        ''')
+        
+        self._migrate_song_ids(cursor)
+        for statement in CHART_HISTORY_INDEXES + CHART_MOVEMENT_INDEXES:
+            cursor.execute(statement)
+        
+        # Databases created before chart_movement existed, or left behind by an
+        # interrupted load, get movement filled in from the first week without it
+        from_date = self._first_week_without_movement_sqlite(cursor)
+        if from_date is not None:
+            rows = self._rebuild_chart_movement_sqlite(cursor, from_date)
+            logger.info(f"Built {rows} chart movement rows from {from_date}")
+        
         # Artist scores table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS artist_scores (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 artist TEXT NOT NULL,
-                total_score INTEGER NOT NULL,
+                total_score REAL NOT NULL,
                 chart_date DATE NOT NULL,
                 songs_count INTEGER NOT NULL,
                 chart_positions TEXT NOT NULL,
@@ -116,50 +320,216 @@ class BillboardDatabase:
                 chart_date DATE UNIQUE NOT NULL,
                 total_entries INTEGER NOT NULL,
                 top_artist TEXT NOT NULL,
-                top_score INTEGER NOT NULL,
+                top_score REAL NOT NULL,
                 scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
         
+        # Artist name canonicalization for artist_credits.ArtistCreditParser:
+        # alias_key is name_key() of a spelling; is_group marks names that
+        # contain separators but must not be split
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS artist_aliases (
+                alias_key TEXT PRIMARY KEY,
+                canonical TEXT NOT NULL,
+                is_group INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
         self.conn.commit()
         logger.info("SQLite tables created successfully")
     
+    def _migrate_song_ids(self, cursor):
+        """Add chart_entries.song_id to older databases and fill in missing song ids."""
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(chart_entries)')]
+        if 'song_id' not in columns:
+            cursor.execute('ALTER TABLE chart_entries ADD COLUMN song_id INTEGER REFERENCES songs(id)')
+        
+        if cursor.execute('SELECT 1 FROM chart_entries WHERE song_id IS NULL LIMIT 1').fetchone() is None:
+            return
+        
+        self.conn.create_function('song_key', 2, song_key, deterministic=True)
+        cursor.execute('''
+            INSERT OR IGNORE INTO songs (song_key, title, artist)
+            SELECT song_key(title, artist), title, artist
+            FROM chart_entries
+            WHERE song_id IS NULL
+            ORDER BY chart_date
+        ''')
+        cursor.execute('''
+            UPDATE chart_entries
+            SET song_id = (SELECT id FROM songs WHERE songs.song_key = song_key(chart_entries.title, chart_entries.artist))
+            WHERE song_id IS NULL
+        ''')
+        logger.info(f"Assigned song ids to {cursor.rowcount} existing chart entries")
+    
+    def _with_song_ids(self, cursor, entry_rows: List[tuple]) -> List[tuple]:
+        """
+        Append the song id to each chart entry row, creating songs as needed.
+        
+        Ids are cached per instance. Songs missing from the cache are inserted
+        with one executemany per batch and their ids read back with one
+        song_key IN (...) query per chunk, so a bulk load never round-trips
+        to SQLite per row.
+        """
+        cache = self._song_id_cache
+        keys = [song_key(row[1], row[2]) for row in entry_rows]
+        
+        new_songs = {}
+        for key, row in zip(keys, entry_rows):
+            if key not in cache and key not in new_songs:
+                new_songs[key] = (key, row[1], row[2])
+        if new_songs:
+            cursor.executemany(INSERT_SONG_SQL, new_songs.values())
+            # Plain tuples: (song_key, id) pairs go straight into the cache
+            reader = self.conn.cursor()
+            reader.row_factory = None
+            new_keys = list(new_songs)
+            for start in range(0, len(new_keys), SQLITE_MAX_PARAMS):
+                chunk = new_keys[start:start + SQLITE_MAX_PARAMS]
+                cache.update(reader.execute(
+                    f"SELECT song_key, id FROM songs WHERE song_key IN ({','.join('?' * len(chunk))})", chunk
+                ))
+        
+        return [row + (cache[key],) for key, row in zip(keys, entry_rows)]
+    
+    def _movement_tracker_before(self, cursor, chart_date: str,
+                                 song_ids: Optional[List[int]] = None) -> ChartMovementTracker:
+        """
+        Load the chart state as of the week before chart_date.
+        
+        Args:
+            cursor: SQLite cursor
+            chart_date: First week that will be fed to the tracker
+            song_ids: Only load these songs (default: every song)
+        """
+        previous_date = cursor.execute(
+            'SELECT MAX(chart_date) FROM chart_entries WHERE chart_date < ?', (chart_date,)
+        ).fetchone()[0]
+        
+        # SQLite returns the bare columns from the row holding MAX(chart_date)
+        query = '''
+            SELECT song_id, MAX(chart_date) AS last_date, rank, peak_to_date, weeks_on_chart
+            FROM chart_movement
+            WHERE chart_date < ?
+        '''
+        params = [chart_date]
+        if song_ids is not None:
+            query += f" AND song_id IN ({','.join('?' * len(song_ids))})"
+            params.extend(song_ids)
+        query += ' GROUP BY song_id'
+        
+        state = {
+            row['song_id']: (row['last_date'], row['rank'], row['peak_to_date'], row['weeks_on_chart'])
+            for row in cursor.execute(query, params)
+        }
+        return ChartMovementTracker(previous_date, state)
+    
+    def _save_week_movement_sqlite(self, cursor, chart_date: str, entries: List[Tuple[int, int]]):
+        """Compute and store one week's movement from the prior weeks' rows."""
+        tracker = self._movement_tracker_before(cursor, chart_date, [song_id for _, song_id in entries])
+        cursor.execute('DELETE FROM chart_movement WHERE chart_date = ?', (chart_date,))
+        cursor.executemany(INSERT_CHART_MOVEMENT_SQL, tracker.advance(chart_date, sorted(entries)))
+    
+    @staticmethod
+    def _first_week_without_movement_sqlite(cursor) -> Optional[str]:
+        """Earliest chart date that has entries but no chart_movement rows, or None."""
+        return cursor.execute('''
+            SELECT MIN(chart_date) FROM chart_entries
+            WHERE chart_date NOT IN (SELECT chart_date FROM chart_movement)
+        ''').fetchone()[0]
+    
+    def _rebuild_chart_movement_sqlite(self, cursor, from_date: Optional[str] = None,
+                                       batch_size: int = 5000) -> int:
+        """
+        Recompute chart_movement from from_date onwards, streaming weeks in date order.
+        
+        Returns:
+            Number of movement rows written
+        """
+        from_date = from_date or '0001-01-01'
+        tracker = self._movement_tracker_before(cursor, from_date)
+        cursor.execute('DELETE FROM chart_movement WHERE chart_date >= ?', (from_date,))
+        
+        reader = self.conn.cursor()
+        reader.execute('''
+            SELECT chart_date, rank, song_id
+            FROM chart_entries
+            WHERE chart_date >= ?
+            ORDER BY chart_date, rank
+        ''', (from_date,))
+        
+        pending, week, week_date, written = [], [], None, 0
+        for row in reader:
+            if row['chart_date'] != week_date:
+                if week:
+                    pending.extend(tracker.advance(week_date, week))
+                week, week_date = [], row['chart_date']
+                if len(pending) >= batch_size:
+                    cursor.executemany(INSERT_CHART_MOVEMENT_SQL, pending)
+                    written += len(pending)
+                    pending = []
+            week.append((row['rank'], row['song_id']))
+        if week:
+            pending.extend(tracker.advance(week_date, week))
+        
+        cursor.executemany(INSERT_CHART_MOVEMENT_SQL, pending)
+        return written + len(pending)
+    
+    def rebuild_chart_movement(self, from_date: Optional[str] = None, missing_only: bool = False) -> Dict:
+        """
+        Recompute the materialized chart_movement table (SQLite only).
+        
+        Weeks are read in chart date order and processed one at a time, so
+        memory holds only the running per-song state.
+        
+        Args:
+            from_date: First week to recompute (default: the whole history)
+            missing_only: Start at the earliest week that has no movement rows
+                instead (e.g. after weeks were saved with update_movement=False
+                by a run that may have been interrupted); nothing is rebuilt
+                if every week has them
+            
+        Returns:
+            Statistics with rows and seconds
+        """
+        if self.db_type != "sqlite":
+            raise ValueError("chart_movement is only materialized for SQLite")
+        
+        start = time.perf_counter()
+        cursor = self.conn.cursor()
+        try:
+            if missing_only:
+                from_date = self._first_week_without_movement_sqlite(cursor)
+            rows = 0 if missing_only and from_date is None else self._rebuild_chart_movement_sqlite(cursor, from_date)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        
+        stats = {'rows': rows, 'seconds': round(time.perf_counter() - start, 3)}
+        logger.info(f"Rebuilt {rows} chart movement rows in {stats['seconds']}s")
+        return stats
+    
     def _create_bigquery_tables(self):
-        """Create BigQuery tables for chart data."""
+        """
+        Create BigQuery tables for chart data.
+        
+        Tables are partitioned by chart_date and clustered by artist (see
+        bigquery_writer.BIGQUERY_TABLES), plus the small chart_metadata table
+        tracking each table's latest chart_date. Existing tables are left as
+        they are.
+        """
         try:
-            # Chart entries table
-            chart_entries_schema = [
-                bigquery.SchemaField("rank", "INTEGER", mode="REQUIRED"),
-                bigquery.SchemaField("title", "STRING", mode="REQUIRED"),
-                bigquery.SchemaField("artist", "STRING", mode="REQUIRED"),
-                bigquery.SchemaField("chart_date", "DATE", mode="REQUIRED"),
-                bigquery.SchemaField("scraped_at", "TIMESTAMP", mode="REQUIRED")
-            ]
-            
-            chart_entries_table = bigquery.Table(
-                f"{self.db_path}.billboard.chart_entries",
-                schema=chart_entries_schema
-            )
-            
-            # Artist scores table
-            artist_scores_schema = [
-                bigquery.SchemaField("artist", "STRING", mode="REQUIRED"),
-                bigquery.SchemaField("total_score", "INTEGER", mode="REQUIRED"),
-                bigquery.SchemaField("chart_date", "DATE", mode="REQUIRED"),
-                bigquery.SchemaField("songs_count", "INTEGER", mode="REQUIRED"),
-                bigquery.SchemaField("chart_positions", "STRING", mode="REQUIRED"),
-                bigquery.SchemaField("scraped_at", "TIMESTAMP", mode="REQUIRED")
-            ]
-            
-            artist_scores_table = bigquery.Table(
-                f"{self.db_path}.billboard.artist_scores",
-                schema=artist_scores_schema
-            )
-            
             # Create tables (ignore if they exist)
             try:
-                self.client.create_table(chart_entries_table, exists_ok=True)
-                self.client.create_table(artist_scores_table, exists_ok=True)
+                for table, spec in BIGQUERY_TABLES.items():
+                    self.client.create_table(
+                        table_definition(f"{self.db_path}.billboard.{table}", spec), exists_ok=True
+                    )
+                self.client.create_table(
+                    metadata_definition(f"{self.db_path}.billboard.{METADATA_TABLE}"), exists_ok=True
+                )
                 logger.info("BigQuery tables created successfully")
             except Exception as e:
                 logger.warning(f"Tables may already exist: {e}")
@@ -168,18 +538,28 @@ class BillboardDatabase:
             logger.error(f"Failed to create BigQuery tables: {e}")
             raise
     
-    def save_chart_data(self, chart_entries: List[Dict], artist_scores: List[Dict], chart_date: str):
+    def save_chart_data(self, chart_entries: List[Dict], artist_scores: List[Dict], chart_date: str,
+                        update_movement: bool = True):
         """
         Save chart data to database.
         
+        On SQLite the week's chart_movement rows are computed from the prior
+        week in the same transaction. Saving a week older than the latest
+        stored one also recomputes the movement of every later week. On
+        BigQuery the week is upserted with a load job and MERGE, so saving
+        the same week again replaces its rows.
+        
         Args:
             chart_entries: List of chart entries
             artist_scores: List of artist scores
             chart_date: Date of the chart
+            update_movement: Set to False when saving many weeks out of
+                order, then call rebuild_chart_movement(missing_only=True)
+                once at the end
         """
         try:
             if self.db_type == "sqlite":
-                self._save_chart_data_sqlite(chart_entries, artist_scores, chart_date)
+                self._save_chart_data_sqlite(chart_entries, artist_scores, chart_date, update_movement)
             else:
                 self._save_chart_data_bigquery(chart_entries, artist_scores, chart_date)
             
@@ -189,105 +569,289 @@ class BillboardDatabase:
             logger.error(f"Failed to save chart data: {e}")
             raise
     
-    def _save_chart_data_sqlite(self, chart_entries: List[Dict], artist_scores: List[Dict], chart_date: str):
+    def _save_chart_data_sqlite(self, chart_entries: List[Dict], artist_scores: List[Dict], chart_date: str,
+                                update_movement: bool = True):
         """Save chart data to SQLite database."""
         cursor = self.conn.cursor()
+        entry_rows, score_rows, summary_rows = self._build_week_rows(
+            chart_entries, artist_scores, chart_date, datetime.now().isoformat()
+        )
         
         try:
-            # Save chart entries
-            for entry in chart_entries:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO chart_entries 
-                    (rank, title, artist, chart_date, scraped_at)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    entry['rank'],
-                    entry['title'],
-                    entry['artist'],
-                    chart_date,
-                    entry['scraped_at']
-                ))
-            
-            # Save artist scores
-            for score in artist_scores:
-                chart_positions = json.dumps(score['chart_positions'])
-                cursor.execute('''
-                    INSERT OR REPLACE INTO artist_scores 
-                    (artist, total_score, chart_date, songs_count, chart_positions, scraped_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    score['artist'],
-                    score['total_score'],
-                    chart_date,
-                    score['songs_count'],
-                    chart_positions,
-                    datetime.now().isoformat()
-                ))
+            entry_rows = self._with_song_ids(cursor, entry_rows)
+            cursor.executemany(INSERT_CHART_ENTRY_SQL, entry_rows)
+            cursor.executemany(INSERT_ARTIST_SCORE_SQL, score_rows)
+            cursor.executemany(INSERT_WEEKLY_SUMMARY_SQL, summary_rows)
             
-            # Save weekly summary
-            if artist_scores:
-                top_artist = artist_scores[0]
-                cursor.execute('''
-                    INSERT OR REPLACE INTO weekly_summary 
-                    (chart_date, total_entries, top_artist, top_score, scraped_at)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    chart_date,
-                    len(chart_entries),
-                    top_artist['artist'],
-                    top_artist['total_score'],
-                    datetime.now().isoformat()
-                ))
+            if update_movement:
+                later_week = cursor.execute(
+                    'SELECT 1 FROM chart_entries WHERE chart_date > ? LIMIT 1', (chart_date,)
+                ).fetchone()
+                if later_week:
+                    self._rebuild_chart_movement_sqlite(cursor, chart_date)
+                else:
+                    self._save_week_movement_sqlite(cursor, chart_date, [(row[0], row[5]) for row in entry_rows])
+            else:
+                # Leave the week without movement rows so a later
+                # rebuild_chart_movement(missing_only=True) starts here
+                cursor.execute('DELETE FROM chart_movement WHERE chart_date = ?', (chart_date,))
             
             self.conn.commit()
             
-        except Exception as e:
+        except Exception:
             self.conn.rollback()
+            self._song_id_cache = {}
             raise
     
-    def _save_chart_data_bigquery(self, chart_entries: List[Dict], artist_scores: List[Dict], chart_date: str):
-        """Save chart data to BigQuery."""
-        try:
-            # Prepare chart entries data
-            chart_entries_rows = []
-            for entry in chart_entries:
-                chart_entries_rows.append({
-                    'rank': entry['rank'],
-                    'title': entry['title'],
-                    'artist': entry['artist'],
-                    'chart_date': chart_date,
-                    'scraped_at': entry['scraped_at']
-                })
+    @staticmethod
+    def _build_week_rows(chart_entries: List[Dict], artist_scores: List[Dict],
+                         chart_date: str, scraped_at: str) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        """
+        Build the parameter tuples for one week of chart data.
+        
+        Args:
+            chart_entries: List of chart entries
+            artist_scores: List of artist scores (highest score first)
+            chart_date: Date of the chart
+            scraped_at: Timestamp used for rows that don't carry their own
             
-            # Prepare artist scores data
-            artist_scores_rows = []
-            for score in artist_scores:
-                artist_scores_rows.append({
-                    'artist': score['artist'],
-                    'total_score': score['total_score'],
-                    'chart_date': chart_date,
-                    'songs_count': score['songs_count'],
-                    'chart_positions': json.dumps(score['chart_positions']),
-                    'scraped_at': datetime.now().isoformat()
-                })
+        Returns:
+            Tuple of (chart entry rows, artist score rows, weekly summary rows)
+        """
+        entry_rows = [
+            (entry['rank'], entry['title'], entry['artist'], chart_date,
+             entry.get('scraped_at', scraped_at))
+            for entry in chart_entries
+        ]
+        
+        score_rows = [
+            (score['artist'], score['total_score'], chart_date, score['songs_count'],
+             json.dumps(score['chart_positions']), scraped_at)
+            for score in artist_scores
+        ]
+        
+        summary_rows = []
+        if artist_scores:
+            top_artist = artist_scores[0]
+            summary_rows.append((
+                chart_date,
+                len(chart_entries),
+                top_artist['artist'],
+                top_artist['total_score'],
+                scraped_at
+            ))
+        
+        return entry_rows, score_rows, summary_rows
+    
+    def save_many_weeks(self, weeks: Iterable[Dict], batch_size: int = 5000) -> Dict:
+        """
+        Bulk-load many weeks of chart data, e.g. for a historical backfill.
+        
+        On SQLite all weeks are streamed through executemany() inside a single
+        transaction, with WAL journaling and synchronous=OFF for the duration
+        of the load. chart_movement is computed as weeks are loaded when they
+        arrive in date order after the stored history, and otherwise rebuilt
+        from the earliest loaded week. On BigQuery rows are upserted with one load job and MERGE per
+        table and batch.
+        
+        Args:
+            weeks: Iterable of week dicts with 'chart_date', 'chart_entries' and
+                'artist_scores' (or 'top_artists', as written by run_scraper.py)
+            batch_size: Number of rows buffered before each executemany() call
+                (SQLite) or load job (BigQuery; larger batches mean fewer jobs)
             
-            # Insert data
-            chart_entries_table = f"{self.db_path}.billboard.chart_entries"
-            artist_scores_table = f"{self.db_path}.billboard.artist_scores"
+        Returns:
+            Load statistics with weeks, rows, seconds and rows_per_sec
+        """
+        start = time.perf_counter()
+        
+        try:
+            if self.db_type == "sqlite":
+                week_count, row_count = self._save_many_weeks_sqlite(weeks, batch_size)
+            else:
+                week_count, row_count = self._save_many_weeks_bigquery(weeks, batch_size)
+        except Exception as e:
+            logger.error(f"Bulk load failed: {e}")
+            raise
+        
+        seconds = time.perf_counter() - start
+        stats = {
+            'weeks': week_count,
+            'rows': row_count,
+            'seconds': round(seconds, 3),
+            'rows_per_sec': round(row_count / seconds) if seconds > 0 else 0
+        }
+        logger.info(f"Bulk loaded {week_count} weeks ({row_count} rows) "
+                    f"in {stats['seconds']}s - {stats['rows_per_sec']} rows/sec")
+        return stats
+    
+    def _save_many_weeks_sqlite(self, weeks: Iterable[Dict], batch_size: int) -> Tuple[int, int]:
+        """Stream weeks into SQLite inside one transaction. Returns (weeks, rows)."""
+        cursor = self.conn.cursor()
+        scraped_at = datetime.now().isoformat()
+        
+        # Relax durability for the load; the previous synchronous level is
+        # restored afterwards (WAL mode is persistent and stays on)
+        cursor.execute('PRAGMA journal_mode=WAL')
+        previous_synchronous = cursor.execute('PRAGMA synchronous').fetchone()[0]
+        cursor.execute('PRAGMA synchronous=OFF')
+        
+        entry_rows, score_rows, summary_rows = [], [], []
+        week_count = row_count = 0
+        
+        # While weeks arrive in date order after everything stored (and no
+        # stored week is missing movement), movement is computed as each
+        # batch is flushed and commits with it. Otherwise it is rebuilt once
+        # at the end, from the earliest loaded or unmaterialized week.
+        last_date = cursor.execute('SELECT MAX(chart_date) FROM chart_entries').fetchone()[0]
+        first_date = self._first_week_without_movement_sqlite(cursor)
+        in_order = first_date is None
+        tracker = None
+        
+        def flush():
+            rows = self._with_song_ids(cursor, entry_rows)
+            cursor.executemany(INSERT_CHART_ENTRY_SQL, rows)
+            if in_order:
+                for chart_date, week in groupby(rows, key=itemgetter(3)):
+                    cursor.executemany(INSERT_CHART_MOVEMENT_SQL,
+                                       tracker.advance(chart_date, sorted((row[0], row[5]) for row in week)))
+            cursor.executemany(INSERT_ARTIST_SCORE_SQL, score_rows)
+            cursor.executemany(INSERT_WEEKLY_SUMMARY_SQL, summary_rows)
+            entry_rows.clear()
+            score_rows.clear()
+            summary_rows.clear()
+        
+        try:
+            for week in weeks:
+                artist_scores = week.get('artist_scores', week.get('top_artists', []))
+                week_entries, week_scores, week_summary = self._build_week_rows(
+                    week['chart_entries'], artist_scores, week['chart_date'], scraped_at
+                )
+                entry_rows.extend(week_entries)
+                score_rows.extend(week_scores)
+                summary_rows.extend(week_summary)
+                week_count += 1
+                row_count += len(week_entries) + len(week_scores) + len(week_summary)
+                chart_date = week['chart_date']
+                first_date = min(first_date or chart_date, chart_date)
+                
+                if in_order and last_date is not None and chart_date <= last_date:
+                    in_order = False
+                elif in_order and tracker is None:
+                    tracker = self._movement_tracker_before(cursor, chart_date)
+                last_date = max(last_date or chart_date, chart_date)
+                
+                if len(entry_rows) + len(score_rows) >= batch_size:
+                    flush()
             
-            # Use streaming inserts for real-time data
-            errors = self.client.insert_rows_json(chart_entries_table, chart_entries_rows)
-            if errors:
-                logger.error(f"Chart entries insert errors: {errors}")
+            flush()
+            if not in_order:
+                self._rebuild_chart_movement_sqlite(cursor, first_date)
+            self.conn.commit()
             
-            errors = self.client.insert_rows_json(artist_scores_table, artist_scores_rows)
-            if errors:
-                logger.error(f"Artist scores insert errors: {errors}")
+        except Exception:
+            self.conn.rollback()
+            self._song_id_cache = {}
+            raise
+        finally:
+            cursor.execute(f'PRAGMA synchronous={int(previous_synchronous)}')
+        
+        return week_count, row_count
+    
+    def _add_week_bigquery(self, chart_entries: List[Dict], artist_scores: List[Dict],
+                           chart_date: str, scraped_at: str) -> int:
+        """Buffer one week in the BigQuery writer. Returns the number of rows."""
+        entry_rows, score_rows, summary_rows = self._build_week_rows(
+            chart_entries, artist_scores, chart_date, scraped_at
+        )
+        self.writer.add('chart_entries', entry_rows)
+        self.writer.add('artist_scores', score_rows)
+        self.writer.add('weekly_summary', summary_rows)
+        return len(entry_rows) + len(score_rows) + len(summary_rows)
+    
+    def _save_chart_data_bigquery(self, chart_entries: List[Dict], artist_scores: List[Dict], chart_date: str):
+        """Upsert one week into BigQuery."""
+        try:
+            self._add_week_bigquery(chart_entries, artist_scores, chart_date, datetime.now().isoformat())
+            try:
+                self.writer.flush()
+            finally:
+                self._query_cache.clear()
                 
         except Exception as e:
             logger.error(f"Failed to save to BigQuery: {e}")
             raise
     
+    def _save_many_weeks_bigquery(self, weeks: Iterable[Dict], batch_size: int) -> Tuple[int, int]:
+        """Upsert weeks into BigQuery in batches of about batch_size rows. Returns (weeks, rows)."""
+        scraped_at = datetime.now().isoformat()
+        week_count = row_count = 0
+        
+        for week in weeks:
+            artist_scores = week.get('artist_scores', week.get('top_artists', []))
+            row_count += self._add_week_bigquery(week['chart_entries'], artist_scores, week['chart_date'], scraped_at)
+            week_count += 1
+            if self.writer.pending_rows >= batch_size:
+                self._query_cache.clear()
+                self.writer.flush()
+        
+        self._query_cache.clear()
+        self.writer.flush()
+        return week_count, row_count
+    
+    def _query_bigquery(self, query: str, params: Iterable[Tuple[str, str, object]] = ()) -> List:
+        """
+        Run a parameterized BigQuery query, serving repeats from a TTL cache.
+        
+        Args:
+            query: SQL text
+            params: (name, type, value) query parameters
+            
+        Returns:
+            Result rows
+        """
+        params = tuple(params)
+        key = (query, params)
+        now = time.monotonic()
+        cached = self._query_cache.get(key)
+        if cached and cached[0] > now:
+            self.query_stats['cache_hits'] += 1
+            return cached[1]
+        
+        job_config = bigquery.QueryJobConfig(query_parameters=[
+            bigquery.ScalarQueryParameter(name, param_type, value) for name, param_type, value in params
+        ])
+        job = self.client.query(query, job_config=job_config)
+        rows = list(job.result())
+        
+        bytes_processed = job.total_bytes_processed or 0
+        self.query_stats['queries'] += 1
+        self.query_stats['bytes_processed'] += bytes_processed
+        logger.info(f"BigQuery query processed {bytes_processed:,} bytes"
+                    f"{' (BigQuery cache hit)' if job.cache_hit else ''}: {' '.join(query.split())[:80]}")
+        
+        if len(self._query_cache) >= BIGQUERY_CACHE_SIZE:
+            self._query_cache = {k: v for k, v in self._query_cache.items() if v[0] > now}
+            if len(self._query_cache) >= BIGQUERY_CACHE_SIZE:
+                # Drop the oldest entry
+                del self._query_cache[next(iter(self._query_cache))]
+        self._query_cache[key] = (now + BIGQUERY_CACHE_TTL, rows)
+        return rows
+    
+    def _latest_chart_date_bigquery(self, table: str) -> Optional[str]:
+        """Latest chart_date written to a BigQuery table, from chart_metadata."""
+        rows = self._query_bigquery(f'''
+            SELECT latest_chart_date
+            FROM `{self.db_path}.billboard.{METADATA_TABLE}`
+            WHERE table_name = @table_name
+        ''', [('table_name', 'STRING', table)])
+        if not rows:
+            # Data loaded before chart_metadata existed: one full scan, then cached
+            rows = self._query_bigquery(
+                f'SELECT MAX(chart_date) AS latest_chart_date FROM `{self.db_path}.billboard.{table}`'
+            )
+        return str(rows[0].latest_chart_date) if rows and rows[0].latest_chart_date else None
+    
     def get_latest_chart_data(self, limit: int = 100) -> List[Dict]:
         """
         Get the latest chart data from database.
@@ -323,21 +887,20 @@ class BillboardDatabase:
         return [dict(row) for row in rows]
     
     def _get_latest_chart_data_bigquery(self, limit: int) -> List[Dict]:
-        """Get latest chart data from BigQuery."""
+        """Get latest chart data from BigQuery, reading only the latest week's partition."""
         try:
+            chart_date = self._latest_chart_date_bigquery('chart_entries')
+            if chart_date is None:
+                return []
+            
             query = f'''
                 SELECT rank, title, artist, chart_date, scraped_at
                 FROM `{self.db_path}.billboard.chart_entries`
-                WHERE chart_date = (
-                    SELECT MAX(chart_date) 
-                    FROM `{self.db_path}.billboard.chart_entries`
-                )
+                WHERE chart_date = @chart_date
                 ORDER BY rank
-                LIMIT {limit}
+                LIMIT @limit
             '''
-            
-            query_job = self.client.query(query)
-            results = query_job.result()
+            results = self._query_bigquery(query, [('chart_date', 'DATE', chart_date), ('limit', 'INT64', limit)])
             
             return [dict(row) for row in results]
             
@@ -393,19 +956,18 @@ class BillboardDatabase:
     def _get_top_artists_bigquery(self, limit: int) -> List[Dict]:
         """Get top artists from BigQuery."""
         try:
+            chart_date = self._latest_chart_date_bigquery('artist_scores')
+            if chart_date is None:
+                return []
+            
             query = f'''
                 SELECT artist, total_score, chart_date, songs_count, chart_positions
                 FROM `{self.db_path}.billboard.artist_scores`
-                WHERE chart_date = (
-                    SELECT MAX(chart_date) 
-                    FROM `{self.db_path}.billboard.artist_scores`
-                )
+                WHERE chart_date = @chart_date
                 ORDER BY total_score DESC
-                LIMIT {limit}
+                LIMIT @limit
             '''
-            
-            query_job = self.client.query(query)
-            results = query_job.result()
+            results = self._query_bigquery(query, [('chart_date', 'DATE', chart_date), ('limit', 'INT64', limit)])
             
             artists = []
             for i, row in enumerate(results):
@@ -424,6 +986,296 @@ class BillboardDatabase:
             logger.error(f"BigQuery query failed: {e}")
             return []
     
+    def get_song_history(self, title: str, artist: str) -> Optional[Dict]:
+        """
+        Get a song's full chart trajectory and run statistics.
+        
+        Args:
+            title: Song title (case- and whitespace-insensitive)
+            artist: Artist credit as charted (case- and whitespace-insensitive)
+            
+        Returns:
+            Dictionary with title, artist, trajectory (oldest week first) and
+            the statistics from summarize_trajectory(), or None if the song
+            never charted
+        """
+        try:
+            if self.db_type == "sqlite":
+                history = self._get_song_history_sqlite(title, artist)
+            else:
+                history = self._get_song_history_bigquery(title, artist)
+        except Exception as e:
+            logger.error(f"Failed to get song history: {e}")
+            return None
+        
+        if history is None:
+            return None
+        history.update(summarize_trajectory(history['trajectory']))
+        return history
+    
+    def _get_song_history_sqlite(self, title: str, artist: str) -> Optional[Dict]:
+        """Get a song's trajectory from SQLite via the songs table."""
+        cursor = self.conn.cursor()
+        
+        song = cursor.execute(
+            'SELECT id, title, artist FROM songs WHERE song_key = ?', (song_key(title, artist),)
+        ).fetchone()
+        if song is None:
+            return None
+        
+        cursor.execute('''
+            SELECT chart_date, rank
+            FROM chart_entries
+            WHERE song_id = ?
+            ORDER BY chart_date
+        ''', (song['id'],))
+        
+        return {
+            'title': song['title'],
+            'artist': song['artist'],
+            'trajectory': [dict(row) for row in cursor.fetchall()]
+        }
+    
+    def _get_song_history_bigquery(self, title: str, artist: str) -> Optional[Dict]:
+        """Get a song's trajectory from BigQuery."""
+        query = f'''
+            SELECT chart_date, rank, title, artist
+            FROM `{self.db_path}.billboard.chart_entries`
+            WHERE REGEXP_REPLACE(LOWER(TRIM(title)), r'\\s+', ' ') = REGEXP_REPLACE(LOWER(TRIM(@title)), r'\\s+', ' ')
+              AND REGEXP_REPLACE(LOWER(TRIM(artist)), r'\\s+', ' ') = REGEXP_REPLACE(LOWER(TRIM(@artist)), r'\\s+', ' ')
+            ORDER BY chart_date
+        '''
+        rows = self._query_bigquery(query, [('title', 'STRING', title), ('artist', 'STRING', artist)])
+        if not rows:
+            return None
+        
+        return {
+            'title': rows[0].title,
+            'artist': rows[0].artist,
+            'trajectory': [{'chart_date': str(row.chart_date), 'rank': row.rank} for row in rows]
+        }
+    
+    def get_artist_history(self, artist: str, start_date: Optional[str] = None,
+                           end_date: Optional[str] = None) -> Dict:
+        """
+        Get an artist's chart totals over a date range.
+        
+        Args:
+            artist: Artist credit as charted
+            start_date: First chart date to include (YYYY-MM-DD, default: all)
+            end_date: Last chart date to include (YYYY-MM-DD, default: all)
+            
+        Returns:
+            Dictionary with chart_weeks, total_entries, songs_count, number_ones,
+            top_10_entries, best_rank, first/last chart dates and per-song
+            weeks/peak/debut, best peak first
+        """
+        start_date = start_date or '0001-01-01'
+        end_date = end_date or '9999-12-31'
+        try:
+            if self.db_type == "sqlite":
+                rows = self._get_artist_entries_sqlite(artist, start_date, end_date)
+            else:
+                rows = self._get_artist_entries_bigquery(artist, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Failed to get artist history: {e}")
+            rows = []
+        
+        return self._summarize_artist_entries(artist, rows)
+    
+    def _get_artist_entries_sqlite(self, artist: str, start_date: str, end_date: str) -> List[Dict]:
+        """Get an artist's entries (oldest first) from SQLite."""
+        cursor = self.conn.cursor()
+        
+        cursor.execute('''
+            SELECT e.chart_date, e.rank, e.song_id, s.title
+            FROM chart_entries e
+            JOIN songs s ON s.id = e.song_id
+            WHERE e.artist = ? AND e.chart_date BETWEEN ? AND ?
+            ORDER BY e.chart_date, e.rank
+        ''', (artist, start_date, end_date))
+        
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def _get_artist_entries_bigquery(self, artist: str, start_date: str, end_date: str) -> List[Dict]:
+        """Get an artist's entries (oldest first) from BigQuery."""
+        query = f'''
+            SELECT chart_date, rank, title
+            FROM `{self.db_path}.billboard.chart_entries`
+            WHERE artist = @artist AND chart_date BETWEEN @start_date AND @end_date
+            ORDER BY chart_date, rank
+        '''
+        rows = self._query_bigquery(query, [
+            ('artist', 'STRING', artist),
+            ('start_date', 'DATE', start_date),
+            ('end_date', 'DATE', end_date)
+        ])
+        return [
+            {'chart_date': str(row.chart_date), 'rank': row.rank,
+             'song_id': song_key(row.title, artist), 'title': row.title}
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _summarize_artist_entries(artist: str, rows: List[Dict]) -> Dict:
+        """Aggregate an artist's chart entries (oldest first) into totals and per-song stats."""
+        songs = {}
+        for row in rows:
+            song = songs.setdefault(row['song_id'], {
+                'title': row['title'],
+                'weeks_on_chart': 0,
+                'peak_position': row['rank'],
+                'debut_date': row['chart_date']
+            })
+            song['weeks_on_chart'] += 1
+            song['peak_position'] = min(song['peak_position'], row['rank'])
+        
+        return {
+            'artist': artist,
+            'chart_weeks': len({row['chart_date'] for row in rows}),
+            'total_entries': len(rows),
+            'songs_count': len(songs),
+            'number_ones': sum(1 for row in rows if row['rank'] == 1),
+            'top_10_entries': sum(1 for row in rows if row['rank'] <= 10),
+            'best_rank': min((row['rank'] for row in rows), default=None),
+            'first_chart_date': rows[0]['chart_date'] if rows else None,
+            'last_chart_date': rows[-1]['chart_date'] if rows else None,
+            'songs': sorted(songs.values(), key=lambda song: (song['peak_position'], -song['weeks_on_chart']))
+        }
+    
+    def get_chart_movement(self, chart_date: Optional[str] = None, status: Optional[str] = None,
+                           limit: int = 100) -> List[Dict]:
+        """
+        Get a week's chart with last week's rank, change, peak and weeks on chart.
+        
+        Args:
+            chart_date: Chart date (default: latest)
+            status: Only entries with this status: 'new', 're-entry', 'up',
+                'down' or 'steady'
+            limit: Maximum number of entries to return
+            
+        Returns:
+            List of entries ordered by rank
+        """
+        query = '''
+            SELECT m.chart_date, m.rank, s.title, s.artist, m.previous_rank, m.rank_change,
+                   m.peak_to_date, m.weeks_on_chart, m.status
+            FROM chart_movement m
+            JOIN songs s ON s.id = m.song_id
+            WHERE m.chart_date = ?
+        '''
+        params = [chart_date]
+        if status is not None:
+            query += ' AND m.status = ?'
+            params.append(status)
+        query += ' ORDER BY m.rank LIMIT ?'
+        params.append(limit)
+        return self._query_chart_movement(query, params)
+    
+    def get_biggest_climbers(self, chart_date: Optional[str] = None, limit: int = 10) -> List[Dict]:
+        """
+        Get the entries that rose the most since the previous week.
+        
+        Args:
+            chart_date: Chart date (default: latest)
+            limit: Maximum number of entries to return
+            
+        Returns:
+            List of entries, biggest rank_change first
+        """
+        return self._query_chart_movement('''
+            SELECT m.chart_date, m.rank, s.title, s.artist, m.previous_rank, m.rank_change,
+                   m.peak_to_date, m.weeks_on_chart, m.status
+            FROM chart_movement m
+            JOIN songs s ON s.id = m.song_id
+            WHERE m.chart_date = ? AND m.rank_change > 0
+            ORDER BY m.rank_change DESC, m.rank
+            LIMIT ?
+        ''', [chart_date, limit])
+    
+    def _query_chart_movement(self, query: str, params: List) -> List[Dict]:
+        """Run a chart_movement query whose first parameter is the chart date (None for latest)."""
+        if self.db_type != "sqlite":
+            logger.warning("Chart movement is only materialized for SQLite")
+            return []
+        
+        try:
+            cursor = self.conn.cursor()
+            if params[0] is None:
+                params[0] = cursor.execute('SELECT MAX(chart_date) FROM chart_movement').fetchone()[0]
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to get chart movement: {e}")
+            return []
+    
+    def load_artist_aliases(self) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Load the artist name canonicalization table (SQLite only).
+        
+        Returns:
+            Tuple of (alias key -> canonical name, group names)
+        """
+        if self.db_type != "sqlite":
+            raise ValueError("Artist aliases are only stored in SQLite")
+        rows = self.conn.execute('SELECT alias_key, canonical, is_group FROM artist_aliases').fetchall()
+        return ({row['alias_key']: row['canonical'] for row in rows},
+                [row['canonical'] for row in rows if row['is_group']])
+    
+    def save_artist_aliases(self, aliases: Dict[str, str], group_names: Iterable[str] = ()):
+        """
+        Store artist aliases and group names (SQLite only).
+        
+        Existing aliases are kept, so curated canonical names are never
+        overwritten by spellings learned later.
+        
+        Args:
+            aliases: Alias key -> canonical name
+            group_names: Names that must not be split into several artists
+        """
+        if self.db_type != "sqlite":
+            raise ValueError("Artist aliases are only stored in SQLite")
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO artist_aliases (alias_key, canonical) VALUES (?, ?)',
+                aliases.items()
+            )
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO artist_aliases (alias_key, canonical, is_group) VALUES (?, ?, 1)',
+                [(name_key(name), name) for name in group_names]
+            )
+    
+    def iter_chart_history(self, after_date: Optional[str] = None,
+                           chunk_size: int = 10000) -> Iterable[List[Dict]]:
+        """
+        Stream chart entries with their movement, oldest week first (SQLite only).
+        
+        Args:
+            after_date: Only weeks after this chart date (default: all)
+            chunk_size: Rows fetched per chunk
+            
+        Yields:
+            Lists of up to chunk_size row dicts ordered by chart_date, rank
+        """
+        if self.db_type != "sqlite":
+            raise ValueError("iter_chart_history is only available for SQLite")
+        
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT e.chart_date, e.rank, e.title, e.artist, e.song_id,
+                   m.previous_rank, m.rank_change, m.peak_to_date, m.weeks_on_chart, m.status
+            FROM chart_entries e
+            LEFT JOIN chart_movement m ON m.chart_date = e.chart_date AND m.rank = e.rank
+            WHERE e.chart_date > ?
+            ORDER BY e.chart_date, e.rank
+        ''', (after_date or '',))
+        
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [dict(row) for row in rows]
+    
     def close(self):
         """Close database connections."""
         if self.db_type == "sqlite" and hasattr(self, 'conn'):
@@ -431,8 +1283,28 @@ class BillboardDatabase:
         elif self.db_type == "bigquery" and hasattr(self, 'client'):
             self.client.close()
 
+def rebuild_movement(db_path: str) -> int:
+    """Recompute chart_movement for an existing SQLite database."""
+    print(f"🔁 Rebuilding chart movement in {db_path}")
+    db = BillboardDatabase("sqlite", db_path)
+    try:
+        stats = db.rebuild_chart_movement()
+    finally:
+        db.close()
+    print(f"✅ {stats['rows']:,} movement rows in {stats['seconds']}s")
+    return 0
+
 def main():
-    """Test database operations."""
+    """Test database operations, or rebuild chart movement with --rebuild-movement."""
+    parser = argparse.ArgumentParser(description="Billboard database tools")
+    parser.add_argument('--rebuild-movement', action='store_true',
+                        help="Recompute the chart_movement table from chart_entries and exit")
+    parser.add_argument('--db', default='billboard.db', help="SQLite database path for --rebuild-movement")
+    args = parser.parse_args()
+    
+    if args.rebuild_movement:
+        return rebuild_movement(args.db)
+    
     print("🗄️ Billboard Database Test")
     print("=" * 30)
     
@@ -458,6 +1330,29 @@ def main():
         top_artists = db.get_top_artists()
         print(f"✅ Retrieved {len(top_artists)} top artists")
         
+        movement = db.get_chart_movement('2025-01-01')
+        print(f"✅ Retrieved movement for {len(movement)} entries ({movement[0]['status']})")
+
+        # Bulk load ten years of synthetic weekly charts
+        start_date = datetime(2000, 1, 1)
+        synthetic_weeks = (
+            {
+                'chart_date': (start_date + timedelta(weeks=week)).strftime('%Y-%m-%d'),
+                'chart_entries': [
+                    {'rank': rank, 'title': f'Song {week}-{rank}', 'artist': f'Artist {rank % 40}'}
+                    for rank in range(1, 101)
+                ],
+                'artist_scores': [
+                    {'artist': f'Artist {i}', 'total_score': 300 - i, 'chart_positions': [i], 'songs_count': 1}
+                    for i in range(40)
+                ]
+            }
+            for week in range(520)
+        )
+        stats = db.save_many_weeks(synthetic_weeks)
+        print(f"✅ Bulk loaded {stats['weeks']} weeks ({stats['rows']} rows) "
+              f"at {stats['rows_per_sec']:,} rows/sec")
+
         db.close()
         print("✅ Database closed")
         
@@ -479,4 +1374,4 @@ def main():
         print("\n🔍 BigQuery not available")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -8,15 +8,21 @@ Date: 2025
 """
 
 import requests
-from bs4 import BeautifulSoup
 import time
 import json
 import logging
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import random
+import hashlib
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple, Union
 import re
-from urllib.parse import unquote
+
+from artist_credits import ArtistCreditParser
+from chart_parsers import ARTIST_STRATEGIES, ROW_STRATEGIES, TITLE_SELECTORS, create_parser_backend
+from page_cache import PageCache
 
 # Configure logging
 logging.basicConfig(
@@ -25,11 +31,42 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Chart-related class names make up the layout fingerprint
+CLASS_ATTR_PATTERN = re.compile(rb'class="([^"]*chart[^"]*)"')
+DIGITS_PATTERN = re.compile(rb'\d+')
+
+# Learned layout profiles and the raw page cache live next to the scraper
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'layout_profiles.json')
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'page_cache')
+
 class BillboardScraper:
     """Billboard Hot 100 chart scraper with robust error handling."""
     
-    def __init__(self):
-        self.base_url = "https://www.billboard.com/charts/hot-100/"
+    def __init__(self, base_url: Optional[str] = None, parser: Optional[str] = None,
+                 profile_path: Optional[str] = DEFAULT_PROFILE_PATH,
+                 page_cache: Union[PageCache, str, None] = DEFAULT_CACHE_DIR):
+        """
+        Initialize the scraper.
+        
+        Args:
+            base_url: Hot 100 chart URL; per-week charts live at <base_url>YYYY-MM-DD/.
+                Override to point the scraper at a mirror or local fixture server.
+            parser: HTML parser backend (a chart_parsers.PARSER_BACKENDS name,
+                'lxml' or 'html.parser'). Defaults to the fastest available one.
+            profile_path: JSON file of learned layout profiles, or None to
+                keep them in memory only
+            page_cache: PageCache (or its directory) for raw responses, or None
+                to always download and parse pages in full
+        """
+        self.backend = create_parser_backend(parser)
+        self.parser = self.backend.name
+        self.base_url = base_url or "https://www.billboard.com/charts/hot-100/"
+        self.profile_path = profile_path
+        self.layout_profiles = self._load_layout_profiles()
+        self.layout_stats = {'hits': 0, 'misses': 0, 'learned': 0}
+        self.page_cache = PageCache(page_cache) if isinstance(page_cache, str) else page_cache
+        self.page_unchanged = False
+        self.pending_page = None
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -44,33 +81,73 @@ class BillboardScraper:
         """Get the current chart date in YYYY-MM-DD format."""
         return datetime.now().strftime('%Y-%m-%d')
     
+    def get_chart_url(self, chart_date: Optional[str] = None) -> str:
+        """
+        Build the chart URL for a given week.
+        
+        Args:
+            chart_date: Chart date in YYYY-MM-DD format, or None for the current week
+            
+        Returns:
+            URL of the chart page
+        """
+        if not chart_date:
+            return self.base_url
+        return f"{self.base_url.rstrip('/')}/{chart_date}/"
+    
     def scrape_hot_100(self, max_retries: int = 3, delay: float = 2.0) -> List[Dict]:
         """
         Scrape the Billboard Hot 100 chart.
         
         Args:
             max_retries: Maximum number of retry attempts
-            delay: Delay between retries in seconds
+            delay: Base delay between retries in seconds (doubles on each retry)
             
         Returns:
             List of chart entries with rank, title, artist, and date
         """
+        return self.scrape_chart(self.base_url, self.get_chart_date(), max_retries, delay)
+    
+    def scrape_chart(self, url: str, chart_date: str, max_retries: int = 3, delay: float = 2.0) -> List[Dict]:
+        """
+        Scrape a single chart page, retrying with exponential backoff.
+        
+        The page is only recorded as parsed in the page cache by
+        commit_page(), once the caller has saved the entries; until then
+        the next scrape of the same bytes parses them again.
+        
+        Args:
+            url: Chart page URL
+            chart_date: Chart date to stamp on the entries
+            max_retries: Maximum number of retry attempts
+            delay: Base delay between retries in seconds (doubles on each retry)
+            
+        Returns:
+            List of chart entries with rank, title, artist, and date
+        """
+        self.page_unchanged = False
+        self.pending_page = None
+        
         for attempt in range(max_retries):
             try:
-                # Attempting to scrape Billboard Hot 100
+                # Back off before retries only; the first attempt goes straight out
+                if attempt:
+                    time.sleep(delay * (2 ** (attempt - 1)) + random.uniform(0, delay / 2))
                 
-                # Make request with rate limiting
-                time.sleep(delay)
-                response = self.session.get(self.base_url, timeout=30)
-                response.raise_for_status()
+                content, sha256 = self.fetch_page(url)
                 
-                # Parse HTML
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # Same bytes as the last page we parsed: skip parsing entirely
+                cached_entries = self.page_cache.get_parsed(url, sha256) if self.page_cache else None
+                if cached_entries:
+                    self.page_unchanged = True
+                    print(f"♻️  Chart page unchanged since last scrape ({len(cached_entries)} entries)")
+                    return cached_entries
                 
-                # Extract chart data
-                chart_entries = self._parse_chart_html(soup)
+                chart_entries = self.parse_chart_page(content, chart_date)
                 
                 if chart_entries:
+                    if self.page_cache:
+                        self.pending_page = (url, sha256, chart_entries)
                     print(f"✅ Successfully scraped {len(chart_entries)} chart entries")
                     return chart_entries
                 else:
@@ -87,68 +164,187 @@ class BillboardScraper:
         
         return []
     
-    def _parse_chart_html(self, soup) -> List[Dict]:
+    def commit_page(self, page: Optional[Tuple[str, str, List[Dict]]] = None):
         """
-        Parse the HTML to extract chart entries.
+        Record a scraped page as parsed, after its entries were saved.
+        
+        Later scrapes that fetch the same bytes return the recorded entries
+        with page_unchanged set instead of parsing again. Does nothing if the
+        scrape was unchanged, failed or ran without a page cache.
+        
+        Args:
+            page: pending_page kept from an earlier scrape, for callers that
+                save on another thread; defaults to the last scrape's
+        """
+        if page is None:
+            page, self.pending_page = self.pending_page, None
+        if page is not None and self.page_cache:
+            self.page_cache.mark_parsed(*page)
+    
+    def fetch_page(self, url: str) -> Tuple[bytes, str]:
+        """
+        Download a page, revalidating against the page cache when possible.
         
         Args:
-            soup: BeautifulSoup object of the page
+            url: Page URL
             
         Returns:
-            List of chart entry dictionaries
-        """
-        try:
-            # Try multiple selectors for Billboard's current structure
-            chart_rows = []
+            Tuple of (page body, SHA-256 of the body)
             
-            # Method 1: Current Billboard structure
-            chart_rows = soup.find_all('div', class_='o-chart-results-list-row-container')
+        Raises:
+            requests.RequestException: On network errors and non-2xx responses
+        """
+        if not self.page_cache:
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            return response.content, hashlib.sha256(response.content).hexdigest()
+        
+        response = self.session.get(url, headers=self.page_cache.conditional_headers(url), timeout=30)
+        if response.status_code == 304:
+            body = self.page_cache.get(url)
+            if body is not None:
+                self.page_cache.touch(url)
+                return body, self.page_cache.get_sha256(url)
+            # Cached body went missing underneath us; fetch it in full
+            response = self.session.get(url, timeout=30)
+        
+        response.raise_for_status()
+        sha256 = self.page_cache.store(
+            url, response.content,
+            response.headers.get('ETag'), response.headers.get('Last-Modified')
+        )
+        return response.content, sha256
+    
+    def parse_cached_page(self, chart_date: Optional[str] = None) -> List[Dict]:
+        """
+        Re-parse a previously downloaded chart page without network access.
+        
+        Args:
+            chart_date: Chart date in YYYY-MM-DD format, or None for the current week
             
-            # Method 2: Alternative structure
-            if not chart_rows:
-                chart_rows = soup.find_all('div', class_='chart-list-item')
+        Returns:
+            List of chart entries, or an empty list if the page isn't cached
+        """
+        content = self.page_cache.get(self.get_chart_url(chart_date)) if self.page_cache else None
+        if content is None:
+            return []
+        return self.parse_chart_page(content, chart_date)
+    
+    def parse_chart_page(self, content: bytes, chart_date: Optional[str] = None) -> List[Dict]:
+        """
+        Parse a downloaded chart page into chart entries.
+        
+        Args:
+            content: Raw HTML of the chart page
+            chart_date: Chart date to stamp on the entries (defaults to today)
             
-            # Method 3: Look for chart-related classes
-            if not chart_rows:
-                chart_rows = soup.find_all('div', class_=lambda x: x and 'chart' in x.lower())
+        Returns:
+            List of chart entry dictionaries
+        """
+        document = self.backend.parse(content)
+        return self._parse_chart_html(document, chart_date, self._layout_fingerprint(content))
+    
+    @staticmethod
+    def _layout_fingerprint(content) -> str:
+        """
+        Fingerprint the page structure from its chart-related class names.
+        
+        Args:
+            content: Raw HTML of the chart page
             
-            # Method 4: Look for list items
-            if not chart_rows:
-                chart_rows = soup.find_all('li', class_=lambda x: x and 'chart' in x.lower())
+        Returns:
+            Short hex digest that changes when Billboard changes its chart markup
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        tokens = set()
+        for class_attr in CLASS_ATTR_PATTERN.findall(content):
+            tokens.update(DIGITS_PATTERN.sub(b'', token) for token in class_attr.split() if b'chart' in token)
+        return hashlib.sha1(b'|'.join(sorted(tokens))).hexdigest()[:16]
+    
+    def _load_layout_profiles(self) -> Dict[str, Dict]:
+        """Load learned layout profiles from disk."""
+        if not self.profile_path or not os.path.exists(self.profile_path):
+            return {}
+        try:
+            with open(self.profile_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable layout profiles {self.profile_path}: {e}")
+            return {}
+    
+    def _save_layout_profiles(self):
+        """Write layout profiles via a temp file so concurrent scrapers never see a partial file."""
+        if not self.profile_path:
+            return
+        tmp_path = f"{self.profile_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.layout_profiles, f, indent=2)
+            os.replace(tmp_path, self.profile_path)
+        except OSError as e:
+            logger.warning(f"Could not save layout profiles: {e}")
+    
+    def get_layout_stats(self) -> Dict[str, int]:
+        """
+        Get layout profile counters.
+        
+        Returns:
+            Dictionary with hits (fast path worked), misses (known layout but the
+            fast path came up short) and learned (new profiles recorded)
+        """
+        return dict(self.layout_stats)
+    
+    def _parse_chart_html(self, document, chart_date: Optional[str] = None,
+                          fingerprint: Optional[str] = None) -> List[Dict]:
+        """
+        Parse the HTML to extract chart entries.
+        
+        If a layout profile is known for the page fingerprint, only its row,
+        title and artist strategies are tried. The full cascade runs when there
+        is no profile or the fast path finds fewer than 100 entries, and the
+        strategies that worked are learned for next time.
+        
+        Args:
+            document: Page parsed by the scraper's parser backend
+            chart_date: Chart date to stamp on the entries (defaults to today)
+            fingerprint: Layout fingerprint of the page, if known
             
-            # Method 5: Look for data-rank elements
-            if not chart_rows:
-                chart_rows = soup.find_all(['div', 'li'], attrs={'data-rank': True})
+        Returns:
+            List of chart entry dictionaries
+        """
+        try:
+            chart_date = chart_date or self.get_chart_date()
+            
+            # Fast path: the strategies that worked last time for this layout
+            profile = self.layout_profiles.get(fingerprint) if fingerprint else None
+            if profile:
+                chart_rows = self.backend.rows(document, profile['rows'])
+                chart_entries = self._extract_chart_rows(chart_rows, chart_date, profile, log_failures=False)
+                if len(chart_entries) >= 100:
+                    self.layout_stats['hits'] += 1
+                    return chart_entries
+                
+                self.layout_stats['misses'] += 1
+                logger.warning(f"Layout profile {fingerprint} found only {len(chart_entries)} entries, "
+                               f"running full selector cascade (Billboard markup may have changed)")
             
-            # Method 6: Look for elements by rank numbers
-            if not chart_rows:
-                rank_elements = soup.find_all(text=lambda text: text and text.strip().isdigit() and 1 <= int(text.strip()) <= 100)
-                if rank_elements:
-                    chart_rows = []
-                    for rank_elem in rank_elements[:100]:
-                        parent = rank_elem.parent
-                        if parent:
-                            chart_rows.append(parent)
+            # Try multiple row strategies for Billboard's current structure
+            chart_rows = []
+            row_strategy = None
+            for name in ROW_STRATEGIES:
+                chart_rows = self.backend.rows(document, name)
+                if chart_rows:
+                    row_strategy = name
+                    break
             
             if not chart_rows:
                 logger.error("No chart rows found with any method")
                 return []
             
-            # Total chart rows found
-            chart_entries = []
-            
-            # Process the rows we found
-            for index, row in enumerate(chart_rows):
-                if index >= 100:  # Limit to top 100
-                    break
-                    
-                try:
-                    entry = self._extract_chart_entry(row, index + 1, self.get_chart_date())
-                    if entry:
-                        chart_entries.append(entry)
-                except Exception as e:
-                    logger.warning(f"Error parsing row {index + 1}: {e}")
-                    continue
+            # Process the rows we found, tallying which strategies worked
+            usage = Counter()
+            chart_entries = self._extract_chart_rows(chart_rows, chart_date, usage=usage)
             
             # Validate we got enough data
             if len(chart_entries) < 50:
@@ -161,110 +357,120 @@ class BillboardScraper:
                 logger.warning(f"❌ MISSING RANKS: {missing_ranks}")
                 logger.warning(f"📊 Found {len(chart_entries)}/100 entries. Missing {len(missing_ranks)} ranks.")
             
+            # Learn the layout for next time; a short page could never pass the fast path
+            if fingerprint and len(chart_entries) >= 100:
+                self._learn_layout(fingerprint, row_strategy, usage)
+            
             return chart_entries
             
         except Exception as e:
             logger.error(f"Error parsing chart HTML: {e}")
             return []
     
-    def _extract_chart_entry(self, row, rank: int, chart_date: str) -> Optional[Dict]:
+    def _learn_layout(self, fingerprint: str, row_strategy: str, usage: Counter):
+        """Record the most successful strategies for a page layout."""
+        titles = [(count, key[1]) for key, count in usage.items() if key[0] == 'title']
+        artists = [(count, key[1]) for key, count in usage.items() if key[0] == 'artist']
+        if not titles or not artists:
+            return
+        
+        profile = {
+            'rows': row_strategy,
+            'title': max(titles)[1],
+            'artist': max(artists)[1]
+        }
+        known = self.layout_profiles.get(fingerprint)
+        if known and all(known.get(k) == v for k, v in profile.items()):
+            return
+        
+        profile['learned_at'] = datetime.now().isoformat()
+        self.layout_profiles[fingerprint] = profile
+        self.layout_stats['learned'] += 1
+        self._save_layout_profiles()
+    
+    def _extract_chart_rows(self, chart_rows, chart_date: str, profile: Optional[Dict] = None,
+                            usage: Optional[Counter] = None, log_failures: bool = True) -> List[Dict]:
+        """Extract entries from up to 100 chart rows."""
+        chart_entries = []
+        
+        for index, row in enumerate(chart_rows):
+            if index >= 100:  # Limit to top 100
+                break
+                
+            try:
+                entry = self._extract_chart_entry(row, index + 1, chart_date, profile, usage, log_failures)
+                if entry:
+                    chart_entries.append(entry)
+            except Exception as e:
+                if log_failures:
+                    logger.warning(f"Error parsing row {index + 1}: {e}")
+                continue
+        
+        return chart_entries
+    
+    def _extract_chart_entry(self, row, rank: int, chart_date: str, profile: Optional[Dict] = None,
+                             usage: Optional[Counter] = None, log_failures: bool = True) -> Optional[Dict]:
         """
         Extract a single chart entry from a row.
         
         Args:
-            row: BeautifulSoup element for the chart row
+            row: Chart row element from the parser backend
             rank: Chart position (1-100)
             chart_date: Date of the chart
+            profile: Layout profile restricting the title/artist strategies tried
+            usage: Counter recording which title/artist strategies succeeded
+            log_failures: Whether to log rows that get filtered out
             
         Returns:
             Dictionary with chart entry data or None if invalid
         """
         try:
-            # Extract rank - try multiple methods
-            actual_rank = rank
-            rank_element = row.find('li', class_='o-chart-results-list__item')
-            if rank_element:
-                rank_text = rank_element.get_text(strip=True)
-                if rank_text.isdigit():
-                    actual_rank = int(rank_text)
-            
-            # Also look for rank in other common locations
-            for rank_selector in ['.rank', '.position', '.chart-rank', '[data-rank]']:
-                rank_elem = row.select_one(rank_selector)
-                if rank_elem:
-                    rank_text = rank_elem.get_text(strip=True)
-                    if rank_text.isdigit() and 1 <= int(rank_text) <= 100:
-                        actual_rank = int(rank_text)
-                        break
+            # Extract rank - the printed position, else the row's position
+            actual_rank = self.backend.rank(row)
+            if actual_rank is None:
+                actual_rank = rank
             
             # Extract song title - try multiple selectors
             title = ""
-            title_selectors = [
-                'h3.c-title', 'h3', 'h4', '.title', '.song-title', 
-                '.chart-title', '.track-title', '[class*="title"]'
-            ]
+            title_strategy = None
+            title_selectors = [profile['title']] if profile else TITLE_SELECTORS
             
             for selector in title_selectors:
-                title_element = row.select_one(selector)
-                if title_element:
-                    title = title_element.get_text(strip=True)
-                    if title and len(title) > 1:
-                        break
+                title = self.backend.title(row, selector)
+                if title and len(title) > 1:
+                    title_strategy = selector
+                    break
             
-            # Extract artist name - try multiple selectors
+            # Extract artist name - social media share URLs first (most reliable
+            # for full artist info), then labels and links
             artist = ""
+            artist_strategy = None
+            artist_strategies = [profile['artist']] if profile else list(ARTIST_STRATEGIES)
             
-            # Method 1: ALWAYS try social media share URLs FIRST (most reliable for full artist info)
-            artist = self._extract_artist_from_share_urls(row)
-            
-            # Clean up extra Billboard text from artist field
-            if artist:
-                artist = artist.replace(" on this week's Billboard Hot 100™!", "")
-                artist = artist.replace(" on this week's Billboard Hot 100!", "")
-                artist = artist.replace(" on this week's Billboard Hot 100", "")
-                artist = artist.replace(" on this week's Billboard Hot 100™", "")
-            
-            # Method 2: If social media extraction failed, try regular selectors
-            if not artist:
-                artist_element = row.find('span', class_='c-label')
-                if artist_element:
-                    artist = artist_element.get_text(strip=True)
-            
-            # Method 3: Look for artist in links
-            if not artist:
-                artist_links = row.find_all('a', href=lambda href: href and '/artist/' in href)
-                for link in artist_links:
-                    text = link.get_text(strip=True)
-                    if text and len(text) > 2:
-                        artist = text
-                        break
-            
-            # Method 4: If still no artist, try looking for any link text that might be an artist
-            if not artist:
-                all_links = row.find_all('a')
-                for link in all_links:
-                    text = link.get_text(strip=True)
-                    if (text and 
-                        len(text) > 2 and 
-                        not re.match(r'^\d{2}/\d{2}/\d{2}$', text) and  # Not date format
-                        not re.match(r'^\d+$', text) and  # Not just numbers
-                        not re.match(r'^(expand|menu|search|login|share|chart)$', text.lower())):  # Not navigation
-                        artist = text
-                        break
+            for name in artist_strategies:
+                artist = self.backend.artist(row, name)
+                if artist:
+                    artist_strategy = name
+                    break
             
             # Extracted entry data
             
             # Validate entry
             if not title or not artist:
-                logger.warning(f"❌ FILTERED OUT Rank {actual_rank}: title='{title}', artist='{artist}' - Missing title or artist")
+                if log_failures:
+                    logger.warning(f"❌ FILTERED OUT Rank {actual_rank}: title='{title}', artist='{artist}' - Missing title or artist")
                 return None
             
             # Additional validation
             if len(title) < 2 or len(artist) < 2:
-                logger.warning(f"❌ FILTERED OUT Rank {actual_rank}: title='{title}', artist='{artist}' - Text too short after cleaning")
+                if log_failures:
+                    logger.warning(f"❌ FILTERED OUT Rank {actual_rank}: title='{title}', artist='{artist}' - Text too short after cleaning")
                 return None
             
             # Successfully extracted entry
+            if usage is not None:
+                usage[('title', title_strategy)] += 1
+                usage[('artist', artist_strategy)] += 1
             
             return {
                 'rank': actual_rank,
@@ -275,69 +481,10 @@ class BillboardScraper:
             }
             
         except Exception as e:
-            logger.warning(f"❌ ERROR extracting Rank {rank}: {e}")
+            if log_failures:
+                logger.warning(f"❌ ERROR extracting Rank {rank}: {e}")
             return None
     
-    def _extract_artist_from_share_urls(self, row) -> str:
-        """
-        Extract artist information from social media share URLs.
-        
-        Args:
-            row: BeautifulSoup element for the chart row
-            
-        Returns:
-            Artist string extracted from social media URLs
-        """
-        try:
-            # Look for Facebook and Twitter share links
-            share_links = row.find_all('a', href=lambda href: href and ('facebook.com' in href or 'twitter.com' in href))
-            
-            for link in share_links:
-                href = link.get('href', '')
-                
-                # Try to extract artist from Facebook share URL
-                if 'facebook.com' in href:
-                    try:
-                        # Facebook share URLs often have quote parameter with full artist info
-                        if 'quote=' in href:
-                            quote_match = re.search(r'quote=([^&]+)', href)
-                            if quote_match:
-                                quote_text = unquote(quote_match.group(1))
-                                # Look for artist information in the quote
-                                if ' by ' in quote_text:
-                                    # Format: "Song Title by Artist Featuring Other Artist"
-                                    parts = quote_text.split(' by ', 1)
-                                    if len(parts) == 2:
-                                        full_artist_info = parts[1].strip()
-                                        return full_artist_info
-                    except Exception as e:
-                        # Failed to parse Facebook URL
-                        pass
-                
-                # Try to extract artist from Twitter share URL
-                if 'twitter.com' in href:
-                    try:
-                        # Twitter share URLs often have text parameter with full artist info
-                        if 'text=' in href:
-                            text_match = re.search(r'text=([^&]+)', href)
-                            if text_match:
-                                text_content = unquote(text_match.group(1))
-                                # Look for artist information in the text
-                                if ' by ' in text_content:
-                                    parts = text_content.split(' by ', 1)
-                                    if len(parts) == 2:
-                                        full_artist_info = parts[1].strip()
-                                        return full_artist_info
-                    except Exception as e:
-                        # Failed to parse Twitter URL
-                        pass
-            
-            return "" # Return empty string if no artist found
-            
-        except Exception as e:
-            # Error extracting artist from share URLs
-            return ""
-    
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text content."""
         if not text:
@@ -352,12 +499,16 @@ class BillboardScraper:
         
         return text
     
-    def calculate_artist_scores(self, chart_entries: List[Dict]) -> Dict[str, int]:
+    def calculate_artist_scores(self, chart_entries: List[Dict],
+                                credit_parser: Optional[ArtistCreditParser] = None) -> Dict[str, float]:
         """
         Calculate point totals for each artist based on chart performance.
         
         Args:
             chart_entries: List of chart entries from scraping
+            credit_parser: Split collaborations and share each entry's points
+                between its credited artists (default: score the raw
+                artist string)
             
         Returns:
             Dictionary mapping artist names to their total points
@@ -365,41 +516,49 @@ class BillboardScraper:
         artist_scores = {}
         
         for entry in chart_entries:
-            artist = entry['artist']
-            rank = entry['rank']
-            
             # Point system: #1 = 100 points, #2 = 99 points, etc.
-            points = 101 - rank
+            points = 101 - entry['rank']
             
-            if artist in artist_scores:
-                artist_scores[artist] += points
-            else:
-                artist_scores[artist] = points
+            credits = credit_parser.shares(entry['artist']) if credit_parser else ((entry['artist'], 1),)
+            for artist, share in credits:
+                artist_scores[artist] = artist_scores.get(artist, 0) + points * share
+        
+        if credit_parser:
+            artist_scores = {artist: round(score, 2) for artist, score in artist_scores.items()}
         
         # Sort by total points (descending)
         return dict(sorted(artist_scores.items(), key=lambda x: x[1], reverse=True))
     
-    def get_top_artists(self, chart_entries: List[Dict], top_n: int = 10) -> List[Dict]:
+    def get_top_artists(self, chart_entries: List[Dict], top_n: int = 10,
+                        credit_parser: Optional[ArtistCreditParser] = None) -> List[Dict]:
         """
         Get the top performing artists of the week.
         
         Args:
             chart_entries: List of chart entries
             top_n: Number of top artists to return
+            credit_parser: Split collaborations into their credited artists
+                (see calculate_artist_scores)
             
         Returns:
             List of top artists with their scores and chart positions
         """
-        artist_scores = self.calculate_artist_scores(chart_entries)
+        artist_scores = self.calculate_artist_scores(chart_entries, credit_parser)
+        
+        # Gather every artist's chart positions in one pass
+        artist_positions = {}
+        for entry in chart_entries:
+            artists = [artist for artist, _ in credit_parser.shares(entry['artist'])] \
+                if credit_parser else [entry['artist']]
+            for artist in artists:
+                artist_positions.setdefault(artist, []).append(entry['rank'])
         
         top_artists = []
         for i, (artist, total_score) in enumerate(artist_scores.items()):
             if i >= top_n:
                 break
                 
-            # Get all chart positions for this artist
-            positions = [entry['rank'] for entry in chart_entries if entry['artist'] == artist]
-            positions.sort()
+            positions = sorted(artist_positions[artist])
             
             top_artists.append({
                 'rank': i + 1,
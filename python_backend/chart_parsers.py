@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+HTML parser backends for the Billboard scraper.
+
+A backend turns a raw chart page into a document and answers the questions
+the scraper's strategy cascade asks of it: which elements are the chart rows
+(per row strategy), and what a row's rank, title (per selector) and artist
+(per artist strategy) are. BillboardScraper keeps the cascade order and the
+learned layout profiles; the backend only does the tree work.
+
+Two backends are shipped, fastest first:
+
+    lxml         lxml.html with precompiled XPath queries (no BeautifulSoup)
+    html.parser  BeautifulSoup with Python's built-in html.parser
+
+Both produce the same entries for the same page. The lxml backend is used
+whenever lxml is installed; html.parser needs nothing beyond bs4.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from bs4 import BeautifulSoup
+
+# lxml is a C-backed parser and much faster than html.parser on chart pages
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Row-finding strategies, in full-cascade order
+ROW_STRATEGIES = ['row_container', 'chart_list_item', 'chart_div', 'chart_li', 'data_rank', 'rank_text']
+
+# Title selectors, in full-cascade order
+TITLE_SELECTORS = [
+    'h3.c-title', 'h3', 'h4', '.title', '.song-title',
+    '.chart-title', '.track-title', '[class*="title"]'
+]
+
+# Rank selectors tried after the rank list item, in order
+RANK_SELECTORS = ['.rank', '.position', '.chart-rank', '[data-rank]']
+RANK_ITEM_SELECTOR = 'li.o-chart-results-list__item'
+LABEL_SELECTOR = 'span.c-label'
+
+# Artist strategies, in full-cascade order
+ARTIST_STRATEGIES = ['share_links', 'label', 'artist_links', 'any_link']
+
+SHARE_SUFFIXES = [
+    " on this week's Billboard Hot 100™!",
+    " on this week's Billboard Hot 100!",
+    " on this week's Billboard Hot 100",
+    " on this week's Billboard Hot 100™",
+]
+SHARE_PARAMS = {'facebook.com': re.compile(r'quote=([^&]+)'), 'twitter.com': re.compile(r'text=([^&]+)')}
+NOT_ARTIST_PATTERNS = [
+    re.compile(r'^\d{2}/\d{2}/\d{2}$'),  # Not date format
+    re.compile(r'^\d+$'),  # Not just numbers
+]
+NAVIGATION_PATTERN = re.compile(r'^(expand|menu|search|login|share|chart)$')
+
+
+def is_rank_text(text) -> bool:
+    """Whether a text node holds a chart position (1-100)."""
+    return text and text.strip().isdigit() and 1 <= int(text.strip()) <= 100
+
+
+class ChartParserBackend:
+    """
+    Extracts chart rows, and each row's rank, title and artist, from a page.
+
+    Subclasses parse the page and implement the tree primitives (_select_first,
+    _text, _links and rows); rank, title and artist are built on top of them,
+    so every backend applies the same rules.
+    """
+
+    name = None
+
+    def parse(self, content: bytes):
+        """Parse raw page HTML into a backend-specific document."""
+        raise NotImplementedError
+
+    def rows(self, document, strategy: str) -> List:
+        """
+        Find the chart rows of a document with one of ROW_STRATEGIES.
+
+        Returns:
+            Row elements in document order (empty if the strategy finds none)
+        """
+        raise NotImplementedError
+
+    def _select_first(self, row, selector: str):
+        """First descendant of row matching a selector, or None."""
+        raise NotImplementedError
+
+    def _text(self, element) -> str:
+        """Text of an element with each string stripped, like bs4's get_text(strip=True)."""
+        raise NotImplementedError
+
+    def _links(self, row) -> List[Tuple[str, object]]:
+        """(href, element) of each link below row, in document order ('' if no href)."""
+        raise NotImplementedError
+
+    def rank(self, row) -> Optional[int]:
+        """Chart position printed in a row, or None to use the row's position."""
+        rank = None
+        rank_element = self._select_first(row, RANK_ITEM_SELECTOR)
+        if rank_element is not None:
+            rank_text = self._text(rank_element)
+            if rank_text.isdigit():
+                rank = int(rank_text)
+
+        # Also look for rank in other common locations
+        for selector in RANK_SELECTORS:
+            rank_element = self._select_first(row, selector)
+            if rank_element is not None:
+                rank_text = self._text(rank_element)
+                if rank_text.isdigit() and 1 <= int(rank_text) <= 100:
+                    return int(rank_text)
+        return rank
+
+    def title(self, row, selector: str) -> str:
+        """Text of the first element matching one of TITLE_SELECTORS ('' if none)."""
+        element = self._select_first(row, selector)
+        return self._text(element) if element is not None else ""
+
+    def artist(self, row, strategy: str) -> str:
+        """Artist found by one of ARTIST_STRATEGIES ('' if none)."""
+        return getattr(self, f'_artist_from_{strategy}')(row)
+
+    def _artist_from_share_links(self, row) -> str:
+        """Artist strategy 1: social media share URLs, minus Billboard's suffix."""
+        artist = ""
+        for href, _ in self._links(row):
+            artist = self._artist_from_share_url(href)
+            if artist:
+                break
+
+        # Clean up extra Billboard text from artist field
+        for suffix in SHARE_SUFFIXES:
+            artist = artist.replace(suffix, "")
+        return artist
+
+    @staticmethod
+    def _artist_from_share_url(href: str) -> str:
+        """Artist from a Facebook quote= or Twitter text= share URL ("Title by Artist")."""
+        for host, param in SHARE_PARAMS.items():
+            if host in href:
+                match = param.search(href)
+                if match:
+                    # Format: "Song Title by Artist Featuring Other Artist"
+                    text = unquote(match.group(1))
+                    if ' by ' in text:
+                        return text.split(' by ', 1)[1].strip()
+        return ""
+
+    def _artist_from_label(self, row) -> str:
+        """Artist strategy 2: the c-label span."""
+        element = self._select_first(row, LABEL_SELECTOR)
+        return self._text(element) if element is not None else ""
+
+    def _artist_from_artist_links(self, row) -> str:
+        """Artist strategy 3: links to artist pages."""
+        for href, link in self._links(row):
+            if '/artist/' in href:
+                text = self._text(link)
+                if text and len(text) > 2:
+                    return text
+        return ""
+
+    def _artist_from_any_link(self, row) -> str:
+        """Artist strategy 4: any link text that might be an artist."""
+        for _, link in self._links(row):
+            text = self._text(link)
+            if (text and len(text) > 2
+                    and not any(pattern.match(text) for pattern in NOT_ARTIST_PATTERNS)
+                    and not NAVIGATION_PATTERN.match(text.lower())):  # Not navigation
+                return text
+        return ""
+
+
+class SoupBackend(ChartParserBackend):
+    """BeautifulSoup over Python's html.parser: slow, but needs no C extension."""
+
+    name = 'html.parser'
+
+    def parse(self, content: bytes):
+        return BeautifulSoup(content, 'html.parser')
+
+    def rows(self, document, strategy: str) -> List:
+        if strategy == 'row_container':
+            return document.find_all('div', class_='o-chart-results-list-row-container')
+        if strategy == 'chart_list_item':
+            return document.find_all('div', class_='chart-list-item')
+        if strategy == 'chart_div':
+            return document.find_all('div', class_=lambda x: x and 'chart' in x.lower())
+        if strategy == 'chart_li':
+            return document.find_all('li', class_=lambda x: x and 'chart' in x.lower())
+        if strategy == 'data_rank':
+            return document.find_all(['div', 'li'], attrs={'data-rank': True})
+        if strategy == 'rank_text':
+            rank_elements = document.find_all(string=is_rank_text)
+            return [element.parent for element in rank_elements[:100] if element.parent]
+        raise ValueError(f"Unknown row strategy: {strategy}")
+
+    def _select_first(self, row, selector: str):
+        return row.select_one(selector)
+
+    def _text(self, element) -> str:
+        return element.get_text(strip=True)
+
+    def _links(self, row) -> List[Tuple[str, object]]:
+        return [(link.get('href') or '', link) for link in row.find_all('a')]
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate for an element whose class list contains name."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# The selectors the strategies use, as XPath relative to a row
+SELECTOR_XPATHS = {
+    'h3.c-title': f".//h3[{_has_class('c-title')}]",
+    'h3': './/h3',
+    'h4': './/h4',
+    '.title': f".//*[{_has_class('title')}]",
+    '.song-title': f".//*[{_has_class('song-title')}]",
+    '.chart-title': f".//*[{_has_class('chart-title')}]",
+    '.track-title': f".//*[{_has_class('track-title')}]",
+    '[class*="title"]': ".//*[contains(@class, 'title')]",
+    '.rank': f".//*[{_has_class('rank')}]",
+    '.position': f".//*[{_has_class('position')}]",
+    '.chart-rank': f".//*[{_has_class('chart-rank')}]",
+    '[data-rank]': './/*[@data-rank]',
+    RANK_ITEM_SELECTOR: f".//li[{_has_class('o-chart-results-list__item')}]",
+    LABEL_SELECTOR: f".//span[{_has_class('c-label')}]",
+}
+
+CHART_CLASS = "contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'chart')"
+ROW_XPATHS = {
+    'row_container': f"//div[{_has_class('o-chart-results-list-row-container')}]",
+    'chart_list_item': f"//div[{_has_class('chart-list-item')}]",
+    'chart_div': f"//div[{CHART_CLASS}]",
+    'chart_li': f"//li[{CHART_CLASS}]",
+    'data_rank': '//*[self::div or self::li][@data-rank]',
+}
+
+
+class LxmlBackend(ChartParserBackend):
+    """lxml.html with precompiled XPath: no BeautifulSoup tree at all."""
+
+    name = 'lxml'
+
+    def __init__(self):
+        # XPath objects are compiled per backend, and every scraper (one per
+        # backfill thread) has its own backend
+        self._selectors = {selector: etree.XPath(xpath) for selector, xpath in SELECTOR_XPATHS.items()}
+        self._rows = {strategy: etree.XPath(xpath) for strategy, xpath in ROW_XPATHS.items()}
+        self._strings = etree.XPath('.//text()[not(parent::script or parent::style)]')
+        # BeautifulSoup counts comments as strings too
+        self._all_strings = etree.XPath('//text() | //comment()')
+        self._anchors = etree.XPath('.//a')
+
+    def parse(self, content: bytes):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        if not content.strip():
+            # lxml refuses empty documents; BeautifulSoup gives an empty tree
+            content = b'<html></html>'
+        # libxml2 assumes Latin-1 when a page declares no charset; pages that
+        # are valid UTF-8 are read as UTF-8, as BeautifulSoup does
+        try:
+            content.decode('utf-8')
+            parser = lxml.html.HTMLParser(encoding='utf-8')
+        except UnicodeDecodeError:
+            parser = None
+        return lxml.html.document_fromstring(content, parser=parser)
+
+    def rows(self, document, strategy: str) -> List:
+        if strategy == 'rank_text':
+            parents = []
+            for node in self._all_strings(document):
+                text = node if isinstance(node, str) else node.text
+                parent = node.getparent()
+                if isinstance(node, str) and node.is_tail and parent is not None:
+                    # A tail string sits in the parent of the element it follows
+                    parent = parent.getparent()
+                if is_rank_text(text):
+                    parents.append(parent)
+                    if len(parents) == 100:
+                        break
+            return [parent for parent in parents if parent is not None]
+        if strategy not in self._rows:
+            raise ValueError(f"Unknown row strategy: {strategy}")
+        return self._rows[strategy](document)
+
+    def _select_first(self, row, selector: str):
+        matches = self._selectors[selector](row)
+        return matches[0] if matches else None
+
+    def _text(self, element) -> str:
+        return ''.join(text.strip() for text in self._strings(element))
+
+    def _links(self, row) -> List[Tuple[str, object]]:
+        return [(link.get('href') or '', link) for link in self._anchors(row)]
+
+
+# Parser backends, fastest first
+PARSER_BACKENDS: Dict[str, type] = {'lxml': LxmlBackend, 'html.parser': SoupBackend}
+
+
+def available_parser_backends() -> List[str]:
+    """List the parser backends that can be used in this environment."""
+    return [name for name in PARSER_BACKENDS if name != 'lxml' or LXML_AVAILABLE]
+
+
+def create_parser_backend(name: Optional[str] = None) -> ChartParserBackend:
+    """
+    Create a parser backend.
+
+    Args:
+        name: Backend name, or None for the fastest available one
+
+    Raises:
+        ValueError: If the backend is unknown or its library isn't installed
+    """
+    available = available_parser_backends()
+    if name and name not in available:
+        raise ValueError(f"Parser backend '{name}' not available; choose from {available}")
+    return PARSER_BACKENDS[name or available[0]]()
@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+"""
+Compact binary snapshots of weekly chart data.
+
+run_scraper.py saves each week as pretty-printed JSON that repeats every
+title and artist string in chart_entries and again in top_artists. A
+snapshot stores the same week as:
+
+- string tables for artists, titles and a few metadata strings (chart
+  dates, scraped_at), each string stored once as UTF-8 plus an offset array
+- packed integer arrays for ranks, title/artist IDs and chart positions,
+  using the narrowest of uint8/16/32 that fits each array
+- entry timestamps as int64 microseconds
+
+File layout (little-endian on every platform, every section 8-byte aligned):
+
+    header   magic "BBWK", version, flags, total_entries, section count
+    sections name (4 bytes), struct typecode, byte offset, item count
+    data     the sections
+
+ChartSnapshot reads a snapshot from any buffer without parsing. Opened from
+a file, the buffer is a read-only memory map, so reading the ranks or the
+#1 artist of a week touches only those bytes. to_dict() rebuilds the exact
+week dict that was saved. Integer total_score values come back as ints and
+fractional ones with two decimals.
+
+Usage:
+    python chart_snapshot.py [--historical ../data/historical] [--overwrite]
+"""
+
+import argparse
+import json
+import mmap
+import statistics
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+from data_publish import GENERATION_KEY, atomic_write
+
+MAGIC = b'BBWK'
+VERSION = 1
+SNAPSHOT_SUFFIX = '.snap'
+ALIGNMENT = 8
+
+HEADER = struct.Struct('<4sHHII')    # magic, version, flags, total_entries, sections
+SECTION = struct.Struct('<4sc3xQQ')  # name, typecode, offset, count
+
+# Header flags for optional week fields
+HAS_TOTAL_ENTRIES = 1
+HAS_SCRAPED_AT = 2
+HAS_TOP_ARTISTS = 4
+
+WEEK_KEYS = {'chart_date', 'total_entries', 'scraped_at', 'chart_entries', 'top_artists'}
+ENTRY_KEYS = {'rank', 'title', 'artist', 'chart_date', 'scraped_at'}
+TOP_ARTIST_KEYS = {'rank', 'artist', 'total_score', 'chart_positions', 'songs_count'}
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _packed(values: Sequence[int]) -> array:
+    """Unsigned integers in the narrowest array type that holds them all."""
+    largest = max(values, default=0)
+    for typecode in 'BHI':
+        if largest < 1 << 8 * struct.calcsize(typecode):
+            return array(typecode, values)
+    return array('Q', values)
+
+
+def _string_table(strings: Sequence[str]):
+    """Offsets array and UTF-8 blob of a list of strings."""
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    return _packed(offsets), b''.join(encoded)
+
+
+def _encode_timestamp(value: str) -> int:
+    """Microseconds since the epoch of a naive isoformat() timestamp."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is not None or moment.isoformat() != value:
+        raise ValueError(f"Unsupported scraped_at timestamp: {value!r}")
+    delta = moment - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+@lru_cache(maxsize=1024)
+def _format_seconds(seconds: int) -> str:
+    """isoformat() of a whole second since the epoch."""
+    return (EPOCH + timedelta(seconds=seconds)).isoformat()
+
+
+def _decode_timestamp(micros: int) -> str:
+    """Inverse of _encode_timestamp()."""
+    # A week's entries are scraped within a few seconds of each other, so
+    # formatting each second once and appending the microseconds is enough
+    seconds, micros = divmod(micros, 1000000)
+    return f"{_format_seconds(seconds)}.{micros:06d}" if micros else _format_seconds(seconds)
+
+
+def _decode_timestamps(column) -> List[str]:
+    """_decode_timestamp() of every value of a column."""
+    # '%06d' formats several times faster than an f-string format spec
+    timestamps = []
+    for micros in column.tolist():
+        seconds, micros = divmod(micros, 1000000)
+        prefix = _format_seconds(seconds)
+        timestamps.append('%s.%06d' % (prefix, micros) if micros else prefix)
+    return timestamps
+
+
+def _encode_score(score) -> int:
+    """total_score in hundredths of a point."""
+    hundredths = round(score * 100)
+    if hundredths < 0 or hundredths / 100 != score:
+        raise ValueError(f"Unsupported total_score: {score!r}")
+    return hundredths
+
+
+def _decode_score(hundredths: int):
+    """Inverse of _encode_score(); whole scores come back as ints."""
+    return hundredths // 100 if hundredths % 100 == 0 else hundredths / 100
+
+
+def encode_week(week: Dict) -> bytes:
+    """
+    Encode a week dict as saved by run_scraper.py.
+
+    Args:
+        week: Dict with chart_date, chart_entries and optionally
+            total_entries, scraped_at and top_artists
+
+    Returns:
+        Snapshot bytes
+
+    Raises:
+        KeyError: If an entry or top artist lacks a field
+        ValueError: If the week has fields or values the format cannot store
+    """
+    # The publishing generation (see data_publish.py) is not chart data
+    unknown = set(week) - WEEK_KEYS - {GENERATION_KEY}
+    entries = week.get('chart_entries', [])
+    top_artists = week.get('top_artists') or []
+    for entry in entries:
+        unknown |= set(entry) - ENTRY_KEYS
+    for position, artist in enumerate(top_artists, 1):
+        unknown |= set(artist) - TOP_ARTIST_KEYS
+        if artist['rank'] != position:
+            raise ValueError(f"top_artists out of order at rank {artist['rank']}")
+    if unknown:
+        raise ValueError(f"Fields not stored in snapshots: {', '.join(sorted(unknown))}")
+
+    flags = 0
+    if 'total_entries' in week:
+        flags |= HAS_TOTAL_ENTRIES
+    if 'scraped_at' in week:
+        flags |= HAS_SCRAPED_AT
+    if 'top_artists' in week:
+        flags |= HAS_TOP_ARTISTS
+
+    # meta[0] is the week's chart_date, meta[1] its scraped_at, then entry dates
+    meta = [week['chart_date'], week.get('scraped_at') or '']
+    artists, titles, dates = {}, {}, {}
+    artist_ids, title_ids, date_ids = [], [], []
+    for entry in entries:
+        artist_ids.append(artists.setdefault(entry['artist'], len(artists)))
+        title_ids.append(titles.setdefault(entry['title'], len(titles)))
+        date_ids.append(dates.setdefault(entry['chart_date'], len(meta) + len(dates)))
+    meta.extend(dates)
+
+    top_ids = [artists.setdefault(artist['artist'], len(artists)) for artist in top_artists]
+    position_offsets = [0]
+    positions = []
+    for artist in top_artists:
+        positions.extend(artist['chart_positions'])
+        position_offsets.append(len(positions))
+
+    sections = [
+        (b'meto', *_string_table(meta)),
+        (b'arto', *_string_table(list(artists))),
+        (b'tito', *_string_table(list(titles))),
+        (b'rank', _packed([entry['rank'] for entry in entries])),
+        (b'tids', _packed(title_ids)),
+        (b'aids', _packed(artist_ids)),
+        (b'dids', _packed(date_ids)),
+        (b'scrp', array('q', [_encode_timestamp(entry['scraped_at']) for entry in entries])),
+        (b'tart', _packed(top_ids)),
+        (b'tsco', _packed([_encode_score(artist['total_score']) for artist in top_artists])),
+        (b'tsng', _packed([artist['songs_count'] for artist in top_artists])),
+        (b'tpoo', _packed(position_offsets)),
+        (b'tpos', _packed(positions)),
+    ]
+    # String tables are two sections: "xxxo" offsets and "xxxb" UTF-8 bytes
+    columns = []
+    for name, data, *blob in sections:
+        if sys.byteorder == 'big':
+            data.byteswap()
+        columns.append((name, data.typecode, data.tobytes()))
+        if blob:
+            columns.append((name[:3] + b'b', 'B', blob[0]))
+
+    offset = _aligned(HEADER.size + SECTION.size * len(columns))
+    table, body = [], []
+    for name, typecode, data in columns:
+        table.append(SECTION.pack(name, typecode.encode(), offset, len(data) // struct.calcsize(typecode)))
+        padding = _aligned(len(data)) - len(data)
+        body.append(data + b'\0' * padding)
+        offset += len(data) + padding
+
+    header = HEADER.pack(MAGIC, VERSION, flags, week.get('total_entries', len(entries)), len(columns))
+    head = header + b''.join(table)
+    return head + b'\0' * (_aligned(len(head)) - len(head)) + b''.join(body)
+
+
+def _aligned(size: int) -> int:
+    """Size rounded up to the section alignment."""
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def write_snapshot(week: Dict, path: str) -> int:
+    """
+    Write a week as a snapshot file.
+
+    The file is written next to its final path and renamed into place, so
+    readers never map a partial snapshot.
+
+    Returns:
+        Size of the snapshot in bytes
+    """
+    data = encode_week(week)
+    with atomic_write(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+class StringTable(Sequence):
+    """Read-only sequence of the strings of one snapshot string table."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string table index out of range")
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+    def __iter__(self):
+        return iter(self.decode_all())
+
+    def decode_all(self) -> List[str]:
+        """Every string of the table, from one copy of the blob."""
+        data = self.blob.tobytes()
+        offsets = self.offsets.tolist()
+        if data.isascii():
+            # Byte offsets are character offsets, so slice one decoded str
+            text = data.decode('ascii')
+            return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+        return [data[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+
+class ChartSnapshot:
+    """One chart week read from snapshot bytes, without copying or parsing them."""
+
+    def __init__(self, buffer):
+        """
+        Read a snapshot.
+
+        Args:
+            buffer: Snapshot bytes, a memory map or any other buffer
+
+        Raises:
+            ValueError: If the buffer is not a snapshot of a supported version
+        """
+        self._mmap = None
+        self._view = memoryview(buffer)
+        magic, version, flags, total_entries, count = HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError("Not a chart snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+
+        self._sections = {}
+        for i in range(count):
+            name, typecode, offset, items = SECTION.unpack_from(self._view, HEADER.size + i * SECTION.size)
+            typecode = typecode.decode()
+            end = offset + items * struct.calcsize(typecode)
+            section = self._view[offset:end].cast(typecode)
+            if sys.byteorder == 'big' and section.itemsize > 1:
+                # Stored little-endian: read a swapped copy instead of the buffer
+                section = array(typecode, section.tobytes())
+                section.byteswap()
+            self._sections[name.decode()] = section
+
+        self.flags = flags
+        self._decoded_tables = {}
+        self.meta = self._strings('met')
+        self.artists = self._strings('art')
+        self.titles = self._strings('tit')
+        self.chart_date = self.meta[0]
+        self.scraped_at = self.meta[1] if flags & HAS_SCRAPED_AT else None
+        self.total_entries = total_entries
+
+        # Packed per-entry columns, in chart order
+        self.ranks = self._sections['rank']
+        self.title_ids = self._sections['tids']
+        self.artist_ids = self._sections['aids']
+
+    @classmethod
+    def open(cls, path: str) -> 'ChartSnapshot':
+        """Memory-map a snapshot file; close() (or a with block) unmaps it."""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            snapshot = cls(mapped)
+        except Exception:
+            mapped.close()
+            raise
+        snapshot._mmap = mapped
+        return snapshot
+
+    def _strings(self, prefix: str) -> StringTable:
+        """String table stored in the prefix + 'o' and prefix + 'b' sections."""
+        return StringTable(self._sections[prefix + 'o'], self._sections[prefix + 'b'])
+
+    def __len__(self) -> int:
+        return len(self.ranks)
+
+    def entry(self, index: int) -> Dict:
+        """One chart entry, in chart order."""
+        return {
+            'rank': self.ranks[index],
+            'title': self.titles[self.title_ids[index]],
+            'artist': self.artists[self.artist_ids[index]],
+            'chart_date': self.meta[self._sections['dids'][index]],
+            'scraped_at': _decode_timestamp(self._sections['scrp'][index])
+        }
+
+    def _decoded(self, prefix: str) -> List[str]:
+        """A string table decoded once per snapshot, for building whole dicts."""
+        strings = self._decoded_tables.get(prefix)
+        if strings is None:
+            strings = self._decoded_tables[prefix] = self._strings(prefix).decode_all()
+        return strings
+
+    def entries(self) -> List[Dict]:
+        """All chart entries, as in the saved week's chart_entries."""
+        titles, artists, meta = self._decoded('tit'), self._decoded('art'), self._decoded('met')
+        return [
+            {'rank': rank, 'title': titles[title_id], 'artist': artists[artist_id],
+             'chart_date': meta[date_id], 'scraped_at': scraped_at}
+            for rank, title_id, artist_id, date_id, scraped_at in zip(
+                self.ranks.tolist(), self.title_ids.tolist(), self.artist_ids.tolist(),
+                self._sections['dids'].tolist(), _decode_timestamps(self._sections['scrp']))
+        ]
+
+    def top_artists(self) -> List[Dict]:
+        """The saved week's top_artists."""
+        artists = self._decoded('art')
+        offsets = self._sections['tpoo']
+        positions = self._sections['tpos']
+        return [
+            {'rank': i + 1, 'artist': artists[artist_id], 'total_score': _decode_score(score),
+             'chart_positions': positions[offsets[i]:offsets[i + 1]].tolist(), 'songs_count': songs_count}
+            for i, (artist_id, score, songs_count) in enumerate(zip(
+                self._sections['tart'], self._sections['tsco'], self._sections['tsng']))
+        ]
+
+    def to_dict(self) -> Dict:
+        """The week dict the snapshot was written from."""
+        week = {'chart_date': self.chart_date}
+        if self.flags & HAS_TOTAL_ENTRIES:
+            week['total_entries'] = self.total_entries
+        if self.flags & HAS_SCRAPED_AT:
+            week['scraped_at'] = self.scraped_at
+        week['chart_entries'] = self.entries()
+        if self.flags & HAS_TOP_ARTISTS:
+            week['top_artists'] = self.top_artists()
+        return week
+
+    def close(self):
+        """Release the buffer and unmap the file, if opened with open()."""
+        for view in self._sections.values():
+            view.release()
+        self._sections = {}
+        self._decoded_tables = {}
+        self._view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A caller still holds a slice of a column; the map is
+                # released when that goes away
+                pass
+            self._mmap = None
+
+    def __enter__(self) -> 'ChartSnapshot':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def snapshot_paths(historical_dir: str) -> List[Path]:
+    """Snapshot files of a data/historical tree, oldest week first."""
+    return sorted(Path(historical_dir).glob(f'*/billboard_*{SNAPSHOT_SUFFIX}'))
+
+
+def iter_snapshots(historical_dir: str) -> Iterator[ChartSnapshot]:
+    """
+    Scan every snapshot of a data/historical tree, oldest week first.
+
+    Each snapshot is closed when the next one is read, so copy out what
+    should outlive the iteration step.
+    """
+    for path in snapshot_paths(historical_dir):
+        with ChartSnapshot.open(str(path)) as snapshot:
+            yield snapshot
+
+
+def convert_historical(historical_dir: str, overwrite: bool = False) -> Dict:
+    """
+    Write a snapshot next to every billboard_<date>.json of a data/historical tree.
+
+    Each snapshot is read back and compared with its JSON before it is kept.
+
+    Args:
+        historical_dir: Directory of YYYY-MM-DD week folders
+        overwrite: Rewrite snapshots that already exist
+
+    Returns:
+        Statistics with weeks, skipped (path -> reason), and the on-disk
+        bytes of the JSON, CSV and snapshot files
+    """
+    stats = {'weeks': 0, 'skipped': {}, 'json_bytes': 0, 'csv_bytes': 0, 'snapshot_bytes': 0}
+    for json_path in sorted(Path(historical_dir).glob('*/billboard_*.json')):
+        snapshot_path = json_path.with_suffix(SNAPSHOT_SUFFIX)
+        try:
+            if overwrite or not snapshot_path.exists():
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    week = json.load(f)
+                write_snapshot(week, str(snapshot_path))
+                week.pop(GENERATION_KEY, None)
+                with ChartSnapshot.open(str(snapshot_path)) as snapshot:
+                    if snapshot.to_dict() != week:
+                        raise ValueError("snapshot does not match its JSON")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            snapshot_path.unlink(missing_ok=True)
+            stats['skipped'][str(json_path)] = str(e)
+            continue
+
+        stats['weeks'] += 1
+        stats['json_bytes'] += json_path.stat().st_size
+        stats['csv_bytes'] += sum(path.stat().st_size for path in json_path.parent.rglob('*.csv'))
+        stats['snapshot_bytes'] += snapshot_path.stat().st_size
+    return stats
+
+
+def compare_load_times(historical_dir: str, repeat: int = 20) -> Dict[str, float]:
+    """
+    Median seconds to read every converted week from JSON and from snapshots.
+
+    Returns:
+        Timings for json.load of every week ('json'), snapshot to_dict() of
+        every week ('snapshot'), and a scan of every week's (rank, artist)
+        pairs straight from the snapshot columns ('scan')
+    """
+    snapshots = snapshot_paths(historical_dir)
+    json_files = [path.with_suffix('.json') for path in snapshots]
+
+    def load_json():
+        for path in json_files:
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)
+
+    def open_snapshots():
+        # Same file list as load_json, so neither side pays for the glob
+        for path in snapshots:
+            with ChartSnapshot.open(str(path)) as snapshot:
+                yield snapshot
+
+    def load_snapshots():
+        for snapshot in open_snapshots():
+            snapshot.to_dict()
+
+    def scan_artists():
+        for snapshot in open_snapshots():
+            artists = list(snapshot.artists)
+            [(rank, artists[artist_id]) for rank, artist_id in zip(snapshot.ranks, snapshot.artist_ids)]
+
+    timings = {}
+    for label, func in [('json', load_json), ('snapshot', load_snapshots), ('scan', scan_artists)]:
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - start)
+        timings[label] = statistics.median(runs)
+    return timings
+
+
+def main():
+    """Convert data/historical to snapshots and report the savings."""
+    parser = argparse.ArgumentParser(description="Convert historical chart weeks to binary snapshots")
+    parser.add_argument('--historical', default='../data/historical', help="data/historical directory")
+    parser.add_argument('--overwrite', action='store_true', help="Rewrite existing snapshots")
+    args = parser.parse_args()
+
+    print("📦 Chart Snapshots")
+    print("=" * 40)
+
+    stats = convert_historical(args.historical, overwrite=args.overwrite)
+    for path, reason in stats['skipped'].items():
+        print(f"⚠️  Skipped {path}: {reason}")
+    if not stats['weeks']:
+        print("❌ No weeks converted")
+        return 1
+
+    sources = stats['json_bytes'] + stats['csv_bytes']
+    print(f"✅ {stats['weeks']} weeks: JSON {stats['json_bytes']:,} bytes + CSV {stats['csv_bytes']:,} bytes "
+          f"→ snapshots {stats['snapshot_bytes']:,} bytes")
+    print(f"   {stats['json_bytes'] / stats['snapshot_bytes']:.1f}x smaller than the JSON, "
+          f"{sources / stats['snapshot_bytes']:.1f}x smaller than JSON + CSV")
+
+    timings = compare_load_times(args.historical)
+    print(f"⏱️  Load all weeks: JSON {timings['json'] * 1000:.2f} ms, "
+          f"snapshots {timings['snapshot'] * 1000:.2f} ms "
+          f"({timings['json'] / timings['snapshot']:.1f}x); "
+          f"rank/artist scan {timings['scan'] * 1000:.2f} ms ({timings['json'] / timings['scan']:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
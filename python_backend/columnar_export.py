@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Columnar export of chart and review data for analytics.
+
+Chart history is streamed out of BillboardDatabase in chunks and written as
+one Parquet file per chart week, partitioned Hive-style by ISO year and week:
+
+    <out>/chart_entries/year=2025/week=36/2025-09-06.parquet
+
+Artist and title (and the movement status) are dictionary-encoded. Runs are
+incremental by default: only weeks newer than the last exported week are
+written. After each export the full history is also compacted into one
+uncompressed Arrow IPC file, which load_chart_history() memory-maps.
+Decades of charts then load in milliseconds without copying.
+
+Usage:
+    python columnar_export.py --db billboard.db --out ../data/columnar [--full]
+                              [--reviews ../netlify_functions/reviews.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from billboard_database import BillboardDatabase
+
+logger = logging.getLogger(__name__)
+
+CHART_DIR = 'chart_entries'
+CHART_IPC_FILE = 'chart_history.arrow'
+REVIEWS_FILE = 'reviews.parquet'
+STATE_FILE = '_export_state.json'
+
+# Review columns stored dictionary-encoded (few distinct values, many rows)
+REVIEW_DICTIONARY_COLUMNS = [
+    'song_artist', 'song_album', 'song_label', 'song_genre', 'song_mood',
+    'song_instrumentation', 'song_language'
+]
+REVIEW_DATE_COLUMNS = ['song_release_date', 'song_upload_date', 'review_date']
+
+
+def chart_schema() -> 'pa.Schema':
+    """Arrow schema of exported chart entries."""
+    text = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('chart_date', pa.date32()),
+        ('rank', pa.int16()),
+        ('title', text),
+        ('artist', text),
+        ('song_id', pa.int32()),
+        ('previous_rank', pa.int16()),
+        ('rank_change', pa.int16()),
+        ('peak_to_date', pa.int16()),
+        ('weeks_on_chart', pa.int16()),
+        ('status', text),
+    ])
+
+
+def parse_date(value) -> Optional[date]:
+    """Parse a YYYY-MM-DD value, or None if it isn't one."""
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def partition_path(out_dir: Path, chart_date: str) -> Path:
+    """Parquet file for one chart week."""
+    iso_year, iso_week, _ = parse_date(chart_date).isocalendar()
+    return out_dir / CHART_DIR / f"year={iso_year}" / f"week={iso_week:02d}" / f"{chart_date}.parquet"
+
+
+class ColumnarExporter:
+    """Writes chart history and reviews as Parquet plus an Arrow IPC snapshot."""
+
+    def __init__(self, out_dir: str, chunk_size: int = 50000):
+        """
+        Initialize the exporter.
+
+        Args:
+            out_dir: Export root directory
+            chunk_size: Rows fetched from the database per chunk
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow not available. Install with: pip install pyarrow")
+        self.out_dir = Path(out_dir)
+        self.chunk_size = chunk_size
+        self.schema = chart_schema()
+
+    def _load_state(self) -> Dict:
+        """Read the export state (last exported week)."""
+        try:
+            with open(self.out_dir / STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict):
+        """Write the export state."""
+        with open(self.out_dir / STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+
+    def _write_week(self, chart_date: str, rows: List[Dict]):
+        """Write one chart week to its partition."""
+        columns = {name: [row[name] for row in rows] for name in self.schema.names}
+        columns['chart_date'] = [parse_date(value) for value in columns['chart_date']]
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+
+        path = partition_path(self.out_dir, chart_date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, path, compression='zstd')
+
+    def export_charts(self, db: BillboardDatabase, full: bool = False) -> Dict:
+        """
+        Export chart weeks to Parquet, then refresh the Arrow IPC snapshot.
+
+        Args:
+            db: SQLite BillboardDatabase to read from
+            full: Re-export every week instead of only new ones
+
+        Returns:
+            Statistics with weeks, rows, last_chart_date and seconds
+        """
+        start = time.perf_counter()
+        state = {} if full else self._load_state()
+        after_date = state.get('last_chart_date')
+
+        weeks = rows = 0
+        week_rows, week_date = [], None
+        for chunk in db.iter_chart_history(after_date, self.chunk_size):
+            for row in chunk:
+                if row['chart_date'] != week_date:
+                    if week_rows:
+                        self._write_week(week_date, week_rows)
+                        weeks += 1
+                    week_rows, week_date = [], row['chart_date']
+                week_rows.append(row)
+                rows += 1
+        if week_rows:
+            self._write_week(week_date, week_rows)
+            weeks += 1
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        if weeks or full:
+            self.write_ipc_snapshot()
+            state = {'last_chart_date': week_date or after_date,
+                     'exported_at': time.strftime('%Y-%m-%dT%H:%M:%S')}
+            self._save_state(state)
+
+        stats = {
+            'weeks': weeks,
+            'rows': rows,
+            'last_chart_date': state.get('last_chart_date'),
+            'seconds': round(time.perf_counter() - start, 3)
+        }
+        logger.info(f"Exported {weeks} weeks ({rows} rows) in {stats['seconds']}s")
+        return stats
+
+    def write_ipc_snapshot(self) -> Path:
+        """
+        Compact every exported week into one uncompressed Arrow IPC file.
+
+        Dictionaries are unified across weeks so the file holds one artist
+        and one title dictionary. The file is written next to the old one
+        and swapped in, so mapped readers never see a partial file.
+        """
+        chart_dir = self.out_dir / CHART_DIR
+        table = ds.dataset(chart_dir, format='parquet', schema=self.schema).to_table() \
+            if chart_dir.exists() else self.schema.empty_table()
+        table = table.sort_by([('chart_date', 'ascending'), ('rank', 'ascending')])
+        table = table.unify_dictionaries().combine_chunks()
+
+        path = self.out_dir / CHART_IPC_FILE
+        tmp_path = path.with_suffix('.arrow.tmp')
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return path
+
+    def export_reviews(self, reviews_path: str) -> Dict:
+        """
+        Export reviews.json to a single dictionary-encoded Parquet file.
+
+        Args:
+            reviews_path: Path of reviews.json
+
+        Returns:
+            Statistics with rows and path
+        """
+        with open(reviews_path, 'r', encoding='utf-8') as f:
+            reviews = json.load(f).get('reviews', [])
+
+        table = pa.Table.from_pylist(reviews)
+        for name in REVIEW_DATE_COLUMNS:
+            if name in table.column_names:
+                dates = pa.array([parse_date(value) for value in table[name].to_pylist()], type=pa.date32())
+                table = table.set_column(table.column_names.index(name), name, dates)
+        for name in REVIEW_DICTIONARY_COLUMNS:
+            if name in table.column_names:
+                index = table.column_names.index(name)
+                table = table.set_column(index, name, table[name].dictionary_encode())
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / REVIEWS_FILE
+        pq.write_table(table, path, compression='zstd')
+        return {'rows': table.num_rows, 'path': str(path)}
+
+
+def load_chart_history(out_dir: str) -> 'pa.Table':
+    """
+    Memory-map the Arrow IPC snapshot of the chart history.
+
+    Args:
+        out_dir: Export root directory
+
+    Returns:
+        Arrow table backed by the mapped file (no copy)
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow not available. Install with: pip install pyarrow")
+    source = pa.memory_map(str(Path(out_dir) / CHART_IPC_FILE), 'r')
+    return pa.ipc.open_file(source).read_all()
+
+
+def main():
+    """Run an export from the command line."""
+    parser = argparse.ArgumentParser(description="Export chart and review data to Parquet/Arrow")
+    parser.add_argument('--db', default='billboard.db', help="SQLite database path")
+    parser.add_argument('--out', default='../data/columnar', help="Export directory")
+    parser.add_argument('--full', action='store_true', help="Re-export every week, not only new ones")
+    parser.add_argument('--reviews', help="Also export this reviews.json")
+    args = parser.parse_args()
+
+    print("🧱 Columnar Export")
+    print("=" * 40)
+
+    exporter = ColumnarExporter(args.out)
+    db = BillboardDatabase("sqlite", args.db)
+    try:
+        stats = exporter.export_charts(db, full=args.full)
+    finally:
+        db.close()
+    print(f"✅ {stats['weeks']} weeks ({stats['rows']:,} rows) exported in {stats['seconds']}s; "
+          f"last week {stats['last_chart_date']}")
+
+    if args.reviews:
+        review_stats = exporter.export_reviews(args.reviews)
+        print(f"✅ {review_stats['rows']} reviews → {review_stats['path']}")
+
+    start = time.perf_counter()
+    table = load_chart_history(args.out)
+    print(f"📈 Snapshot: {table.num_rows:,} rows mapped in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Crash-safe publishing of the data files the API servers read.
+
+Writers never modify a published file in place. atomic_write() writes the
+new contents to a temporary file in the same directory, fsyncs it, and
+renames it over the old file, then fsyncs the directory. On POSIX the
+rename is atomic. A reader that opens the path gets either the complete
+old file or the complete new one, never a partial write. A crash leaves
+the old file in place. A reader that already has the old file open keeps
+reading it unchanged.
+
+publish_json() also embeds a generation number as the first key of the
+document. It is the previous file's generation plus one, so readers can
+tell versions apart and notice if one is ever older than what they already
+serve. Only the start of the previous file is read to find its generation.
+"""
+
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+GENERATION_KEY = 'generation'
+# Generation is the first key, so it is always within the first bytes
+GENERATION_PATTERN = re.compile(rb'^\s*\{\s*"generation":\s*(\d+)')
+GENERATION_HEAD_BYTES = 256
+
+
+def fsync_directory(path: str):
+    """Persist renames in a directory (a no-op where directories can't be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(path, mode: str = 'w', encoding: Optional[str] = 'utf-8') -> Iterator:
+    """
+    Open a temporary file that replaces path when the with block succeeds.
+
+    If the block raises, the temporary file is removed and path is left
+    untouched.
+
+    Args:
+        path: File to publish
+        mode: 'w' for text or 'wb' for bytes
+        encoding: Text encoding (ignored for 'wb')
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates files readable by the owner only
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    fsync_directory(directory)
+
+
+def read_generation(path) -> int:
+    """
+    Generation of a published JSON file.
+
+    Returns:
+        The generation, or 0 if the file is missing or has none
+    """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(GENERATION_HEAD_BYTES)
+    except OSError:
+        return 0
+    match = GENERATION_PATTERN.match(head)
+    return int(match.group(1)) if match else 0
+
+
+def data_generation(data: Any) -> Optional[int]:
+    """Generation embedded in parsed JSON data, or None."""
+    return data.get(GENERATION_KEY) if isinstance(data, dict) else None
+
+
+def with_generation(data: Dict, generation: int) -> Dict:
+    """data with the generation as its first key."""
+    return {GENERATION_KEY: generation, **{key: value for key, value in data.items() if key != GENERATION_KEY}}
+
+
+def publish_json(path, data: Dict, generation: Optional[int] = None, **dump_kwargs) -> int:
+    """
+    Atomically replace a JSON file, embedding the next generation number.
+
+    Args:
+        path: File to publish
+        data: JSON object to write
+        generation: Generation to embed (default: the file's current
+            generation plus one)
+        **dump_kwargs: Passed to json.dump (e.g. indent=2, ensure_ascii=False)
+
+    Returns:
+        The published generation
+    """
+    if generation is None:
+        generation = read_generation(path) + 1
+    with atomic_write(path) as f:
+        json.dump(with_generation(data, generation), f, **dump_kwargs)
+    return generation
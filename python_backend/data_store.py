@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+In-memory cache of JSON data files for the local API servers.
+
+A JsonFileStore loads its file once and keeps the parsed data in memory for
+every request. Each access compares the file's (mtime, inode, size) with the
+last load, which costs one stat() call, and reloads only when the file has
+changed. Anything derived from the data (serialized responses, indexes,
+aggregates) is memoized per data version and dropped on reload.
+
+Writers publish files atomically (data_publish.py), so a reload always
+parses a complete file. The parsed data, its signature and generation, and
+its derived values form one immutable DataVersion. A reload swaps in the
+whole DataVersion with a single assignment, so requests never lock and
+never mix data from two versions.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from data_publish import data_generation
+
+logger = logging.getLogger(__name__)
+
+
+class DataVersion(NamedTuple):
+    """One loaded version of a file and everything derived from it."""
+    signature: tuple
+    data: Any
+    number: int
+    generation: Optional[int]
+    derived: Dict[str, Any]
+
+
+class JsonFileStore:
+    """Process-wide, hot-reloading cache of one JSON file."""
+    
+    def __init__(self, path):
+        """
+        Initialize the store. Nothing is read until the first get().
+        
+        Args:
+            path: Path of the JSON file
+        """
+        self.path = Path(path)
+        # Replaced whole on reload, so a reader holding it sees one
+        # consistent version without taking a lock
+        self._current = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'reloads': 0, 'reload_errors': 0}
+    
+    @staticmethod
+    def _signature(st: os.stat_result) -> tuple:
+        """(mtime, inode, size) of a stat result."""
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+    
+    @property
+    def version(self) -> int:
+        """Number of loads so far; 0 before the first get()."""
+        current = self._current
+        return current.number if current else 0
+    
+    def current(self) -> DataVersion:
+        """
+        Get the current version, reloading if the file changed on disk.
+        
+        Returns:
+            The loaded DataVersion
+        
+        Raises:
+            FileNotFoundError: If the file doesn't exist and was never loaded
+        """
+        signature = self._signature(os.stat(self.path))
+        current = self._current
+        if current is not None and signature == current.signature:
+            self._stats['hits'] += 1
+            return current
+        
+        # Only reloads serialize, so a new file is parsed once
+        with self._lock:
+            current = self._current
+            if current is not None and signature == current.signature:
+                self._stats['hits'] += 1
+                return current
+            
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    # Signature of the file actually read, which may already
+                    # be newer than the one stat() saw
+                    signature = self._signature(os.fstat(f.fileno()))
+                    data = json.load(f)
+            except ValueError as e:
+                # Half-written file (written in place rather than published
+                # with data_publish): keep serving the last good version and
+                # retry on the next request
+                self._stats['reload_errors'] += 1
+                if current is None:
+                    raise
+                logger.warning(f"Keeping previous {self.path.name}, reload failed: {e}")
+                return current
+            
+            current = DataVersion(signature, data, self.version + 1, data_generation(data), {})
+            self._current = current
+            self._stats['reloads'] += 1
+            logger.info(f"Loaded {self.path.name} (version {current.number}, generation {current.generation})")
+            return current
+    
+    def get(self) -> Any:
+        """
+        Get the parsed file contents, reloading if the file changed on disk.
+        
+        Returns:
+            Parsed JSON data
+        
+        Raises:
+            FileNotFoundError: If the file doesn't exist and was never loaded
+        """
+        return self.current().data
+    
+    def derived(self, name: str, builder: Callable[[Any], Any]) -> Any:
+        """
+        Get a value computed from the data, built at most once per version.
+        
+        Args:
+            name: Cache key for the derived value
+            builder: Function computing the value from the parsed data
+        
+        Returns:
+            The derived value for the current data version
+        """
+        current = self.current()
+        try:
+            return current.derived[name]
+        except KeyError:
+            # Two requests may race to build the same value; both results
+            # are for this version, so either can be kept
+            value = current.derived[name] = builder(current.data)
+            return value
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with hits, reloads, reload_errors, the current version
+            and the generation of the loaded file (None if it has none)
+        """
+        current = self._current
+        return dict(self._stats, version=self.version, generation=current.generation if current else None)
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Append-only archive of every chart week, indexed by chart date.
+
+data/historical/ keeps one folder per week with JSON, CSV and export copies,
+so any cross-week question walks the tree and parses every file. The archive
+keeps every week as a chart_snapshot record in one data file, plus a small
+binary index:
+
+    chart_history.bba      records: "BBRC", chart date, length, snapshot bytes
+                           (8-byte aligned, appended in write order)
+    chart_history.bba.idx  "BBHI", version, committed data size, week count,
+                           then (chart date, offset, length) per week by date
+
+Opening an archive loads the index into a dict and memory-maps the data
+file. Looking up a week is a dict lookup plus a ChartSnapshot over a slice of
+the map, and range scans bisect the sorted dates.
+
+Appends are crash-safe. Records are appended after the committed size and
+fsynced. Then a new index is written to a temporary file, fsynced and
+renamed over the old one. The rename is the commit point: a crash before it
+leaves an uncommitted tail that readers never see and the next append
+truncates. A lost index is rebuilt from the data file before the next
+append, so the append never truncates committed weeks. Appending a date that is already archived points the index at
+the new record; the old record stays in the data file unreferenced. There
+is one writer at a time (the weekly scrape); readers pick up new weeks with
+refresh().
+
+Usage:
+    python history_archive.py [--archive ../data/chart_history.bba] import [--historical ../data/historical]
+    python history_archive.py [--archive ../data/chart_history.bba] show 2025-08-30
+    python history_archive.py [--archive ../data/chart_history.bba] rebuild-index
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from chart_snapshot import ChartSnapshot, encode_week
+from data_publish import atomic_write
+
+DEFAULT_ARCHIVE = '../data/chart_history.bba'
+INDEX_SUFFIX = '.idx'
+VERSION = 1
+
+RECORD_MAGIC = b'BBRC'
+RECORD = struct.Struct('<4s10s2xQ')      # magic, chart date, snapshot length
+INDEX_MAGIC = b'BBHI'
+INDEX_HEADER = struct.Struct('<4sH2xQI')  # magic, version, committed data size, weeks
+INDEX_ENTRY = struct.Struct('<10sQQ')     # chart date, snapshot offset, snapshot length
+ALIGNMENT = 8
+
+
+def week_date(chart_date: str) -> str:
+    """
+    YYYY-MM-DD form of a chart date.
+
+    Args:
+        chart_date: "2025-08-30" or "Week of August 30, 2025"
+
+    Raises:
+        ValueError: If the date is in neither format
+    """
+    for date_format in ('%Y-%m-%d', 'Week of %B %d, %Y'):
+        try:
+            return datetime.strptime(str(chart_date).strip(), date_format).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized chart date: {chart_date!r}")
+
+
+class HistoryArchive:
+    """Chart weeks in one append-only data file, looked up through a date index."""
+
+    def __init__(self, path: str = DEFAULT_ARCHIVE):
+        """
+        Open an archive; it is created by the first append.
+
+        Args:
+            path: Data file path; the index is path + '.idx'
+        """
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self._mmap = None
+        self._view = None
+        self.refresh()
+
+    def _read_index(self) -> Tuple[int, Dict[str, Tuple[int, int]]]:
+        """
+        Committed data size and chart date -> (offset, length) from the index file.
+
+        Raises:
+            ValueError: If the index is truncated or not a version VERSION index
+        """
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return 0, {}
+        if len(data) < INDEX_HEADER.size:
+            raise ValueError(f"Truncated history archive index: {self.index_path} "
+                             f"(run rebuild-index to recreate it)")
+        magic, version, committed_size, weeks = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} history archive index: {self.index_path}")
+        if len(data) < INDEX_HEADER.size + weeks * INDEX_ENTRY.size:
+            raise ValueError(f"Truncated history archive index: {self.index_path} lists {weeks} weeks "
+                             f"but holds {(len(data) - INDEX_HEADER.size) // INDEX_ENTRY.size} "
+                             f"(run rebuild-index to recreate it)")
+        entries = data[INDEX_HEADER.size:INDEX_HEADER.size + weeks * INDEX_ENTRY.size]
+        index = {date.decode(): (offset, length) for date, offset, length in INDEX_ENTRY.iter_unpack(entries)}
+        return committed_size, index
+
+    def refresh(self):
+        """Reload the index and remap the data file, picking up weeks appended since opening."""
+        self._unmap()
+        self.committed_size, self._index = self._read_index()
+        self.dates = sorted(self._index)
+        if self.committed_size:
+            with open(self.path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), self.committed_size, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __contains__(self, chart_date: str) -> bool:
+        return week_date(chart_date) in self._index
+
+    def week(self, chart_date: str) -> ChartSnapshot:
+        """
+        Read one week.
+
+        Args:
+            chart_date: Chart date in either week_date() format
+
+        Returns:
+            Snapshot backed by the archive's memory map (valid until close()
+            or refresh())
+
+        Raises:
+            KeyError: If the week is not archived
+        """
+        offset, length = self._index[week_date(chart_date)]
+        return ChartSnapshot(self._view[offset:offset + length])
+
+    def range(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Iterator[ChartSnapshot]:
+        """
+        Scan the weeks between two chart dates (inclusive), oldest first.
+
+        Each snapshot is closed when the next one is read.
+        """
+        first = 0 if start_date is None else bisect_left(self.dates, week_date(start_date))
+        last = len(self.dates) if end_date is None else bisect_right(self.dates, week_date(end_date))
+        for chart_date in self.dates[first:last]:
+            with self.week(chart_date) as snapshot:
+                yield snapshot
+
+    def append(self, week: Dict) -> str:
+        """
+        Append one week (as saved by run_scraper.py) and commit it.
+
+        Returns:
+            The week's YYYY-MM-DD chart date
+
+        Raises:
+            ValueError: If the chart date or week can't be archived; nothing
+                is committed
+        """
+        return self.append_many([week])[0]
+
+    def append_many(self, weeks: Iterable[Dict]) -> List[str]:
+        """Append several weeks and commit them together; see append()."""
+        return self._append_records((week_date(week['chart_date']), encode_week(week)) for week in weeks)
+
+    def _append_records(self, records: Iterable[Tuple[str, bytes]]) -> List[str]:
+        """
+        Append encoded snapshots and commit them with a new index.
+
+        Raises:
+            ValueError: If the data file is shorter than the index says; the
+                index belongs to another data file, or the data file was cut
+        """
+        data_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if data_size and not os.path.exists(self.index_path):
+            # A lost index would otherwise commit nothing and truncate every
+            # archived week away; recover the weeks from the data file first
+            self.rebuild_index()
+        committed_size, index = self._read_index()
+        if committed_size > data_size:
+            raise ValueError(f"History archive data file {self.path} holds {data_size:,} bytes "
+                             f"but its index commits {committed_size:,} (run rebuild-index to recreate it)")
+        appended = []
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, 'r+b') as f:
+            # Drop whatever an interrupted append left past the committed size
+            f.truncate(committed_size)
+            f.seek(committed_size)
+            offset = committed_size
+            for chart_date, snapshot in records:
+                record = RECORD.pack(RECORD_MAGIC, chart_date.encode(), len(snapshot)) + snapshot
+                record += b'\0' * (-len(record) % ALIGNMENT)
+                f.write(record)
+                index[chart_date] = (offset + RECORD.size, len(snapshot))
+                offset += len(record)
+                appended.append(chart_date)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if appended:
+            self._write_index(offset, index)
+        self.refresh()
+        return appended
+
+    def _write_index(self, committed_size: int, index: Dict[str, Tuple[int, int]]):
+        """Atomically replace the index file, committing the data file up to committed_size."""
+        data = INDEX_HEADER.pack(INDEX_MAGIC, VERSION, committed_size, len(index)) + b''.join(
+            INDEX_ENTRY.pack(chart_date.encode(), *index[chart_date]) for chart_date in sorted(index)
+        )
+        with atomic_write(self.index_path, 'wb') as f:
+            f.write(data)
+
+    def rebuild_index(self) -> int:
+        """
+        Recreate a lost or damaged index by scanning the data file's records.
+
+        Scanning stops at the first incomplete or unrecognized record; the
+        latest record of each date wins.
+
+        Returns:
+            Number of weeks indexed
+        """
+        index = {}
+        offset = 0
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        while offset + RECORD.size <= len(data):
+            magic, chart_date, length = RECORD.unpack_from(data, offset)
+            start = offset + RECORD.size
+            if magic != RECORD_MAGIC or start + length > len(data):
+                break
+            try:
+                ChartSnapshot(data[start:start + length])
+            except (ValueError, struct.error):
+                break
+            index[chart_date.decode()] = (start, length)
+            offset = start + length + (-(RECORD.size + length) % ALIGNMENT)
+        self._write_index(min(offset, len(data)), index)
+        self.refresh()
+        return len(index)
+
+    def _unmap(self):
+        """Release the memory map of the data file."""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Snapshots returned by week() are still open; the map is
+                # released when they go away
+                pass
+            self._mmap = None
+
+    def close(self):
+        """Unmap the data file."""
+        self._unmap()
+
+    def __enter__(self) -> 'HistoryArchive':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def import_historical(archive: HistoryArchive, historical_dir: str, overwrite: bool = False) -> Dict:
+    """
+    Ingest every billboard_<date>.json of a data/historical tree into an archive.
+
+    Weeks are keyed by the chart_date inside each file (the folder name if it
+    has none). When several folders hold the same chart week, the latest
+    folder wins. CSV files and exports/ are copies of the same weeks and
+    are not read.
+
+    Args:
+        archive: Archive to append to
+        historical_dir: Directory of YYYY-MM-DD week folders
+        overwrite: Re-import weeks the archive already has
+
+    Returns:
+        Statistics with imported (dates), existing (dates skipped) and
+        skipped (path -> reason)
+    """
+    records = {}
+    skipped = {}
+    for path in sorted(Path(historical_dir).glob('*/billboard_*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                week = json.load(f)
+            chart_date = week_date(week.get('chart_date') or path.parent.name)
+            records[chart_date] = encode_week(week)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            skipped[str(path)] = str(e)
+
+    existing = [chart_date for chart_date in records if chart_date in archive and not overwrite]
+    new_records = [(chart_date, records[chart_date]) for chart_date in sorted(records) if chart_date not in existing]
+    imported = archive._append_records(new_records)
+    return {'imported': imported, 'existing': existing, 'skipped': skipped}
+
+
+def main():
+    """Import, inspect or repair a history archive."""
+    parser = argparse.ArgumentParser(description="Consolidated chart history archive")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE, help="Archive data file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_cmd = subparsers.add_parser('import', help="Ingest a data/historical folder tree")
+    import_cmd.add_argument('--historical', default='../data/historical')
+    import_cmd.add_argument('--overwrite', action='store_true', help="Re-import weeks already archived")
+    show_cmd = subparsers.add_parser('show', help="Print one archived week")
+    show_cmd.add_argument('chart_date')
+    show_cmd.add_argument('--top', type=int, default=10)
+    subparsers.add_parser('rebuild-index', help="Recreate the index from the data file")
+    args = parser.parse_args()
+
+    print("🗃️  Chart History Archive")
+    print("=" * 40)
+
+    try:
+        archive = HistoryArchive(args.archive)
+    except ValueError as e:
+        if args.command != 'rebuild-index':
+            print(f"❌ {e}")
+            return 1
+        # The damaged index is about to be replaced; open the archive without it
+        os.remove(args.archive + INDEX_SUFFIX)
+        archive = HistoryArchive(args.archive)
+
+    with archive:
+        if args.command == 'import':
+            stats = import_historical(archive, args.historical, overwrite=args.overwrite)
+            for path, reason in stats['skipped'].items():
+                print(f"⚠️  Skipped {path}: {reason}")
+            print(f"✅ Imported {len(stats['imported'])} weeks, {len(stats['existing'])} already archived")
+        elif args.command == 'rebuild-index':
+            print(f"✅ Indexed {archive.rebuild_index()} weeks")
+        else:
+            try:
+                snapshot = archive.week(args.chart_date)
+            except KeyError:
+                print(f"❌ {args.chart_date} is not archived")
+                return 1
+            with snapshot:
+                for entry in snapshot.entries()[:args.top]:
+                    print(f"   {entry['rank']:3d}. {entry['title']} - {entry['artist']}")
+
+        size = archive.committed_size
+        span = f", {archive.dates[0]} to {archive.dates[-1]}" if archive.dates else ""
+        print(f"📚 {len(archive)} weeks, {size:,} bytes{span}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
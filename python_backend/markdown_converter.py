@@ -7,171 +7,441 @@ Converts songs.md to structured JSON format for Python backend and Netlify Funct
 import re
 import json
 import os
+import time
+import hashlib
+import argparse
+import multiprocessing
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from data_publish import atomic_write, publish_json, read_generation
+
+# Bump whenever parse_song_review output changes, so incremental manifests
+# written by an older parser are discarded instead of reused
+PARSER_VERSION = 1
+
+# Process pool tuning for --workers: inputs smaller than PARALLEL_MIN_SECTIONS
+# are parsed serially, streams are dispatched PARALLEL_BATCH_SECTIONS at a time,
+# and PARALLEL_SAMPLE_SECTIONS are timed serially to decide whether the pool
+# pays off. Measured costs: handing a section to a worker and its review back
+# takes about 5us (budgeted at 10us). Starting a pool takes ~15ms with fork
+# (budgeted at 50ms for worker warm-up) and ~150ms with spawn/forkserver,
+# which re-import this module in every worker. At ~25us per section, 3000
+# sections took 0.15s on 4 workers against 0.07s serially; with these costs
+# the pool is only used from roughly 7000 sections on 4 cores
+PARALLEL_MIN_SECTIONS = 2000
+PARALLEL_BATCH_SECTIONS = 20000
+PARALLEL_SAMPLE_SECTIONS = 200
+PARALLEL_SECTION_OVERHEAD = 10e-6
+PARALLEL_STARTUP_SECONDS = {'fork': 0.05, 'forkserver': 0.15, 'spawn': 0.15}
+
+# Review header: ## Artist - "Title"
+HEADER_PATTERN = re.compile(r'## (.+?) - "(.+?)"')
+
+# One sweep over a section finds every **key:** value pair. The value is read
+# with a lookahead so a pair embedded in another pair's value is still found.
+FIELD_PATTERN = re.compile(r'\*\*([^*\n]+?):\*\* (?=(.+))')
+
+ISO_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+LONG_DATE_PATTERN = re.compile(r'\w+ \d{1,2}, \d{4}')
+YEAR_PATTERN = re.compile(r'\d{4}')
+
+# Your 0-4 rating scale
+SCORE_VALUES = {
+    "0/4": 0.0, "0.5/4": 0.5,
+    "1/4": 1.0, "1.5/4": 1.5,
+    "2/4": 2.0, "2.5/4": 2.5,
+    "3/4": 3.0, "3.5/4": 3.5,
+    "4/4": 4.0,
+}
+
+def tokenize_fields(markdown_text):
+    """
+    Read every **key:** value pair of a section in a single pass
+    Returns a dict of key -> raw value; the first occurrence of a key wins
+    """
+    fields = {}
+    for match in FIELD_PATTERN.finditer(markdown_text):
+        fields.setdefault(match.group(1), match.group(2))
+    return fields
+
+def duration_to_seconds(duration_str):
+    """
+    Convert duration from MM:SS (or H:MM:SS) to seconds
+    """
+    if not duration_str or duration_str == "N/A":
+        return None
+    try:
+        if ':' in duration_str:
+            parts = duration_str.split(':')
+            if len(parts) == 2:
+                minutes, seconds = int(parts[0]), int(parts[1])
+                return minutes * 60 + seconds
+            elif len(parts) == 3:
+                hours, minutes, seconds = int(parts[0]), int(parts[1]), int(parts[2])
+                return hours * 3600 + minutes * 60 + seconds
+        return None
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=4096)
+def date_to_iso(date_str):
+    """
+    Convert date to YYYY-MM-DD format (cached: strptime is the slowest step
+    of parsing a review and the same dates recur across reviews)
+    """
+    if not date_str or date_str == "N/A":
+        return None
+    try:
+        # Handle various date formats
+        if ISO_DATE_PATTERN.match(date_str):
+            return date_str  # Already in ISO format
+        elif LONG_DATE_PATTERN.match(date_str):
+            # Convert "August 20, 2025" to "2025-08-20"
+            return datetime.strptime(date_str, "%B %d, %Y").strftime("%Y-%m-%d")
+        elif YEAR_PATTERN.match(date_str):
+            # Just year, return as is
+            return date_str
+        return date_str
+    except ValueError:
+        return date_str
+
+def score_to_decimal(score_str):
+    """
+    Convert review score to decimal
+    """
+    if not score_str:
+        return None
+    if score_str in SCORE_VALUES:
+        return SCORE_VALUES[score_str]
+    try:
+        # Try to parse as a simple number
+        return float(score_str)
+    except ValueError:
+        return score_str
+
 def parse_song_review(markdown_text):
     """
     Parse a single song review from markdown format
     Returns a dictionary with structured data
     """
     # Extract song title and artist from the header
-    header_match = re.match(r'## (.+?) - "(.+?)"', markdown_text.strip())
+    header_match = HEADER_PATTERN.match(markdown_text.strip())
     if not header_match:
         return None
     
     artist = header_match.group(1).strip()
     song_title = header_match.group(2).strip()
     
-    # Extract all the new metadata fields using regex patterns
-    song_artist_match = re.search(r'\*\*song_artist:\*\* (.+)', markdown_text)
-    song_title_match = re.search(r'\*\*song_title:\*\* (.+)', markdown_text)
-    song_release_date_match = re.search(r'\*\*song_release_date:\*\* (.+)', markdown_text)
-    song_upload_date_match = re.search(r'\*\*song_upload_date:\*\* (.+)', markdown_text)
-    song_duration_sec_match = re.search(r'\*\*song_duration_sec:\*\* (.+)', markdown_text)
-    song_album_match = re.search(r'\*\*song_album:\*\* (.+)', markdown_text)
-    song_label_match = re.search(r'\*\*song_label:\*\* (.+)', markdown_text)
-    song_genre_match = re.search(r'\*\*song_genre:\*\* (.+)', markdown_text)
-    song_mood_match = re.search(r'\*\*song_mood:\*\* (.+)', markdown_text)
-    song_instrumentation_match = re.search(r'\*\*song_instrumentation:\*\* (.+)', markdown_text)
-    song_language_match = re.search(r'\*\*song_language:\*\* (.+)', markdown_text)
-    song_audio_url_match = re.search(r'\*\*song_audio_url:\*\* (.+)', markdown_text)
+    fields = tokenize_fields(markdown_text)
     
-    # Extract review metadata fields
-    review_date_match = re.search(r'\*\*review_date:\*\* (.+)', markdown_text)
-    review_score_match = re.search(r'\*\*review_score:\*\* (.+)', markdown_text)
-    review_text_match = re.search(r'\*\*review_text:\*\* (.+)', markdown_text)
+    # Helper function to safely extract field values, trying old format
+    # field names when the new one isn't found
+    def field(*names, default=""):
+        for name in names:
+            if name in fields:
+                return fields[name].strip()
+        return default
     
-    # Fallback to old format fields if new ones aren't found
-    if not song_artist_match:
-        song_artist_match = re.search(r'\*\*Date:\*\* (.+)', markdown_text)
-    if not review_score_match:
-        review_score_match = re.search(r'\*\*Rating:\*\* (.+)', markdown_text)
-    if not review_text_match:
-        review_text_match = re.search(r'\*\*Description:\*\* (.+)', markdown_text)
-    if not song_audio_url_match:
-        song_audio_url_match = re.search(r'\*\*Listen:\*\* (.+)', markdown_text)
+    release_date = field("song_release_date")
+    upload_date = field("song_upload_date")
+    review_date = field("review_date")
     
-    # Helper function to safely extract field values
-    def safe_extract(match, default=""):
-        return match.group(1).strip() if match else default
-    
-    # Convert duration from MM:SS to seconds
-    def duration_to_seconds(duration_str):
-        if not duration_str or duration_str == "N/A":
-            return None
-        try:
-            if ':' in duration_str:
-                parts = duration_str.split(':')
-                if len(parts) == 2:
-                    minutes, seconds = int(parts[0]), int(parts[1])
-                    return minutes * 60 + seconds
-                elif len(parts) == 3:
-                    hours, minutes, seconds = int(parts[0]), int(parts[1]), int(parts[2])
-                    return hours * 3600 + minutes * 60 + seconds
-            return None
-        except:
-            return None
-    
-    # Convert date to YYYY-MM-DD format
-    def date_to_iso(date_str):
-        if not date_str or date_str == "N/A":
-            return None
-        try:
-            # Handle various date formats
-            if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
-                return date_str  # Already in ISO format
-            elif re.match(r'\w+ \d{1,2}, \d{4}', date_str):
-                # Convert "August 20, 2025" to "2025-08-20"
-                from datetime import datetime
-                return datetime.strptime(date_str, "%B %d, %Y").strftime("%Y-%m-%d")
-            elif re.match(r'\d{4}', date_str):
-                # Just year, return as is
-                return date_str
-            return date_str
-        except:
-            return date_str
-    
-    # Convert review score to decimal
-    def score_to_decimal(score_str):
-        if not score_str:
-            return None
-        try:
-            # Handle your 0-4 rating scale
-            if score_str == "0/4":
-                return 0.0
-            elif score_str == "0.5/4":
-                return 0.5
-            elif score_str == "1/4":
-                return 1.0
-            elif score_str == "1.5/4":
-                return 1.5
-            elif score_str == "2/4":
-                return 2.0
-            elif score_str == "2.5/4":
-                return 2.5
-            elif score_str == "3/4":
-                return 3.0
-            elif score_str == "3.5/4":
-                return 3.5
-            elif score_str == "4/4":
-                return 4.0
-            else:
-                # Try to parse as a simple number
-                return float(score_str)
-        except:
-            return score_str
+    # Slugs for the generated review_id (built outside the f-string so the
+    # quote stripping works on Python < 3.12)
+    artist_slug = artist.lower().replace(' ', '-')
+    title_slug = song_title.lower().replace(' ', '-').replace('"', '').replace(',', '')
     
     # Create the comprehensive review object with all metadata fields
     review = {
         # Song metadata
-        "song_artist": safe_extract(song_artist_match, artist),
-        "song_title": safe_extract(song_title_match, song_title),
-        "song_release_date": date_to_iso(safe_extract(song_release_date_match)),
-        "song_release_date_display": safe_extract(song_release_date_match),  # Original format for frontend
-        "song_upload_date": date_to_iso(safe_extract(song_upload_date_match)),
-        "song_upload_date_display": safe_extract(song_upload_date_match),  # Original format for frontend
-        "song_duration_sec": duration_to_seconds(safe_extract(song_duration_sec_match)),
-        "song_album": safe_extract(song_album_match),
-        "song_label": safe_extract(song_label_match),
-        "song_genre": safe_extract(song_genre_match),
-        "song_mood": safe_extract(song_mood_match),
-        "song_instrumentation": safe_extract(song_instrumentation_match),
-        "song_language": safe_extract(song_language_match),
-        "song_audio_url": safe_extract(song_audio_url_match),
+        "song_artist": field("song_artist", "Date", default=artist),
+        "song_title": field("song_title", default=song_title),
+        "song_release_date": date_to_iso(release_date),
+        "song_release_date_display": release_date,  # Original format for frontend
+        "song_upload_date": date_to_iso(upload_date),
+        "song_upload_date_display": upload_date,  # Original format for frontend
+        "song_duration_sec": duration_to_seconds(field("song_duration_sec")),
+        "song_album": field("song_album"),
+        "song_label": field("song_label"),
+        "song_genre": field("song_genre"),
+        "song_mood": field("song_mood"),
+        "song_instrumentation": field("song_instrumentation"),
+        "song_language": field("song_language"),
+        "song_audio_url": field("song_audio_url", "Listen"),
         
         # Review metadata
-        "review_date": date_to_iso(safe_extract(review_date_match)),
-        "review_date_display": safe_extract(review_date_match),  # Original format for frontend
-        "review_score": score_to_decimal(safe_extract(review_score_match)),
-        "review_text": safe_extract(review_text_match),
+        "review_date": date_to_iso(review_date),
+        "review_date_display": review_date,  # Original format for frontend
+        "review_score": score_to_decimal(field("review_score", "Rating")),
+        "review_text": field("review_text", "Description"),
         
         # Generated fields
-        "review_id": f"{artist.lower().replace(' ', '-')}-{song_title.lower().replace(' ', '-').replace('"', '').replace(',', '')}-song-review"
+        "review_id": f"{artist_slug}-{title_slug}-song-review"
     }
     
     return review
 
-def convert_songs_md_to_json(md_file_path, output_file_path):
+def section_hash(section):
+    """
+    Hash a review section for the incremental manifest
+    """
+    return hashlib.sha1(section.encode('utf-8')).hexdigest()
+
+def load_manifest(manifest_path):
+    """
+    Load the section hash -> parsed review manifest, or an empty one if it is
+    missing, unreadable or was written by a different parser version
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("parser_version") == PARSER_VERSION:
+            return manifest.get("sections", {})
+    except (OSError, ValueError):
+        pass
+    return {}
+
+def save_manifest(manifest_path, sections):
+    """
+    Write the section hash -> parsed review manifest
+    """
+    with atomic_write(manifest_path) as f:
+        json.dump({"parser_version": PARSER_VERSION, "sections": sections}, f, ensure_ascii=False)
+
+def default_manifest_path(output_file_path):
+    """
+    Sidecar manifest path next to the JSON output (reviews.json -> reviews.manifest.json)
+    """
+    output_file_path = Path(output_file_path)
+    return output_file_path.with_name(f"{output_file_path.stem}.manifest.json")
+
+def iter_review_sections(md_file_path):
+    """
+    Read a markdown file line by line and yield one "## ..." review section
+    at a time, so only the current section is ever held in memory
+    
+    Sections are split on every '## ' exactly like content.split('## '), and
+    each yielded section is stripped with its "## " prefix restored
+    """
+    current = None  # Text before the first '## ' isn't a section
+    
+    with open(md_file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            pieces = line.split('## ')
+            if current is not None:
+                current.append(pieces[0])
+            for piece in pieces[1:]:
+                if current is not None:
+                    section = ''.join(current).strip()
+                    if section:
+                        yield f"## {section}"
+                current = [piece]
+    
+    if current is not None:
+        section = ''.join(current).strip()
+        if section:
+            yield f"## {section}"
+
+def write_reviews_json(f, metadata, reviews, generation=None):
+    """
+    Stream a {"metadata": ..., "reviews": [...]} document to an open file one
+    review at a time, byte-identical to json.dump(..., indent=2, ensure_ascii=False)
+    
+    With a generation, it is written as the first key, as publish_json does
+    
+    Returns the number of reviews written
+    """
+    metadata_json = json.dumps(metadata, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+    f.write('{\n' if generation is None else f'{{\n  "generation": {generation},\n')
+    f.write(f'  "metadata": {metadata_json},\n  "reviews": [')
+    
+    count = 0
+    for review in reviews:
+        review_json = json.dumps(review, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+        f.write(f'{"," if count else ""}\n    {review_json}')
+        count += 1
+    
+    f.write('\n  ]\n}' if count else ']\n}')
+    return count
+
+def parse_sections(sections, workers=1, stats=None):
+    """
+    Parse review sections, yielding results (None for non-reviews) in input order
+    
+    With workers > 1, sections are fanned out over a process pool in batches
+    of PARALLEL_BATCH_SECTIONS, so a streamed input is never fully held in
+    memory. A leading sample is parsed serially and timed; the pool is only
+    started if, at that speed, the first batch would finish sooner in it
+    after paying for its startup and per-section transfer costs. Inputs
+    smaller than PARALLEL_MIN_SECTIONS are always parsed serially
+    
+    stats, if given, is filled with sections, workers, seconds and
+    serial_estimate (plus parallel_estimate when the pool was skipped) for
+    print_parse_report()
+    """
+    stats = stats if stats is not None else {}
+    sections = iter(sections)
+    start_time = time.perf_counter()
+    
+    batch = list(islice(sections, PARALLEL_BATCH_SECTIONS))
+    total = 0
+    pool_workers = min(workers, os.cpu_count() or 1)
+    
+    if pool_workers > 1 and len(batch) >= PARALLEL_MIN_SECTIONS:
+        # Time a serial sample (its results are used, not thrown away)
+        sample_size = min(PARALLEL_SAMPLE_SECTIONS, len(batch))
+        sample_start = time.perf_counter()
+        sample = [parse_song_review(section) for section in batch[:sample_size]]
+        per_section = (time.perf_counter() - sample_start) / sample_size
+        yield from sample
+        batch = batch[sample_size:]
+        total = sample_size
+        
+        serial_estimate = per_section * len(batch)
+        startup = PARALLEL_STARTUP_SECONDS.get(multiprocessing.get_start_method(), 0.15)
+        parallel_estimate = startup + len(batch) * (per_section / pool_workers + PARALLEL_SECTION_OVERHEAD)
+        
+        if parallel_estimate < serial_estimate:
+            stats['workers'] = pool_workers
+            with ProcessPoolExecutor(max_workers=pool_workers) as executor:
+                while batch:
+                    total += len(batch)
+                    chunksize = max(1, len(batch) // (pool_workers * 4))
+                    yield from executor.map(parse_song_review, batch, chunksize=chunksize)
+                    batch = list(islice(sections, PARALLEL_BATCH_SECTIONS))
+            
+            stats['sections'] = total
+            stats['seconds'] = time.perf_counter() - start_time
+            stats['serial_estimate'] = per_section * total
+            return
+        
+        stats['serial_estimate'] = serial_estimate
+        stats['parallel_estimate'] = parallel_estimate
+    
+    stats['workers'] = 1
+    while batch:
+        total += len(batch)
+        yield from map(parse_song_review, batch)
+        batch = list(islice(sections, PARALLEL_BATCH_SECTIONS))
+    stats['sections'] = total
+    stats['seconds'] = time.perf_counter() - start_time
+
+def print_parse_report(stats):
+    """
+    Print how long section parsing took and, for parallel runs, the speedup
+    over the estimated serial runtime
+    """
+    if not stats.get('sections'):
+        return
+    if stats['workers'] > 1:
+        speedup = stats['serial_estimate'] / stats['seconds'] if stats['seconds'] else 0
+        print(f"⚙️  Parsed {stats['sections']} sections with {stats['workers']} workers in "
+              f"{stats['seconds']:.2f}s (serial estimate {stats['serial_estimate']:.2f}s, "
+              f"speedup {speedup:.1f}x)")
+    elif 'parallel_estimate' in stats:
+        print(f"⚙️  Parsed {stats['sections']} sections serially in {stats['seconds']:.2f}s "
+              f"(process pool skipped: estimated {stats['parallel_estimate']:.2f}s vs "
+              f"{stats['serial_estimate']:.2f}s serial)")
+    else:
+        print(f"⚙️  Parsed {stats['sections']} sections serially in {stats['seconds']:.2f}s")
+
+def stream_songs_md_to_json(md_file_path, output_file_path, ndjson=False, workers=1):
+    """
+    Convert an arbitrarily large markdown file with flat memory use
+    
+    Sections are read, parsed and written one at a time (or one batch at a
+    time with workers > 1). JSON output makes a cheap first pass to count
+    reviews for the metadata block, so the document has the same layout as
+    convert_songs_md_to_json; NDJSON output writes one compact review per
+    line with no metadata
+    
+    Returns the number of reviews written, or None on error
+    """
+    try:
+        start_time = time.perf_counter()
+        parse_stats = {}
+        reviews = (
+            review for review in parse_sections(iter_review_sections(md_file_path), workers, parse_stats)
+            if review
+        )
+        
+        # Published atomically: readers keep the previous file until the new
+        # one is complete
+        generation = read_generation(output_file_path) + 1
+        with atomic_write(output_file_path) as f:
+            if ndjson:
+                count = 0
+                for review in reviews:
+                    f.write(json.dumps(review, ensure_ascii=False))
+                    f.write('\n')
+                    count += 1
+            else:
+                total_reviews = sum(
+                    1 for section in iter_review_sections(md_file_path) if HEADER_PATTERN.match(section)
+                )
+                metadata = {
+                    "conversion_date": datetime.now().isoformat(),
+                    "source_file": str(md_file_path),
+                    "total_reviews": total_reviews
+                }
+                count = write_reviews_json(f, metadata, reviews, generation)
+        
+        elapsed = time.perf_counter() - start_time
+        print_parse_report(parse_stats)
+        print(f"✅ Streamed {count} reviews to {'NDJSON' if ndjson else 'JSON'} in {elapsed:.2f}s")
+        print(f"📁 Output saved to: {output_file_path}")
+        return count
+        
+    except Exception as e:
+        print(f"❌ Error converting markdown to JSON: {e}")
+        return None
+
+def convert_songs_md_to_json(md_file_path, output_file_path, incremental=False, manifest_path=None,
+                             workers=1):
     """
     Convert songs.md file to JSON format for Python backend
+    
+    With incremental=True, sections whose hash is already in the sidecar
+    manifest reuse their stored review instead of being parsed again.
+    With workers > 1, the sections that do need parsing go to a process pool
     """
     try:
-        # Read the markdown file
-        with open(md_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        if incremental:
+            manifest_path = manifest_path or default_manifest_path(output_file_path)
+            manifest = load_manifest(manifest_path)
+            new_manifest = {}
         
         # Split content into individual reviews (separated by ## headers)
         reviews = []
-        sections = content.split('## ')[1:]  # Skip the first empty section
+        skipped = parsed = 0
+        start_time = time.perf_counter()
+        
+        sections = list(iter_review_sections(md_file_path))
+        keys = [section_hash(section) for section in sections] if incremental else [None] * len(sections)
+        pending = [section for section, key in zip(sections, keys) if not incremental or key not in manifest]
+        
+        parse_stats = {}
+        parsed_reviews = iter(list(parse_sections(pending, workers, parse_stats)))
+        
+        for section, key in zip(sections, keys):
+            if incremental and key in manifest:
+                review = manifest[key]
+                skipped += 1
+            else:
+                review = next(parsed_reviews)
+                parsed += 1
+            
+            if incremental:
+                new_manifest[key] = review
+            
+            if review:
+                reviews.append(review)
         
-        for section in sections:
-            if section.strip():
-                # Add back the ## for parsing
-                section_with_header = f"## {section.strip()}"
-                review = parse_song_review(section_with_header)
-                if review:
-                    reviews.append(review)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
         
         # Create the final JSON structure
         output_data = {
@@ -183,12 +453,18 @@ def convert_songs_md_to_json(md_file_path, output_file_path):
             "reviews": reviews
         }
         
-        # Write to JSON file
-        with open(output_file_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        # Write to JSON file, atomically and with the next generation number
+        generation = publish_json(output_file_path, output_data, indent=2, ensure_ascii=False)
+        
+        if workers > 1:
+            print_parse_report(parse_stats)
+        
+        if incremental:
+            save_manifest(manifest_path, new_manifest)
+            print(f"⚡ Incremental: {skipped} sections unchanged (skipped), {parsed} parsed in {elapsed_ms:.1f} ms")
         
         print(f"✅ Successfully converted {len(reviews)} reviews to JSON")
-        print(f"📁 Output saved to: {output_file_path}")
+        print(f"📁 Output saved to: {output_file_path} (generation {generation})")
         
         # Print a sample review for verification
         if reviews:
@@ -268,7 +544,7 @@ def update_netlify_function(reviews, function_file_path):
                 )
         
         # Write the updated function
-        with open(function_file_path, 'w', encoding='utf-8') as f:
+        with atomic_write(function_file_path) as f:
             f.write(new_function_content)
         
         print(f"✅ Successfully updated Netlify Function: {function_file_path}")
@@ -282,12 +558,33 @@ def main():
     """
     Main function to run the conversion
     """
+    parser = argparse.ArgumentParser(description="Convert content/songs.md to reviews.json")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only re-parse review sections that changed since the last run")
+    parser.add_argument('--stream', action='store_true',
+                        help="Constant-memory conversion for large archives (skips the Netlify Function update)")
+    parser.add_argument('--ndjson', action='store_true',
+                        help="With --stream, write one review per line instead of a JSON document")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Parse sections on N processes (small inputs stay serial)")
+    parser.add_argument('--input', help="Markdown file to convert (default: content/songs.md)")
+    parser.add_argument('--output', help="Output file (default: netlify_functions/reviews.json)")
+    args = parser.parse_args()
+    
     # Get the project root directory (two levels up from python_backend/)
     project_root = Path(__file__).parent.parent
-    md_file = project_root / "content" / "songs.md"
-    output_file = project_root / "netlify_functions" / "reviews.json"
+    md_file = Path(args.input) if args.input else project_root / "content" / "songs.md"
+    output_file = Path(args.output) if args.output else project_root / "netlify_functions" / "reviews.json"
     netlify_function_file = project_root / "netlify_functions" / "reviews.js"
     
+    if args.stream:
+        if not md_file.exists():
+            print(f"❌ Input file not found: {md_file}")
+            return
+        print(f"🌊 Streaming {md_file} -> {output_file}")
+        stream_songs_md_to_json(md_file, output_file, ndjson=args.ndjson, workers=args.workers)
+        return
+    
     print("🎵 OPE! Markdown to JSON Converter")
     print("=" * 40)
     print(f"📖 Input file: {md_file}")
@@ -301,7 +598,8 @@ def main():
         return
     
     # Convert the file
-    reviews = convert_songs_md_to_json(md_file, output_file)
+    reviews = convert_songs_md_to_json(md_file, output_file, incremental=args.incremental,
+                                       workers=args.workers)
     
     if reviews:
         print("\n🎉 Conversion completed successfully!")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of raw chart pages for the Billboard scraper.
+
+Page bodies are stored content-addressed (by SHA-256) under objects/, and a
+small SQLite index maps each URL to its current body, its HTTP validators
+(ETag / Last-Modified) and the entries parsed from it. This lets the scraper
+send conditional requests, skip re-parsing a page it has already parsed, and
+re-parse historical pages without touching the network.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PageCache:
+    """Content-addressed page store with size- and age-based eviction."""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 500 * 1024 * 1024,
+                 max_age_days: float = 365):
+        """
+        Open (or create) a page cache.
+
+        Args:
+            cache_dir: Directory holding the index and page objects
+            max_bytes: Total size of stored pages before the oldest are evicted
+            max_age_days: Pages not fetched for this long are evicted
+        """
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        # One connection shared by all scraper threads, serialized by the lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                parsed_sha256 TEXT,
+                parsed_entries TEXT
+            )
+        ''')
+        self.conn.commit()
+
+    def _object_path(self, sha256: str) -> str:
+        """Path of a stored page body."""
+        return os.path.join(self.objects_dir, sha256[:2], f"{sha256}.html")
+
+    def _lookup(self, url: str) -> Optional[sqlite3.Row]:
+        """Index row for a URL, if cached."""
+        cursor = self.conn.execute(
+            'SELECT sha256, etag, last_modified, parsed_sha256, parsed_entries FROM pages WHERE url = ?',
+            (url,)
+        )
+        return cursor.fetchone()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build If-None-Match / If-Modified-Since headers for a cached URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Request headers (empty if the URL isn't cached)
+        """
+        with self._lock:
+            row = self._lookup(url)
+        if not row or not os.path.exists(self._object_path(row[0])):
+            return {}
+
+        headers = {}
+        if row[1]:
+            headers['If-None-Match'] = row[1]
+        if row[2]:
+            headers['If-Modified-Since'] = row[2]
+        return headers
+
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        Read the cached body for a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Page body, or None if not cached
+        """
+        with self._lock:
+            row = self._lookup(url)
+        if not row:
+            return None
+        try:
+            with open(self._object_path(row[0]), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def get_sha256(self, url: str) -> Optional[str]:
+        """Content hash of the cached body for a URL."""
+        with self._lock:
+            row = self._lookup(url)
+        return row[0] if row else None
+
+    def store(self, url: str, body: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> str:
+        """
+        Store a freshly downloaded page.
+
+        Args:
+            url: Page URL
+            body: Page body
+            etag: ETag response header
+            last_modified: Last-Modified response header
+
+        Returns:
+            SHA-256 of the body
+        """
+        sha256 = hashlib.sha256(body).hexdigest()
+        path = self._object_path(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            # Parsed entries stay valid only while the body hash is unchanged
+            self.conn.execute('''
+                INSERT INTO pages (url, sha256, size, etag, last_modified, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    sha256 = excluded.sha256,
+                    size = excluded.size,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    fetched_at = excluded.fetched_at
+            ''', (url, sha256, len(body), etag, last_modified, time.time()))
+            self.conn.commit()
+
+        self.evict()
+        return sha256
+
+    def touch(self, url: str):
+        """Mark a URL as freshly revalidated (e.g. after a 304)."""
+        with self._lock:
+            self.conn.execute('UPDATE pages SET fetched_at = ? WHERE url = ?', (time.time(), url))
+            self.conn.commit()
+
+    def get_parsed(self, url: str, sha256: str) -> Optional[List[Dict]]:
+        """
+        Get the entries parsed from a URL, if the body hasn't changed since.
+
+        Args:
+            url: Page URL
+            sha256: Hash of the body just fetched
+
+        Returns:
+            Previously parsed entries, or None if the page needs parsing
+        """
+        with self._lock:
+            row = self._lookup(url)
+        if row and row[3] == sha256 and row[4]:
+            return json.loads(row[4])
+        return None
+
+    def mark_parsed(self, url: str, sha256: str, entries: List[Dict]):
+        """
+        Record the entries parsed from a page body.
+
+        Args:
+            url: Page URL
+            sha256: Hash of the body that was parsed
+            entries: Parsed chart entries
+        """
+        with self._lock:
+            self.conn.execute(
+                'UPDATE pages SET parsed_sha256 = ?, parsed_entries = ? WHERE url = ? AND sha256 = ?',
+                (sha256, json.dumps(entries, ensure_ascii=False), url, sha256)
+            )
+            self.conn.commit()
+
+    def evict(self) -> int:
+        """
+        Drop pages older than max_age_days, then the least recently fetched
+        pages until the cache fits in max_bytes.
+
+        Returns:
+            Number of URLs evicted
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute('DELETE FROM pages WHERE fetched_at < ?', (time.time() - self.max_age_seconds,))
+            evicted = cursor.rowcount
+
+            total = cursor.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT sha256, size FROM pages)'
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                for url, size in cursor.execute('SELECT url, size FROM pages ORDER BY fetched_at').fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    cursor.execute('DELETE FROM pages WHERE url = ?', (url,))
+                    total -= size
+                    evicted += 1
+            self.conn.commit()
+
+            if evicted:
+                referenced = {row[0] for row in cursor.execute('SELECT DISTINCT sha256 FROM pages')}
+            else:
+                return 0
+
+        # Remove bodies no URL points at any more
+        for subdir in os.listdir(self.objects_dir):
+            subdir_path = os.path.join(self.objects_dir, subdir)
+            for name in os.listdir(subdir_path):
+                if name.endswith('.html') and name[:-5] not in referenced:
+                    os.remove(os.path.join(subdir_path, name))
+
+        logger.info(f"Evicted {evicted} cached pages")
+        return evicted
+
+    def close(self):
+        """Close the index connection."""
+        self.conn.close()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Incrementally maintained analytics aggregates over song reviews.
+
+ReviewAnalytics holds running counts and score sums: the rating histogram,
+per-artist counts, and genre/mood/instrumentation facets. Comma-separated
+facet values such as "K-Pop, Pop" are split into separate facets. When
+reviews.json changes, sync() diffs the new reviews against the last
+snapshot by review_id and applies only the added, removed or edited
+reviews. An unchanged catalog costs one pass of dict comparisons, not a
+full re-aggregation.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+# (response key prefix, review field) for comma-separated facets
+FACET_FIELDS = [
+    ('genre', 'song_genre'),
+    ('mood', 'song_mood'),
+    ('instrumentation', 'song_instrumentation'),
+]
+
+
+def split_facet(value: Any) -> List[str]:
+    """Split a comma-separated facet value into distinct names."""
+    names = [name.strip() for name in str(value or '').split(',')]
+    return list(dict.fromkeys(name for name in names if name)) or ['Unknown']
+
+
+def review_keys(reviews: Iterable[Dict[str, Any]]) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    """Yield a stable unique key for each review; repeated ids get a suffix."""
+    seen = Counter()
+    for review in reviews:
+        key = review.get('review_id') or f"{review.get('song_artist')} - {review.get('song_title')}"
+        seen[key] += 1
+        yield (key if seen[key] == 1 else f"{key}#{seen[key]}"), review
+
+
+def score_order(score: Any) -> Tuple[int, Any]:
+    """Sort key putting numeric scores first, in numeric order."""
+    if isinstance(score, (int, float)):
+        return (0, score)
+    return (1, str(score))
+
+
+class ReviewAnalytics:
+    """Running aggregates over a set of reviews."""
+
+    def __init__(self):
+        """Initialize empty aggregates."""
+        self.total_reviews = 0
+        self.rating_counts = Counter()
+        # facet -> name -> [review count, scored count, score sum]
+        self.facets = {'artist': {}}
+        self.facets.update({facet: {} for facet, _ in FACET_FIELDS})
+        self.score_sum = 0.0
+        self.scored_reviews = 0
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _facet_values(self, review: Dict[str, Any]) -> Iterable[Tuple[str, str]]:
+        """Yield (facet, name) pairs for one review."""
+        yield 'artist', review.get('song_artist', 'Unknown')
+        for facet, field in FACET_FIELDS:
+            for name in split_facet(review.get(field)):
+                yield facet, name
+
+    def _apply(self, review: Dict[str, Any], sign: int):
+        """Add (sign=1) or remove (sign=-1) one review from the aggregates."""
+        self.total_reviews += sign
+
+        score = review.get('review_score', 0)
+        self.rating_counts[score] += sign
+        if self.rating_counts[score] <= 0:
+            del self.rating_counts[score]
+
+        scored = 'review_score' in review and isinstance(score, (int, float))
+        if scored:
+            self.score_sum += sign * score
+            self.scored_reviews += sign
+
+        for facet, name in self._facet_values(review):
+            entry = self.facets[facet].setdefault(name, [0, 0, 0.0])
+            entry[0] += sign
+            if scored:
+                entry[1] += sign
+                entry[2] += sign * score
+            if entry[0] <= 0:
+                del self.facets[facet][name]
+
+    def add(self, review: Dict[str, Any]):
+        """Add one review to the aggregates."""
+        self._apply(review, 1)
+
+    def remove(self, review: Dict[str, Any]):
+        """Remove one previously added review from the aggregates."""
+        self._apply(review, -1)
+
+    def sync(self, reviews: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Bring the aggregates in line with a new list of reviews.
+
+        Args:
+            reviews: Current reviews
+
+        Returns:
+            Dictionary with the number of added, removed and changed reviews
+        """
+        with self._lock:
+            return self._sync(reviews)
+
+    def sync_summary(self, reviews: List[Dict[str, Any]]) -> Tuple[Dict[str, int], Dict[str, Any]]:
+        """
+        sync() and summary() under one lock, so the summary is of exactly these reviews.
+
+        Args:
+            reviews: Current reviews
+
+        Returns:
+            Tuple of the sync() changes and the summary()
+        """
+        with self._lock:
+            return self._sync(reviews), self._summary()
+
+    def _sync(self, reviews: List[Dict[str, Any]]) -> Dict[str, int]:
+        """sync() without taking the lock."""
+        current = dict(review_keys(reviews))
+        changes = {'added': 0, 'removed': 0, 'changed': 0}
+
+        for key, review in self._snapshot.items():
+            if key not in current:
+                self.remove(review)
+                changes['removed'] += 1
+
+        for key, review in current.items():
+            previous = self._snapshot.get(key)
+            if previous is None:
+                self.add(review)
+                changes['added'] += 1
+            elif previous != review:
+                self.remove(previous)
+                self.add(review)
+                changes['changed'] += 1
+
+        self._snapshot = current
+        return changes
+
+    def facet_counts(self, facet: str) -> Dict[str, int]:
+        """Review count per name of one facet, most common first."""
+        entries = self.facets[facet]
+        return {name: entries[name][0] for name in sorted(entries, key=lambda n: (-entries[n][0], n))}
+
+    def facet_averages(self, facet: str) -> Dict[str, float]:
+        """Average score per name of one facet, over reviews with a score."""
+        return {
+            name: round(score_sum / scored, 2)
+            for name, (_, scored, score_sum) in sorted(self.facets[facet].items())
+            if scored > 0
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get every aggregate as one JSON-ready dictionary.
+
+        Returns:
+            Dictionary of totals, histograms, facet counts and averages
+        """
+        with self._lock:
+            return self._summary()
+
+    def _summary(self) -> Dict[str, Any]:
+        """summary() without taking the lock."""
+        summary = {
+            'total_reviews': self.total_reviews,
+            'average_score': round(self.score_sum / self.scored_reviews, 2) if self.scored_reviews else None,
+            'rating_distribution': {score: self.rating_counts[score]
+                                    for score in sorted(self.rating_counts, key=score_order)},
+            'artist_counts': self.facet_counts('artist'),
+            'average_score_by_artist': self.facet_averages('artist'),
+        }
+        for facet, _ in FACET_FIELDS:
+            summary[f'{facet}_counts'] = self.facet_counts(facet)
+            summary[f'average_score_by_{facet}'] = self.facet_averages(facet)
+        return summary
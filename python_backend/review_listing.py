@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Paginated, filtered and sorted review listings for /api/reviews.
+
+A ReviewListing is built once per version of reviews.json. It holds:
+- one sorted order of review positions per sort field
+- genre and artist postings for filtering
+
+Every filter/sort combination becomes an ordered list of positions,
+derived from a prebuilt order and kept in a small LRU cache. A page is
+then a slice for page/per_page, or a bisect for cursors. Only the
+reviews on the page are copied and projected, so a list page stays a
+few KB however large the catalog is.
+
+Cursors are keyset-based: they name the last review's sort value and
+review_id, so paging stays consistent when reviews.json is reloaded.
+"""
+
+import base64
+import json
+import math
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from review_analytics import split_facet
+
+# Sort parameter -> (review field, normalizer)
+SORT_FIELDS = {
+    'score': ('review_score', lambda value: float(value) if isinstance(value, (int, float)) else None),
+    'date': ('review_date', lambda value: str(value) if value else None),
+    'genre': ('song_genre', lambda value: str(value).lower() if value else None),
+    'artist': ('song_artist', lambda value: str(value).lower() if value else None),
+    'title': ('song_title', lambda value: str(value).lower() if value else None),
+}
+
+DEFAULT_SORT = 'date'
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+ORDER_CACHE_SIZE = 256
+
+
+class ListingError(ValueError):
+    """Invalid listing parameters."""
+
+
+def finite_float(value: str) -> float:
+    """Parse a score parameter; raises ListingError for nan, inf and non-numbers."""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ListingError(f"Not a finite number: {value}")
+    return number
+
+
+def encode_cursor(sort_value: Any, review_id: str) -> str:
+    """Encode a keyset cursor as an opaque URL-safe token."""
+    raw = json.dumps([sort_value, review_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Decode a cursor from encode_cursor(); raises ListingError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, review_id = json.loads(raw)
+        return sort_value, str(review_id)
+    except (ValueError, TypeError) as e:
+        raise ListingError(f"Invalid cursor: {cursor}") from e
+
+
+class ReviewListing:
+    """Immutable sorted indexes over one list of reviews."""
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Build the indexes.
+
+        Args:
+            data: Parsed reviews.json contents
+        """
+        self.reviews = data.get('reviews', [])
+        self.ids = [review.get('review_id') or str(position) for position, review in enumerate(self.reviews)]
+        self.positions = {review_id: position for position, review_id in enumerate(self.ids)}
+
+        # sort -> (sort values, positions ascending by (value, position));
+        # reviews without a value are left out and appended at the end
+        self.sort_values = {}
+        self.orders = {}
+        for sort, (field, normalize) in SORT_FIELDS.items():
+            values = [normalize(review.get(field)) for review in self.reviews]
+            present = sorted((p for p, v in enumerate(values) if v is not None), key=lambda p: (values[p], p))
+            missing = [p for p, v in enumerate(values) if v is None]
+            self.sort_values[sort] = values
+            self.orders[sort] = (present, missing)
+
+        # Lowercased facet value -> positions
+        self.genres = {}
+        self.artists = {}
+        for position, review in enumerate(self.reviews):
+            for genre in split_facet(review.get('song_genre')):
+                self.genres.setdefault(genre.lower(), set()).add(position)
+            artist = str(review.get('song_artist') or 'Unknown').lower()
+            self.artists.setdefault(artist, set()).add(position)
+
+        self._filtered_order = lru_cache(maxsize=ORDER_CACHE_SIZE)(self._build_filtered_order)
+
+    def _build_filtered_order(self, sort: str, genre: Optional[str], artist: Optional[str],
+                              min_score: Optional[float],
+                              max_score: Optional[float]) -> Tuple[List[int], List[Tuple], List[int]]:
+        """
+        Reviews matching the filters, in ascending sort order.
+
+        Returns:
+            Tuple of (positions with a sort value, their (value, position)
+            keys for bisect, positions without a sort value)
+        """
+        candidates = None
+        if genre is not None:
+            candidates = self.genres.get(genre.lower(), set())
+        if artist is not None:
+            matches = self.artists.get(artist.lower(), set())
+            candidates = matches if candidates is None else candidates & matches
+
+        scores = self.sort_values['score']
+
+        def keep(position):
+            if candidates is not None and position not in candidates:
+                return False
+            if min_score is not None and (scores[position] is None or scores[position] < min_score):
+                return False
+            if max_score is not None and (scores[position] is None or scores[position] > max_score):
+                return False
+            return True
+
+        present, missing = self.orders[sort]
+        values = self.sort_values[sort]
+        present = [p for p in present if keep(p)]
+        missing = [p for p in missing if keep(p)]
+        return present, [(values[p], p) for p in present], missing
+
+    def _cursor_start(self, sort: str, descending: bool, present: List[int],
+                      keys: List[Tuple], missing: List[int], cursor: str) -> int:
+        """Index in the listing just after the review named by cursor."""
+        sort_value, review_id = decode_cursor(cursor)
+        position = self.positions.get(review_id)
+        if position is not None and self.sort_values[sort][position] != sort_value:
+            # The review changed since the cursor was issued; resume by value
+            position = None
+
+        if sort_value is None:
+            # Reviews without a sort value come last, in file order
+            return len(present) + (bisect_right(missing, position) if position is not None else 0)
+
+        try:
+            if not descending:
+                key = (sort_value, position if position is not None else float('inf'))
+                return bisect_right(keys, key)
+            key = (sort_value, position if position is not None else float('-inf'))
+            return len(present) - bisect_left(keys, key)
+        except TypeError as e:
+            raise ListingError(f"Cursor does not match sort '{sort}'") from e
+
+    def page(self, sort: str = DEFAULT_SORT, descending: bool = True,
+             page: int = 1, per_page: int = DEFAULT_PER_PAGE,
+             cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+             genre: Optional[str] = None, artist: Optional[str] = None,
+             min_score: Optional[float] = None,
+             max_score: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get one page of reviews.
+
+        Args:
+            sort: Sort key, one of SORT_FIELDS
+            descending: Sort highest/newest first
+            page: 1-based page number (ignored when cursor is given)
+            per_page: Reviews per page, at most MAX_PER_PAGE
+            cursor: next_cursor from a previous page
+            fields: Review fields to include (None for all)
+            genre: Only reviews tagged with this genre
+            artist: Only reviews by this artist
+            min_score: Only reviews scored at least this
+            max_score: Only reviews scored at most this
+
+        Returns:
+            Dictionary with the page's reviews and pagination details
+
+        Raises:
+            ListingError: If a parameter is invalid
+        """
+        if sort not in SORT_FIELDS:
+            raise ListingError(f"Unknown sort '{sort}', expected one of: {', '.join(SORT_FIELDS)}")
+        if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+            raise ListingError(f"page must be >= 1 and per_page between 1 and {MAX_PER_PAGE}")
+
+        present, keys, missing = self._filtered_order(sort, genre, artist, min_score, max_score)
+        if cursor:
+            start = self._cursor_start(sort, descending, present, keys, missing, cursor)
+        else:
+            start = (page - 1) * per_page
+        total = len(present) + len(missing)
+        end = min(start + per_page, total)
+
+        # Descending pages read the ascending list backwards
+        selected = []
+        if start < len(present):
+            if descending:
+                selected = present[len(present) - min(end, len(present)):len(present) - start][::-1]
+            else:
+                selected = present[start:min(end, len(present))]
+        if end > len(present):
+            selected += missing[max(start - len(present), 0):end - len(present)]
+
+        reviews = [self.reviews[p] for p in selected]
+        if fields:
+            reviews = [{field: review[field] for field in fields if field in review} for review in reviews]
+
+        next_cursor = None
+        if end < total and selected:
+            last = selected[-1]
+            next_cursor = encode_cursor(self.sort_values[sort][last], self.ids[last])
+
+        return {
+            'reviews': reviews,
+            'pagination': {
+                'page': None if cursor else page,
+                'per_page': per_page,
+                'total': total,
+                'pages': (total + per_page - 1) // per_page,
+                'next_cursor': next_cursor,
+            },
+            'sort': sort,
+            'order': 'desc' if descending else 'asc',
+        }
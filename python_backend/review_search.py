@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Inverted index search over song reviews.
+
+The index is built once per version of reviews.json. Artist, title and review
+text are tokenized into one posting list per token. Every entry already holds
+its BM25F score for that review, weighted so title and artist matches outrank
+review text. A query expands each term to every indexed token it prefixes,
+which gives typeahead matching. It then intersects the per-term posting lists,
+sums the scores and returns one ranked page.
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+# (review field, BM25F weight)
+SEARCH_FIELDS = [
+    ('song_title', 3.0),
+    ('song_artist', 2.0),
+    ('review_text', 1.0),
+]
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class ReviewSearchIndex:
+    """Immutable inverted index over one list of reviews."""
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Build the index.
+
+        Args:
+            data: Parsed reviews.json contents
+        """
+        self.reviews = data.get('reviews', [])
+
+        # token -> {review position: term frequency} per field
+        field_postings = [{} for _ in SEARCH_FIELDS]
+        field_lengths = [[0] * len(self.reviews) for _ in SEARCH_FIELDS]
+
+        for doc, review in enumerate(self.reviews):
+            for field_index, (field, _) in enumerate(SEARCH_FIELDS):
+                tokens = tokenize(str(review.get(field) or ''))
+                field_lengths[field_index][doc] = len(tokens)
+                postings = field_postings[field_index]
+                for token in tokens:
+                    counts = postings.setdefault(token, {})
+                    counts[doc] = counts.get(doc, 0) + 1
+
+        # BM25F: length-normalize and weight the tf of each field, sum them,
+        # then saturate once per (token, review)
+        total = len(self.reviews)
+        avg_lengths = [(sum(lengths) / total) if total else 0 for lengths in field_lengths]
+        norms = [
+            [1 - BM25_B + BM25_B * (length / avg if avg else 0) for length in lengths]
+            for lengths, avg in zip(field_lengths, avg_lengths)
+        ]
+
+        combined = {}
+        for field_index, (_, weight) in enumerate(SEARCH_FIELDS):
+            field_norms = norms[field_index]
+            for token, counts in field_postings[field_index].items():
+                tfs = combined.setdefault(token, {})
+                for doc, tf in counts.items():
+                    tfs[doc] = tfs.get(doc, 0.0) + weight * tf / field_norms[doc]
+
+        self.postings: Dict[str, Dict[int, float]] = {}
+        for token, tfs in combined.items():
+            idf = math.log(1 + (total - len(tfs) + 0.5) / (len(tfs) + 0.5))
+            self.postings[token] = {
+                doc: idf * tf * (BM25_K1 + 1) / (tf + BM25_K1) for doc, tf in tfs.items()
+            }
+
+        # Sorted vocabulary for prefix lookups
+        self.vocabulary = sorted(self.postings)
+
+    def expand(self, term: str) -> List[str]:
+        """Every indexed token starting with term, including term itself."""
+        matches = []
+        for i in range(bisect_left(self.vocabulary, term), len(self.vocabulary)):
+            token = self.vocabulary[i]
+            if not token.startswith(term):
+                break
+            matches.append(token)
+        return matches
+
+    def term_scores(self, tokens: List[str],
+                    candidates: Optional[Dict[int, float]] = None) -> Dict[int, float]:
+        """
+        Score the reviews matching one expanded query term.
+
+        A review matching several completions of the term keeps its best
+        score, so a short prefix doesn't outrank a full word.
+
+        Args:
+            tokens: Completions of the term from expand()
+            candidates: If given, only these reviews are scored
+
+        Returns:
+            Dictionary of review position -> score
+        """
+        postings = [self.postings[token] for token in tokens]
+        scores = {}
+        if candidates is not None:
+            for doc in candidates:
+                best = max((p.get(doc, 0.0) for p in postings), default=0.0)
+                if best:
+                    scores[doc] = best
+            return scores
+
+        if len(postings) == 1:
+            return postings[0]
+        for posting in postings:
+            for doc, score in posting.items():
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = None,
+               offset: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Find reviews matching every term of the query, best first.
+
+        Args:
+            query: Free-text query; each term may be a prefix
+            limit: Maximum number of results to return (None for all)
+            offset: Number of ranked results to skip
+
+        Returns:
+            Tuple of (total number of matches, reviews in the requested page)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return 0, []
+
+        expanded = []
+        for term in terms:
+            tokens = self.expand(term)
+            if not tokens:
+                return 0, []
+            expanded.append((sum(len(self.postings[t]) for t in tokens), tokens))
+
+        # Start from the rarest term; once the candidate set is small, probe
+        # the remaining posting lists instead of merging them whole
+        expanded.sort(key=lambda item: item[0])
+        totals = dict(self.term_scores(expanded[0][1]))
+        for size, tokens in expanded[1:]:
+            candidates = totals if len(totals) * len(tokens) < size else None
+            scores = self.term_scores(tokens, candidates)
+            totals = {doc: total + scores[doc] for doc, total in totals.items() if doc in scores}
+            if not totals:
+                return 0, []
+
+        # Ties keep file order
+        def rank(doc):
+            return (-totals[doc], doc)
+
+        if limit is None:
+            ranked = sorted(totals, key=rank)[offset:]
+        else:
+            ranked = heapq.nsmallest(offset + limit, totals, key=rank)[offset:]
+        return len(totals), [self.reviews[doc] for doc in ranked]
@@ -19,6 +19,10 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from billboard_scraper import BillboardScraper
 from billboard_database import BillboardDatabase
+from data_publish import atomic_write, read_generation, with_generation
+from history_archive import HistoryArchive, week_date
+
+HISTORY_ARCHIVE = "../data/chart_history.bba"
 
 def main():
     """Main function to run the scraper and output results."""
@@ -38,6 +42,11 @@ def main():
         
         print(f"✅ Successfully scraped {len(chart_entries)} chart entries")
         
+        # Identical page to the last run: nothing new to write
+        if scraper.page_unchanged:
+            print("♻️  Chart unchanged since last run, skipping data update")
+            return 0
+        
         # Calculate artist scores
         print("🏆 Calculating artist scores...")
         artist_scores = scraper.calculate_artist_scores(chart_entries)
@@ -56,24 +65,26 @@ def main():
         
         # Output to JSON
         print("💾 Outputting data to JSON...")
-        json_output = json.dumps(output_data, indent=2, ensure_ascii=False)
-        
-        # Write to current data (for frontend API)
         output_file = "../data/current/billboard_chart_data.json"
         os.makedirs("../data/current", exist_ok=True)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
+        # Next generation of the published file, so servers can tell versions apart
+        generation = read_generation(output_file) + 1
+        json_output = json.dumps(with_generation(output_data, generation), indent=2, ensure_ascii=False)
+        
+        # Write to current data (for frontend API). Published atomically:
+        # a server reading mid-update sees the old or the new file, never a partial one
+        with atomic_write(output_file) as f:
             f.write(json_output)
         
-        print(f"✅ Data saved to {output_file}")
+        print(f"✅ Data saved to {output_file} (generation {generation})")
         
         # Create historical backup with date
         chart_date = scraper.get_chart_date()
         if chart_date:
-            # Extract date from chart_date (format: "Week of August 31, 2025")
+            # chart_date is YYYY-MM-DD (older runs used "Week of August 31, 2025")
             try:
-                date_obj = datetime.strptime(chart_date, "Week of %B %d, %Y")
-                date_str = date_obj.strftime("%Y-%m-%d")
+                date_str = week_date(chart_date)
                 
                 # Create historical folder
                 historical_dir = f"../data/historical/{date_str}"
@@ -81,11 +92,22 @@ def main():
                 
                 # Save historical copy
                 historical_file = f"{historical_dir}/billboard_{date_str}.json"
-                with open(historical_file, 'w', encoding='utf-8') as f:
+                with atomic_write(historical_file) as f:
                     f.write(json_output)
                 
                 print(f"📚 Historical backup saved to {historical_file}")
                 
+                # Append to the consolidated history archive (see history_archive.py).
+                # The archive already stores the week as a snapshot, so no .snap is
+                # written here; the JSON above stays as the committed copy the
+                # archive is regenerated from
+                try:
+                    with HistoryArchive(HISTORY_ARCHIVE) as archive:
+                        archive.append(output_data)
+                        print(f"🗃️  Week appended to {HISTORY_ARCHIVE} ({len(archive)} weeks)")
+                except (ValueError, KeyError, TypeError, OSError) as e:
+                    print(f"⚠️  Could not append to history archive: {e}")
+                
             except ValueError:
                 print("⚠️  Could not parse chart date for historical backup")
         else:
@@ -97,6 +119,9 @@ def main():
         print("="*50)
         print(json_output)
         
+        # Everything is written; only now may the next run skip this page
+        scraper.commit_page()
+        
         return 0
         
     except Exception as e:
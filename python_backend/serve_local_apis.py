@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Run the Billboard and Reviews APIs together in one process.
+
+Both APIs share the same in-memory data stores, search index and analytics
+aggregates, and every endpoint is available on both ports. The frontend
+therefore keeps using localhost:8000 for Billboard and localhost:8001 for
+Reviews. Connections are served concurrently (see api_server.py).
+
+Usage:
+    python serve_local_apis.py [--max-connections 256]
+"""
+
+import argparse
+import os
+from pathlib import Path
+
+from api_server import DEFAULT_MAX_CONNECTIONS, LocalApiServer, run_servers
+from serve_billboard_data import BillboardDataHandler
+from serve_reviews_data import ReviewsDataHandler
+
+BILLBOARD_PORT = 8000
+REVIEWS_PORT = 8001
+
+
+class LocalApiHandler(ReviewsDataHandler, BillboardDataHandler):
+    """
+    Serves every local endpoint.
+
+    Unmatched paths fall through the do_GET chain: Reviews, then Billboard,
+    then static files.
+    """
+
+
+def main():
+    """Start both API servers in this process."""
+    parser = argparse.ArgumentParser(description="Serve the Billboard and Reviews APIs in one process")
+    parser.add_argument('--max-connections', type=int, default=DEFAULT_MAX_CONNECTIONS,
+                        help=f"Concurrent connections per port (default: {DEFAULT_MAX_CONNECTIONS})")
+    args = parser.parse_args()
+
+    # Change to the project root directory
+    os.chdir(Path(__file__).parent)
+
+    servers = [LocalApiServer(("", port), LocalApiHandler, args.max_connections)
+               for port in (BILLBOARD_PORT, REVIEWS_PORT)]
+
+    print(f"🌐 Local APIs running on ports {BILLBOARD_PORT} and {REVIEWS_PORT}")
+    print(f"📊 Billboard data available at: http://localhost:{BILLBOARD_PORT}/api/billboard")
+    print(f"🎵 Reviews data available at: http://localhost:{REVIEWS_PORT}/api/reviews")
+    print(f"🔍 Search available at: http://localhost:{REVIEWS_PORT}/api/search?q=<query>[&limit=N&offset=N]")
+    print(f"📈 Analytics available at: http://localhost:{REVIEWS_PORT}/api/analytics")
+    print(f"🧵 Up to {args.max_connections} concurrent connections per port, keep-alive enabled")
+    print("🔄 Press Ctrl+C to stop the servers")
+
+    run_servers(servers)
+
+
+if __name__ == "__main__":
+    main()
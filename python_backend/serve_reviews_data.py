@@ -3,94 +3,133 @@
 Simple HTTP server to serve Reviews data locally for frontend testing.
 This allows the frontend to fetch real Reviews data while we work on the Netlify Function.
 
+reviews.json is loaded once into a process-wide store and hot-reloaded when
+the file changes; unchanged endpoints are served from pre-serialized bytes,
+search runs against an inverted index built once per version, and analytics
+aggregates are updated incrementally from the reviews that changed.
+
 Usage:
     python serve_reviews_data.py
 """
 
-import json
-import http.server
-import socketserver
 import os
 from urllib.parse import urlparse, parse_qs
 from pathlib import Path
 
-class ReviewsDataHandler(http.server.SimpleHTTPRequestHandler):
+from api_server import CachedBody, JsonApiHandler, LocalApiServer, encode_json, run_servers
+from data_store import JsonFileStore
+from review_analytics import ReviewAnalytics
+from review_listing import DEFAULT_PER_PAGE, DEFAULT_SORT, ListingError, ReviewListing, finite_float
+from review_search import ReviewSearchIndex
+
+# Process-wide reviews store shared by every request
+REVIEWS_FILE = Path(__file__).resolve().parent.parent / 'netlify_functions' / 'reviews.json'
+REVIEWS_STORE = JsonFileStore(REVIEWS_FILE)
+REVIEWS_ANALYTICS = ReviewAnalytics()
+
+# Any of these switches /api/reviews from the full document to one page
+LISTING_PARAMS = {'page', 'per_page', 'cursor', 'fields', 'sort', 'order',
+                  'genre', 'artist', 'min_score', 'max_score'}
+
+def build_reviews_response(data) -> CachedBody:
+    """Pre-serialized, cacheable /api/reviews body for one version of reviews.json."""
+    return CachedBody(encode_json({
+        'success': True,
+        'data': data,
+        'message': 'Reviews data loaded from local file',
+        'source': 'local_data'
+    }))
+
+def build_analytics_response(data) -> CachedBody:
+    """Pre-serialized, cacheable /api/analytics body for one version of reviews.json."""
+    changes, summary = REVIEWS_ANALYTICS.sync_summary(data.get('reviews', []))
+    return CachedBody(encode_json(dict(
+        summary,
+        success=True,
+        changes=changes,
+        message='Analytics data calculated from local file',
+        source='local_data'
+    )))
+
+class ReviewsDataHandler(JsonApiHandler):
     """Custom HTTP handler that serves Reviews data."""
     
+    reviews_store = REVIEWS_STORE
+    
     def do_GET(self):
         """Handle GET requests."""
         parsed_path = urlparse(self.path)
         
         # Serve Reviews data at /api/reviews
         if parsed_path.path == '/api/reviews':
-            self.send_reviews_data()
+            self.send_reviews_data(parsed_path.query)
         elif parsed_path.path == '/api/search':
             self.send_search_results(parsed_path.query)
         elif parsed_path.path == '/api/analytics':
             self.send_analytics_data()
+        elif parsed_path.path == '/api/reviews/cache':
+            self.send_json(200, encode_json({'success': True, 'cache': self.reviews_store.stats()}))
         else:
             # Default to serving files
             super().do_GET()
     
-    def do_OPTIONS(self):
-        """Handle OPTIONS requests for CORS preflight."""
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
+    def send_not_found(self):
+        """Send 404 if the data file doesn't exist."""
+        self.send_json(404, encode_json({
+            'success': False,
+            'error': 'Reviews data file not found',
+            'message': f'Reviews data file not found at {REVIEWS_FILE}'
+        }))
     
-    def send_reviews_data(self):
-        """Send Reviews data as JSON."""
+    def send_reviews_data(self, query_string=''):
+        """Send Reviews data as JSON, paginated when any listing parameter is given."""
         try:
-            # Read the Reviews data file
-            data_file = Path('../netlify_functions/reviews.json')
+            query_params = parse_qs(query_string)
+            if not LISTING_PARAMS.intersection(query_params):
+                self.send_cached(self.reviews_store.derived('reviews_response', build_reviews_response))
+                return
             
-            if data_file.exists():
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Send response
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                
-                response_data = {
-                    'success': True,
-                    'data': data,
-                    'message': 'Reviews data loaded from local file',
-                    'source': 'local_data'
-                }
-                
-                self.wfile.write(json.dumps(response_data, indent=2).encode('utf-8'))
-                
-            else:
-                # Send 404 if data file doesn't exist
-                self.send_response(404)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                
-                error_data = {
-                    'success': False,
-                    'error': 'Reviews data file not found',
-                    'message': 'Reviews data file not found at ../netlify_functions/reviews.json'
-                }
-                
-                self.wfile.write(json.dumps(error_data, indent=2).encode('utf-8'))
-                
-        except Exception as e:
-            # Send 500 on error
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
+            def param(name, convert=str, default=None):
+                # Present values are always converted, so page=0 reaches ReviewListing's validation
+                return convert(query_params[name][0]) if name in query_params else default
             
-            error_data = {
-                'success': False,
-                'error': str(e),
-                'message': 'Internal server error'
-            }
+            try:
+                order = param('order') or 'desc'
+                if order not in ('asc', 'desc'):
+                    raise ListingError("order must be 'asc' or 'desc'")
+                fields = param('fields')
+                listing = self.reviews_store.derived('review_listing', ReviewListing)
+                result = listing.page(
+                    sort=param('sort') or DEFAULT_SORT,
+                    descending=order == 'desc',
+                    page=param('page', int, 1),
+                    per_page=param('per_page', int, DEFAULT_PER_PAGE),
+                    cursor=param('cursor'),
+                    fields=[f.strip() for f in fields.split(',') if f.strip()] if fields else None,
+                    genre=param('genre'),
+                    artist=param('artist'),
+                    min_score=param('min_score', finite_float),
+                    max_score=param('max_score', finite_float)
+                )
+            except ValueError as e:
+                # ListingError is a ValueError, as are bad int/float parameters
+                self.send_json(400, encode_json({
+                    'success': False,
+                    'error': 'Invalid listing parameters',
+                    'message': str(e)
+                }))
+                return
             
-            self.wfile.write(json.dumps(error_data, indent=2).encode('utf-8'))
+            self.send_cached(CachedBody(encode_json({
+                'success': True,
+                'data': result,
+                'message': 'Reviews page loaded from local file',
+                'source': 'local_data'
+            })))
+        except FileNotFoundError:
+            self.send_not_found()
+        except Exception as e:
+            self.send_server_error(e)
     
     def send_search_results(self, query_string):
         """Send search results as JSON."""
@@ -100,159 +139,53 @@ class ReviewsDataHandler(http.server.SimpleHTTPRequestHandler):
             search_query = query_params.get('q', [''])[0]
             
             if not search_query:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                
-                error_data = {
+                self.send_json(400, encode_json({
                     'success': False,
                     'error': 'Search query required',
                     'message': 'Please provide a search query with ?q=<query>'
-                }
-                
-                self.wfile.write(json.dumps(error_data, indent=2).encode('utf-8'))
+                }))
                 return
             
-            # Read the Reviews data file
-            data_file = Path('../netlify_functions/reviews.json')
-            
-            if data_file.exists():
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Search through reviews
-                reviews = data.get('reviews', [])
-                results = []
-                search_terms = search_query.lower().split()
-                
-                for review in reviews:
-                    searchable_text = f"{review.get('song_artist', '')} {review.get('song_title', '')} {review.get('review_text', '')}".lower()
-                    if all(term in searchable_text for term in search_terms):
-                        results.append(review)
-                
-                # Send response
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                
-                response_data = {
-                    'success': True,
-                    'query': search_query,
-                    'results': results,
-                    'total_results': len(results),
-                    'message': f'Found {len(results)} results for "{search_query}"',
-                    'source': 'local_data'
-                }
-                
-                self.wfile.write(json.dumps(response_data, indent=2).encode('utf-8'))
-                
-            else:
-                # Send 404 if data file doesn't exist
-                self.send_response(404)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                
-                error_data = {
+            try:
+                limit = int(query_params['limit'][0]) if 'limit' in query_params else None
+                offset = int(query_params.get('offset', ['0'])[0])
+                if (limit is not None and limit < 0) or offset < 0:
+                    raise ValueError
+            except ValueError:
+                self.send_json(400, encode_json({
                     'success': False,
-                    'error': 'Reviews data file not found',
-                    'message': 'Reviews data file not found at ../netlify_functions/reviews.json'
-                }
-                
-                self.wfile.write(json.dumps(error_data, indent=2).encode('utf-8'))
-                
-        except Exception as e:
-            # Send 500 on error
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
+                    'error': 'Invalid pagination',
+                    'message': 'limit and offset must be non-negative integers'
+                }))
+                return
             
-            error_data = {
-                'success': False,
-                'error': str(e),
-                'message': 'Internal server error'
-            }
+            index = self.reviews_store.derived('search_index', ReviewSearchIndex)
+            total, results = index.search(search_query, limit=limit, offset=offset)
             
-            self.wfile.write(json.dumps(error_data, indent=2).encode('utf-8'))
+            self.send_cached(CachedBody(encode_json({
+                'success': True,
+                'query': search_query,
+                'results': results,
+                'total_results': total,
+                'limit': limit,
+                'offset': offset,
+                'message': f'Found {total} results for "{search_query}"',
+                'source': 'local_data'
+            })))
+        
+        except FileNotFoundError:
+            self.send_not_found()
+        except Exception as e:
+            self.send_server_error(e)
     
     def send_analytics_data(self):
         """Send analytics data as JSON."""
         try:
-            # Read the Reviews data file
-            data_file = Path('../netlify_functions/reviews.json')
-            
-            if data_file.exists():
-                with open(data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                reviews = data.get('reviews', [])
-                
-                # Calculate analytics
-                rating_counts = {}
-                artist_counts = {}
-                genre_counts = {}
-                
-                for review in reviews:
-                    # Rating distribution
-                    score = review.get('review_score', 0)
-                    rating_counts[score] = rating_counts.get(score, 0) + 1
-                    
-                    # Artist counts
-                    artist = review.get('song_artist', 'Unknown')
-                    artist_counts[artist] = artist_counts.get(artist, 0) + 1
-                    
-                    # Genre counts
-                    genre = review.get('song_genre', 'Unknown')
-                    genre_counts[genre] = genre_counts.get(genre, 0) + 1
-                
-                # Send response
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                
-                response_data = {
-                    'success': True,
-                    'total_reviews': len(reviews),
-                    'rating_distribution': rating_counts,
-                    'artist_counts': artist_counts,
-                    'genre_counts': genre_counts,
-                    'message': 'Analytics data calculated from local file',
-                    'source': 'local_data'
-                }
-                
-                self.wfile.write(json.dumps(response_data, indent=2).encode('utf-8'))
-                
-            else:
-                # Send 404 if data file doesn't exist
-                self.send_response(404)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                
-                error_data = {
-                    'success': False,
-                    'error': 'Reviews data file not found',
-                    'message': 'Reviews data file not found at ../netlify_functions/reviews.json'
-                }
-                
-                self.wfile.write(json.dumps(error_data, indent=2).encode('utf-8'))
-                
+            self.send_cached(self.reviews_store.derived('analytics_response', build_analytics_response))
+        except FileNotFoundError:
+            self.send_not_found()
         except Exception as e:
-            # Send 500 on error
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            
-            error_data = {
-                'success': False,
-                'error': str(e),
-                'message': 'Internal server error'
-            }
-            
-            self.wfile.write(json.dumps(error_data, indent=2).encode('utf-8'))
-    
-    def end_headers(self):
-        """Add CORS headers."""
-        self.send_header('Access-Control-Allow-Origin', '*')
-        super().end_headers()
+            self.send_server_error(e)
 
 def main():
     """Start the HTTP server."""
@@ -261,18 +194,17 @@ def main():
     # Change to the project root directory
     os.chdir(Path(__file__).parent)
     
-    with socketserver.TCPServer(("", PORT), ReviewsDataHandler) as httpd:
-        print(f"🌐 Reviews Data Server running on http://localhost:{PORT}")
-        print(f"📊 Reviews data available at: http://localhost:{PORT}/api/reviews")
-        print(f"🔍 Search available at: http://localhost:{PORT}/api/search?q=<query>")
-        print(f"📈 Analytics available at: http://localhost:{PORT}/api/analytics")
-        print(f"📁 Static files served from: {os.getcwd()}")
-        print(f"🔄 Press Ctrl+C to stop the server")
-        
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n🛑 Server stopped by user")
+    httpd = LocalApiServer(("", PORT), ReviewsDataHandler)
+    print(f"🌐 Reviews Data Server running on http://localhost:{PORT}")
+    print(f"📊 Reviews data available at: http://localhost:{PORT}/api/reviews")
+    print(f"📄 Paginated at: http://localhost:{PORT}/api/reviews?per_page=20&sort=score&fields=song_artist,song_title")
+    print(f"🔍 Search available at: http://localhost:{PORT}/api/search?q=<query>[&limit=N&offset=N]")
+    print(f"📈 Analytics available at: http://localhost:{PORT}/api/analytics")
+    print(f"🧮 Cache stats available at: http://localhost:{PORT}/api/reviews/cache")
+    print(f"📁 Static files served from: {os.getcwd()}")
+    print(f"🔄 Press Ctrl+C to stop the server")
+    
+    run_servers([httpd])
 
 if __name__ == "__main__":
     main()
@@ -15,6 +15,8 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+from artist_credits import ArtistCreditParser, name_key
+
 class BillboardDataValidator:
     """Validates Billboard scraped data for quality and accuracy."""
     
@@ -24,6 +26,7 @@ class BillboardDataValidator:
         self.data = None
         self.chart_entries = []
         self.test_results = []
+        self.credit_parser = ArtistCreditParser()
         
     def load_data(self):
         """Load the scraped Billboard data."""
@@ -131,10 +134,12 @@ class BillboardDataValidator:
         print("\n🎤 TEST 4: ARTIST NAME PATTERNS")
         print("-" * 40)
         
-        # Count collaboration patterns
-        featuring_count = len([e for e in self.chart_entries if 'featuring' in e.get('artist', '').lower()])
-        and_count = len([e for e in self.chart_entries if ' & ' in e.get('artist', '')])
-        with_count = len([e for e in self.chart_entries if ' with ' in e.get('artist', '').lower()])
+        # Count collaboration patterns from the parsed artist credits
+        credits = [self.credit_parser.parse(e.get('artist', '')) for e in self.chart_entries]
+        featuring_count = len([c for c in credits if c.featured])
+        and_count = len([c for c in credits if len(c.primary) > 1])
+        credited_artists = {name for c in credits for name in c.primary + c.featured}
+        print(f"   {len(credited_artists)} credited artists across {len(self.chart_entries)} entries")
         
         # Check for reasonable collaboration counts
         test4a = self.run_test("Reasonable featuring count (5-15)", lambda: 5 <= featuring_count <= 15)
@@ -146,10 +151,8 @@ class BillboardDataValidator:
             'Post Malone', 'SZA', 'Kendrick Lamar', 'Bruno Mars', 'Lady Gaga'
         ]
         
-        found_artists = []
-        for artist in known_artists:
-            if any(artist.lower() in entry.get('artist', '').lower() for entry in self.chart_entries):
-                found_artists.append(artist)
+        credited_keys = {name_key(name) for name in credited_artists}
+        found_artists = [artist for artist in known_artists if name_key(artist) in credited_keys]
         
         test4c = self.run_test(f"Found {len(found_artists)}/{len(known_artists)} major artists", lambda: len(found_artists) >= 5)
         
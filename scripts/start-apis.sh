@@ -7,10 +7,9 @@ echo "🐍 Activating Python virtual environment..."
 source python_backend/venv/bin/activate
 echo "✅ Virtual environment activated"
 
-# Start both API servers
+# Start both APIs in one process (ports 8000 and 8001, shared caches)
 echo "🌐 Starting API servers..."
-python python_backend/serve_billboard_data.py &
-python python_backend/serve_reviews_data.py &
+python python_backend/serve_local_apis.py &
 
 echo ""
 echo "✅ Both API servers started!"
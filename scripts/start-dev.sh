@@ -5,6 +5,7 @@ echo "🚀 Starting OPE! Development Environment..."
 echo "🛑 Stopping any existing servers..."
 pkill -f "serve_billboard_data.py" 2>/dev/null || true
 pkill -f "serve_reviews_data.py" 2>/dev/null || true
+pkill -f "serve_local_apis.py" 2>/dev/null || true
 pkill -f "python.*http.server.*5500" 2>/dev/null || true
 sleep 1
 
@@ -26,8 +27,7 @@ if [[ "$OSTYPE" == "darwin"* ]]; then
         sleep 4
     else
         echo "⚠️  Could not open new Terminal. Starting servers in background..."
-        python python_backend/serve_billboard_data.py &
-        python python_backend/serve_reviews_data.py &
+        python python_backend/serve_local_apis.py &
         sleep 3
     fi
 elif [[ "$OSTYPE" == "linux-gnu"* ]]; then
@@ -38,15 +38,13 @@ elif [[ "$OSTYPE" == "linux-gnu"* ]]; then
         sleep 4
     else
         echo "⚠️  Could not open new terminal. Starting servers in background..."
-        python python_backend/serve_billboard_data.py &
-        python python_backend/serve_reviews_data.py &
+        python python_backend/serve_local_apis.py &
         sleep 3
     fi
 else
     # Fallback - start in background
     echo "⚠️  Unsupported OS. Starting servers in background..."
-    python python_backend/serve_billboard_data.py &
-    python python_backend/serve_reviews_data.py &
+    python python_backend/serve_local_apis.py &
     sleep 3
 fi
 
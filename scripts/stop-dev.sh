@@ -5,6 +5,7 @@ echo "🛑 Stopping OPE! Development Environment..."
 echo "🔄 Stopping API servers..."
 pkill -f "serve_billboard_data.py" 2>/dev/null || echo "   📊 Billboard API: Not running"
 pkill -f "serve_reviews_data.py" 2>/dev/null || echo "   🎵 Reviews API: Not running"
+pkill -f "serve_local_apis.py" 2>/dev/null || echo "   🌐 Combined APIs: Not running"
 pkill -f "python.*http.server.*5500" 2>/dev/null || echo "   🌐 Live server: Not running"
 
 # Kill any remaining Python processes that might be related
@@ -80,7 +80,8 @@ fi
 
 # Activate environment and run scraper
 echo "🔄 Running Billboard scraper..."
-cd python_backend && source venv/bin/activate && python run_scraper.py && python validate_data_quality.py
+# The history archive is generated, not committed: bring it up to date with data/historical first
+cd python_backend && source venv/bin/activate && python history_archive.py import && python run_scraper.py && python validate_data_quality.py
 
 # Check if scraper was successful
 if [ $? -eq 0 ]; then